@@ -0,0 +1,11 @@
+"""
+LLM Engine Module
+search / md_summarizer가 공유하는 프로세스 전역 SGLang 엔진 관리
+"""
+
+from .engine_manager import EngineManager, SGLangHTTPEngine
+
+__all__ = [
+    'EngineManager',
+    'SGLangHTTPEngine'
+]
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LLM 엔진 관리 모듈
+프로세스 전역에서 SGLang Engine을 한 번만 로드하고 여러 생성기가 공유
+(search.summarizer / md_summarizer.answer_generator 공용)
+"""
+
+import logging, os, threading, time
+from contextlib import contextmanager
+from itertools import cycle
+
+logger = logging.getLogger(__name__)
+
+# 참조가 없는 엔진을 해제하기까지의 유휴 시간 (초, 0 이하이면 해제하지 않음)
+DEFAULT_IDLE_TIMEOUT = float(os.environ.get("SGLANG_ENGINE_IDLE_TIMEOUT", "600"))
+
+
+class _EngineEntry:
+    """관리 중인 엔진 1개의 상태"""
+
+    def __init__(self):
+        self.engine = None
+        self.refcount = 0
+        self.last_used = time.monotonic()
+        self.shutdown = None
+        self.load_lock = threading.Lock()  # 같은 엔진의 중복 로드 방지
+        # sgl.Engine은 호출 스레드마다 이벤트 루프를 따로 쓰므로 여러 스레드에서 동시에 generate하면 안 됨
+        self.generate_lock = threading.Lock()
+
+
+class EngineManager:
+    """
+    프로세스 전역 엔진 관리자
+
+    - 최초 acquire 시 factory로 엔진을 생성 (지연 초기화)
+    - acquire/release로 참조 수를 관리
+    - 참조가 0인 상태로 idle_timeout이 지나면 백그라운드 스레드가 엔진 해제
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """
+        Args:
+            idle_timeout: 유휴 엔진 해제 대기 시간 (초)
+        """
+        self.idle_timeout = idle_timeout
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    @classmethod
+    def instance(cls) -> "EngineManager":
+        """프로세스 전역 관리자 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def acquire(self, key: str, factory, shutdown=None):
+        """
+        엔진 참조 획득 (없으면 생성)
+
+        Args:
+            key: 엔진 식별 키 (예: "engine:<모델명>")
+            factory: 엔진 생성 함수 (인자 없음, 실패 시 예외)
+            shutdown: 엔진 해제 함수 (엔진을 인자로 받음, 기본값: engine.shutdown())
+
+        Returns:
+            생성되었거나 공유 중인 엔진
+        """
+        with self._lock:
+            entry = self._entries.setdefault(key, _EngineEntry())
+            entry.refcount += 1
+
+        try:
+            with entry.load_lock:
+                if entry.engine is None:
+                    logger.info(f"엔진 로드 시작: {key}")
+                    entry.engine = factory()
+                    entry.shutdown = shutdown
+                    logger.info(f"엔진 로드 완료: {key}")
+                else:
+                    logger.info(f"로드된 엔진 재사용: {key} (참조 {entry.refcount})")
+                return entry.engine
+        except Exception:
+            with self._lock:
+                entry.refcount -= 1
+            raise
+
+    def release(self, key: str):
+        """
+        엔진 참조 반환 (즉시 해제하지 않고 유휴 시간 후 해제)
+
+        Args:
+            key: 엔진 식별 키
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount <= 0:
+                return
+            entry.refcount -= 1
+            entry.last_used = time.monotonic()
+            if entry.refcount == 0:
+                self._ensure_reaper()
+
+    def generate_lock(self, key: str) -> threading.Lock:
+        """
+        엔진 generate 호출 직렬화용 잠금 (같은 키를 쓰는 모든 요청이 공유)
+
+        Args:
+            key: 엔진 식별 키
+        """
+        with self._lock:
+            return self._entries.setdefault(key, _EngineEntry()).generate_lock
+
+    @contextmanager
+    def lease(self, key: str, factory, shutdown=None):
+        """acquire/release를 묶은 컨텍스트 매니저"""
+        engine = self.acquire(key, factory, shutdown)
+        try:
+            yield engine
+        finally:
+            self.release(key)
+
+    def unload(self, key: str, force: bool = False) -> bool:
+        """
+        엔진 해제
+
+        Args:
+            key: 엔진 식별 키
+            force: 참조가 남아 있어도 해제할지 여부
+
+        Returns:
+            bool: 해제 여부
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry.refcount > 0 and not force):
+                return False
+            del self._entries[key]
+
+        with entry.load_lock:
+            engine, entry.engine = entry.engine, None
+            if engine is None:
+                return False
+            try:
+                if entry.shutdown is not None:
+                    entry.shutdown(engine)
+                elif hasattr(engine, "shutdown"):
+                    engine.shutdown()
+                logger.info(f"엔진 해제 완료: {key}")
+            except Exception as e:
+                logger.error(f"엔진 해제 중 오류 ({key}): {e}")
+        return True
+
+    def unload_idle(self) -> int:
+        """유휴 시간이 지난 엔진 해제 (해제한 개수 반환)"""
+        now = time.monotonic()
+        with self._lock:
+            idle_keys = [
+                key for key, entry in self._entries.items()
+                if entry.refcount == 0 and now - entry.last_used >= self.idle_timeout
+            ]
+        return sum(self.unload(key) for key in idle_keys)
+
+    def shutdown_all(self):
+        """관리 중인 모든 엔진 해제"""
+        with self._lock:
+            keys = list(self._entries)
+        for key in keys:
+            self.unload(key, force=True)
+
+    def stats(self) -> dict:
+        """엔진별 참조 수 및 유휴 시간"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: {
+                    "loaded": entry.engine is not None,
+                    "refcount": entry.refcount,
+                    "idle_seconds": round(now - entry.last_used, 1) if entry.refcount == 0 else 0.0
+                }
+                for key, entry in self._entries.items()
+            }
+
+    def _ensure_reaper(self):
+        """유휴 엔진 해제 스레드 시작 (self._lock 보유 상태에서 호출)"""
+        if self.idle_timeout <= 0 or (self._reaper is not None and self._reaper.is_alive()):
+            return
+        self._reaper = threading.Thread(target=self._reap_loop, name="engine-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(1.0, min(self.idle_timeout / 2, 30.0))
+        while True:
+            time.sleep(interval)
+            self.unload_idle()
+            with self._lock:
+                if not self._entries:
+                    self._reaper = None
+                    return
+
+
+class SGLangHTTPEngine:
+    """
+    SGLang 서버(/generate)를 sgl.Engine과 같은 generate() 인터페이스로 감싼 어댑터
+    (md_summarizer.SGLangClient와 동일한 요청 형식, 엔드포인트 라운드 로빈)
+    """
+
+    def __init__(self, endpoints: list, timeout: float = 600.0):
+        """
+        Args:
+            endpoints: SGLang 서버 엔드포인트 리스트
+            timeout: 요청 타임아웃 (초)
+        """
+        import httpx
+
+        self.endpoints = list(endpoints)
+        self._endpoint_cycle = cycle(self.endpoints)
+        self._cycle_lock = threading.Lock()
+        self._client = httpx.Client(timeout=timeout)
+
+    def _next_endpoint(self) -> str:
+        with self._cycle_lock:
+            return next(self._endpoint_cycle)
+
+    def generate(self, prompt, sampling_params: dict = None):
+        """
+        텍스트 생성
+
+        Args:
+            prompt: 프롬프트 문자열 또는 리스트 (배치)
+            sampling_params: 샘플링 파라미터
+
+        Returns:
+            dict 또는 list: {"text": ...} 형식 결과 (배치이면 리스트)
+        """
+        response = self._client.post(
+            f"{self._next_endpoint()}/generate",
+            json={"text": prompt, "sampling_params": sampling_params or {}}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def shutdown(self):
+        self._client.close()
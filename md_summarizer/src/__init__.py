@@ -5,10 +5,12 @@ MD Summarizer Package
 from .sglang_client import SGLangClient, AnswerGenerator
 from .md_parser import MDParser
 from .summary_index import MDSummaryIndex
+from .state_store import SharedStateStore
 
 __all__ = [
     "SGLangClient",
     "AnswerGenerator",
     "MDParser",
-    "MDSummaryIndex"
+    "MDSummaryIndex",
+    "SharedStateStore"
 ]
@@ -10,8 +10,17 @@ import logging
 import re
 import json
 import os
+import contextlib
 from notebooklm.config import RAGConfig
 import torch
+
+# search 모듈과 엔진 관리자를 공유 (search.summarizer와 같은 임포트 순서를 써야 프로세스 전역에서 하나로 유지됨)
+try:
+    from llm_engine import EngineManager
+except ImportError:
+    from skill.llm_engine import EngineManager
+
+from .sglang_client import SGLangClient, GENERATION_FAILED_PREFIX
             
 
 # 로깅 설정
@@ -21,76 +30,108 @@ logger = logging.getLogger(__name__)
 class AnswerGenerator:
     """MD 문서 요약을 위한 생성기 (SGLang Engine 직접 로드 방식)"""
     
-    def __init__(self, model_name: str = "Model Name"):
+    def __init__(self, model_name: str = "Model Name", backend: str = None, endpoints: list = None):
         """
         초기화
         
         Args:
             model_name: 사용할 모델 이름
+            backend: "engine"(프로세스 내 SGLang Engine) 또는 "http"(SGLangClient), 기본값은 설정값
+            endpoints: http 백엔드에서 사용할 SGLang 서버 엔드포인트 리스트
         """
+        config = RAGConfig()
         self.model_name = model_name
+        self.backend = backend or getattr(config, 'SUMMARIZER_BACKEND', 'engine')
+        self.endpoints = endpoints or getattr(config, 'SGLANG_ENDPOINTS', None)
         self.engine = None
+        self.client = SGLangClient(self.endpoints) if self.backend == "http" else None
         self.model_loaded = False
     
+    @property
+    def engine_key(self) -> str:
+        """엔진 관리자에서 사용하는 공유 키 (search.summarizer와 같은 모델이면 같은 엔진 사용)"""
+        return f"engine:{self.model_name}"
+    
     def load_model(self):
-        """SGLang Engine 초기화"""
+        """SGLang Engine 획득 (프로세스 전역 관리자에서 공유, 최초 1회만 로드)"""
+        if self.backend == "http":
+            # 서버 기반이므로 로드할 모델 없음
+            self.model_loaded = True
+            return True
+        
         try:
-            logger.info(f"SGLang Engine 초기화 중: {self.model_name}")
-            
-            # PyTorch를 사용하여 GPU 메모리 정리
-            if torch.cuda.is_available():
-                # 미사용 캐시 메모리 해제
-                torch.cuda.empty_cache()
-                logger.info("GPU 캐시 메모리 정리 완료")
-            
-            logger.info("SGLang Engine API 직접 사용 - 모델 직접 로드")
-            
-            # Config에서 디바이스 설정 가져오기 (TEST_MODE 지원)
-            config = RAGConfig()
-            device = config.TEXT_GENERATOR_DEVICE
-            logger.info(f"SGLang Engine 디바이스 설정: {device}")
-            
-            # device가 "cuda:N" 형식이면 환경 변수로 설정
-            original_cuda_visible = os.environ.get('CUDA_VISIBLE_DEVICES')
-            if device != "auto" and device.startswith("cuda:"):
-                gpu_id = device.split(":")[1]
-                os.environ['CUDA_VISIBLE_DEVICES'] = gpu_id
-                logger.info(f"CUDA_VISIBLE_DEVICES 설정: {gpu_id}")
-            
-            # Engine 클래스를 사용하여 모델 초기화
-            # mem_fraction_static: SGLang이 사용할 GPU 메모리 비율
-            try:
-                self.engine = sgl.Engine(
-                    model_path=self.model_name,
-                    mem_fraction_static= ,  # 메모리 할당량 제한 (20% - 약 16GB)
-                    disable_cuda_graph=True,  # CUDA 그래프 비활성화로 안정성 향상
-                    trust_remote_code=True,   # 원격 코드 신뢰
-                    dtype="auto"              # 자동으로 적절한 dtype 선택
-                )
-            finally:
-                # 환경 변수 복원
-                if original_cuda_visible is not None:
-                    os.environ['CUDA_VISIBLE_DEVICES'] = original_cuda_visible
-                elif 'CUDA_VISIBLE_DEVICES' in os.environ:
-                    del os.environ['CUDA_VISIBLE_DEVICES']
-            
+            self.engine = EngineManager.instance().acquire(
+                self.engine_key, self._create_engine, shutdown=self._shutdown_engine
+            )
             self.model_loaded = True
-            logger.info("SGLang Engine 초기화 완료")
             return True
         except Exception as e:
             logger.error(f"SGLang Engine 초기화 실패: {e}")
+            self.engine = None
             self.model_loaded = False
             return False
     
+    def _create_engine(self):
+        """SGLang Engine 생성 (EngineManager가 최초 1회 호출)"""
+        logger.info(f"SGLang Engine 초기화 중: {self.model_name}")
+        
+        # PyTorch를 사용하여 GPU 메모리 정리
+        if torch.cuda.is_available():
+            # 미사용 캐시 메모리 해제
+            torch.cuda.empty_cache()
+            logger.info("GPU 캐시 메모리 정리 완료")
+        
+        logger.info("SGLang Engine API 직접 사용 - 모델 직접 로드")
+        
+        # Config에서 디바이스 설정 가져오기 (TEST_MODE 지원)
+        config = RAGConfig()
+        device = config.TEXT_GENERATOR_DEVICE
+        logger.info(f"SGLang Engine 디바이스 설정: {device}")
+        
+        # device가 "cuda:N" 형식이면 환경 변수로 설정
+        original_cuda_visible = os.environ.get('CUDA_VISIBLE_DEVICES')
+        if device != "auto" and device.startswith("cuda:"):
+            gpu_id = device.split(":")[1]
+            os.environ['CUDA_VISIBLE_DEVICES'] = gpu_id
+            logger.info(f"CUDA_VISIBLE_DEVICES 설정: {gpu_id}")
+        
+        # Engine 클래스를 사용하여 모델 초기화
+        # mem_fraction_static: SGLang이 사용할 GPU 메모리 비율
+        try:
+            engine = sgl.Engine(
+                model_path=self.model_name,
+                mem_fraction_static= ,  # 메모리 할당량 제한 (20% - 약 16GB)
+                disable_cuda_graph=True,  # CUDA 그래프 비활성화로 안정성 향상
+                trust_remote_code=True,   # 원격 코드 신뢰
+                dtype="auto"              # 자동으로 적절한 dtype 선택
+            )
+        finally:
+            # 환경 변수 복원
+            if original_cuda_visible is not None:
+                os.environ['CUDA_VISIBLE_DEVICES'] = original_cuda_visible
+            elif 'CUDA_VISIBLE_DEVICES' in os.environ:
+                del os.environ['CUDA_VISIBLE_DEVICES']
+        
+        logger.info("SGLang Engine 초기화 완료")
+        return engine
+    
+    @staticmethod
+    def _shutdown_engine(engine):
+        """SGLang Engine 해제 (유휴 시간 초과 시 EngineManager가 호출)"""
+        if hasattr(engine, "shutdown"):
+            engine.shutdown()
+        del engine
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    
     def cleanup_model(self):
-        """모델 메모리 정리"""
+        """엔진 참조 반환 (실제 해제는 EngineManager가 유휴 시간 후 수행)"""
         try:
-            if self.engine is not None:
-                del self.engine
-                self.engine = None
-            
+            if self.model_loaded and self.backend != "http":
+                EngineManager.instance().release(self.engine_key)
+            self.engine = None
             self.model_loaded = False
-            logger.info("모델 메모리 정리 완료")
+            logger.info("엔진 참조 반환 완료")
         except Exception as e:
             logger.error(f"모델 메모리 정리 중 오류: {e}")
     
@@ -108,6 +149,10 @@ class AnswerGenerator:
         if not content or content.isspace():
             return "(관련된 구글 검색 결과를 찾을 수 없습니다)"
         
+        # HTTP 백엔드는 SGLang 서버 클라이언트로 위임 (청킹 포함)
+        if self.client is not None:
+            return self.client.generate_answer(content, max_tokens=max_tokens)
+        
         # 모델이 로드되지 않았으면 로드
         if not self.model_loaded:
             if not self.load_model():
@@ -135,7 +180,12 @@ class AnswerGenerator:
             # SGLang Engine으로 텍스트 생성
             logger.info("SGLang Engine으로 텍스트 생성 시작")
             
-            result = self.engine.generate(prompt=prompt, sampling_params=sampling_params)
+            # 같은 엔진을 쓰는 search 파이프라인 요약 워커와 동시에 generate하지 않도록 직렬화
+            # HTTP 백엔드는 서버가 동시 요청을 처리하므로 잠그지 않음
+            generate_lock = (contextlib.nullcontext() if self.backend == "http"
+                             else EngineManager.instance().generate_lock(self.engine_key))
+            with generate_lock:
+                result = self.engine.generate(prompt=prompt, sampling_params=sampling_params)
             response = result["text"]
             
             # <think> 태그 제거
@@ -149,7 +199,7 @@ class AnswerGenerator:
             
         except Exception as e:
             logger.error(f"답변 생성 중 오류 발생: {e}")
-            return f"답변 생성에 실패했습니다: {str(e)}"
+            return f"{GENERATION_FAILED_PREFIX}: {str(e)}"
     
     @staticmethod
     def make_llm_input_data(save_dir, json_data):
@@ -5,22 +5,27 @@ FastAPI Server for MD Summarizer
 
 from fastapi import FastAPI, HTTPException, File, UploadFile, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 import uuid
 import os
+import json
+import asyncio
 from datetime import datetime
 from loguru import logger
 
-from .sglang_client import SGLangClient
+from .sglang_client import SGLangClient, is_failed_summary
 from .md_parser import MDParser
 from .summary_index import MDSummaryIndex
+from .state_store import SharedStateStore
 
 
 # Pydantic 모델 정의 (기존 시스템과 동일)
 class SummarizeRequest(BaseModel):
     filenames: List[str]
+    stream: bool = False  # True이면 파일별 요약을 완료 순서대로 NDJSON 스트리밍
 
 class SummarizeResponse(BaseModel):
     summary: str
@@ -66,7 +71,10 @@ sglang_endpoints = [
     "http://localhost:port"
 ]
 summarizer = None
-tasks = {}
+state_store = None
+is_index_writer = False
+index_ready = asyncio.Event()
+background_tasks = []
 
 # 경로 설정
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -74,6 +82,19 @@ RESULTS_DIR = BASE_DIR
 SUMMARIZE_DIR = RESULTS_DIR 
 UPLOAD_DIR = RESULTS_DIR 
 
+# 요약 인덱스 스냅샷 설정 (증분 저널은 "<스냅샷>.journal"에 기록)
+INDEX_PATH = Path(os.environ.get("MD_SUMMARY_INDEX_PATH", str(RESULTS_DIR / "summary_index.json")))
+INDEX_COMPACT_INTERVAL = int(os.environ.get("MD_SUMMARY_INDEX_COMPACT_INTERVAL", "300"))  # 초
+INDEX_REFRESH_INTERVAL = float(os.environ.get("MD_SUMMARY_INDEX_REFRESH_INTERVAL", "5"))  # 초
+
+# 워커 간 공유 상태 (작업 상태, 요약 캐시)
+STATE_DB_PATH = Path(os.environ.get("MD_SUMMARIZER_STATE_DB", str(RESULTS_DIR / "state.db")))
+
+# 요약 요청당 동시에 처리할 파일 수
+SUMMARIZE_CONCURRENCY = int(os.environ.get("MD_SUMMARIZER_CONCURRENCY", "4"))
+
+NO_RESULT_SUMMARY = "(관련된 구글 검색 결과를 찾을 수 없습니다)"
+
 # 디렉토리 생성
 for dir_path in [RESULTS_DIR, SUMMARIZE_DIR, UPLOAD_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
@@ -82,17 +103,89 @@ for dir_path in [RESULTS_DIR, SUMMARIZE_DIR, UPLOAD_DIR]:
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 초기화"""
-    global summarizer
+    global summarizer, state_store, is_index_writer
     
-    logger.info("MD Summarizer API 서버 시작")
+    logger.info(f"MD Summarizer API 서버 시작 (pid={os.getpid()})")
     logger.info(f"SGLang 엔드포인트: {sglang_endpoints}")
     
     # 요약 시스템 초기화
     summarizer = MDSummaryIndex(sglang_endpoints)
+    state_store = SharedStateStore(STATE_DB_PATH)
+    
+    # 스냅샷 기록(컴팩션)은 writer 잠금을 얻은 워커 하나만 수행
+    is_index_writer = summarizer.acquire_writer_lock(INDEX_PATH)
+    
+    # 인덱스 로드/갱신/컴팩션은 백그라운드에서 수행 (서버 준비 상태를 막지 않음)
+    background_tasks.append(asyncio.create_task(load_index_background()))
+    background_tasks.append(asyncio.create_task(refresh_loop()))
+    if is_index_writer:
+        background_tasks.append(asyncio.create_task(compaction_loop()))
     
     logger.info("초기화 완료")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료 시 백그라운드 작업 정리 및 최종 컴팩션"""
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    
+    if summarizer is not None and is_index_writer and index_ready.is_set():
+        try:
+            await asyncio.to_thread(summarizer.compact_index, INDEX_PATH)
+        except Exception as e:
+            logger.error(f"종료 시 인덱스 컴팩션 실패: {e}")
+
+
+async def load_index_background():
+    """설정된 인덱스 스냅샷을 백그라운드 스레드에서 로드"""
+    try:
+        if INDEX_PATH.exists() or summarizer.journal_path(INDEX_PATH).exists():
+            logger.info(f"인덱스 로드 시작: {INDEX_PATH}")
+            await asyncio.to_thread(summarizer.load_index, INDEX_PATH)
+        else:
+            logger.info(f"저장된 인덱스가 없습니다. 새 인덱스로 시작: {INDEX_PATH}")
+    except Exception as e:
+        logger.error(f"인덱스 로드 실패: {e}")
+    finally:
+        index_ready.set()
+
+
+async def refresh_loop():
+    """다른 워커가 기록한 저널/스냅샷 변경을 주기적으로 반영"""
+    await index_ready.wait()
+    while True:
+        await asyncio.sleep(INDEX_REFRESH_INTERVAL)
+        try:
+            await asyncio.to_thread(summarizer.refresh_index, INDEX_PATH)
+        except Exception as e:
+            logger.error(f"인덱스 갱신 실패: {e}")
+
+
+async def compaction_loop():
+    """증분 저널을 주기적으로 스냅샷에 병합"""
+    await index_ready.wait()
+    while True:
+        await asyncio.sleep(INDEX_COMPACT_INTERVAL)
+        try:
+            await asyncio.to_thread(summarizer.compact_index, INDEX_PATH)
+        except Exception as e:
+            logger.error(f"인덱스 컴팩션 실패: {e}")
+
+
+async def record_document(doc_id: str, content: str = None, summary: str = None, file_path: str = None):
+    """인덱스에 문서를 반영하고 저널에 증분 기록"""
+    def _record():
+        record = summarizer.upsert_document(doc_id, content=content, summary=summary, file_path=file_path)
+        summarizer.append_journal(INDEX_PATH, record)
+    
+    try:
+        await asyncio.to_thread(_record)
+    except Exception as e:
+        logger.error(f"인덱스 기록 실패 ({doc_id}): {e}")
+
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
@@ -111,7 +204,184 @@ async def root():
 @app.get("/health")
 async def health_check():
     """헬스 체크"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "index_loaded": index_ready.is_set(),
+        "pid": os.getpid(),
+        "index_writer": is_index_writer,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def load_request_files(file_names: List[str]):
+    """
+    업로드 디렉토리에서 요약 대상 파일 읽기
+    
+    Returns:
+        tuple: (파일 내용 리스트, 찾을 수 없는 파일명 리스트)
+    """
+    file_contents = []
+    missing_files = []
+    
+    for file_name in file_names:
+        # 업로드된 파일 경로
+        file_path = UPLOAD_DIR / file_name
+        
+        if not file_path.exists():
+            logger.warning(f"파일을 찾을 수 없음: {file_path}")
+            missing_files.append(file_name)
+            continue
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+                file_contents.append({
+                    "title": file_name,
+                    "content": content
+                })
+            logger.info(f"파일 로드 성공: {file_name}")
+        except Exception as e:
+            logger.error(f"파일 읽기 오류 ({file_name}): {str(e)}")
+    
+    return file_contents, missing_files
+
+
+async def summarize_file(client: SGLangClient, item: Dict[str, str]) -> Optional[str]:
+    """
+    단일 파일 요약 (캐시 확인 → LLM 호출 → 인덱스 기록)
+    
+    Returns:
+        str: 요약 결과 (실패 시 None)
+    """
+    # 다른 워커가 이미 요약한 동일 내용은 캐시 사용
+    summary = await asyncio.to_thread(state_store.get_cached_summary, item["content"])
+    if summary is None:
+        summary = await asyncio.to_thread(client.generate_answer, item["content"])
+        # 오류 문구는 캐시하지 않아야 다음 요청에서 다시 시도함
+        if summary and summary != NO_RESULT_SUMMARY and not is_failed_summary(summary):
+            await asyncio.to_thread(state_store.put_cached_summary, item["content"], summary)
+    
+    if not summary or summary == NO_RESULT_SUMMARY or is_failed_summary(summary):
+        if is_failed_summary(summary):
+            logger.warning(f"요약 생성 실패 ({item['title']}): {summary[:200]}")
+        return None
+    
+    await record_document(
+        item["title"],
+        content=item["content"],
+        summary=summary,
+        file_path=str(UPLOAD_DIR / item["title"])
+    )
+    return summary
+
+
+async def iter_file_summaries(client: SGLangClient, file_contents: List[Dict[str, str]]):
+    """
+    파일별 요약을 동시에 실행하고 완료되는 순서대로 반환
+    
+    짧은 파일부터 LLM 호출 슬롯을 배정하여 첫 결과까지의 시간을 줄입니다.
+    
+    Yields:
+        tuple: (파일 정보, 요약 또는 None, 오류 메시지 또는 None)
+    """
+    semaphore = asyncio.Semaphore(max(1, SUMMARIZE_CONCURRENCY))
+    ordered = sorted(file_contents, key=lambda item: len(item["content"]))
+    
+    async def run(item):
+        try:
+            async with semaphore:
+                return item, await summarize_file(client, item), None
+        except Exception as e:
+            logger.error(f"요약 생성 오류 ({item['title']}): {e}")
+            return item, None, str(e)
+    
+    # 세마포어 대기 순서가 생성 순서를 따르므로 짧은 파일이 먼저 실행됨
+    pending = [asyncio.create_task(run(item)) for item in ordered]
+    try:
+        for next_done in asyncio.as_completed(pending):
+            yield await next_done
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def save_summary_file(file_names: List[str], final_summary: str) -> Path:
+    """최종 요약을 마크다운 파일로 저장"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    summary_filename = f"summary_{timestamp}.md"
+    summary_path = SUMMARIZE_DIR / summary_filename
+    
+    with open(summary_path, "w", encoding="utf-8") as f:
+        f.write(f"# 요약 결과 ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})\n\n")
+        f.write(f"## 요약 대상 파일\n")
+        for file_name in file_names:
+            f.write(f"- {file_name}\n")
+        f.write("\n## 요약 내용\n\n")
+        f.write(final_summary)
+    
+    logger.info(f"요약 완료: {summary_path}")
+    return summary_path
+
+
+def combine_summaries(file_contents: List[Dict[str, str]], summaries: Dict[str, str]) -> str:
+    """요청 파일 순서대로 요약 결합"""
+    return "\n\n---\n\n".join(
+        f"## {item['title']}\n\n{summaries[item['title']]}"
+        for item in file_contents
+        if item["title"] in summaries
+    )
+
+
+async def stream_summaries(client: SGLangClient, file_names: List[str],
+                           file_contents: List[Dict[str, str]], missing_files: List[str]):
+    """
+    파일별 요약을 NDJSON 이벤트로 스트리밍
+    
+    이벤트 순서: start → file(완료 순) → done
+    작업 상태는 공유 저장소에 기록되어 /api/v1/tasks/{task_id}로도 조회할 수 있습니다.
+    """
+    task_id = str(uuid.uuid4())
+    total = len(file_contents)
+    await asyncio.to_thread(state_store.create_task, task_id, "processing", "요약 진행 중")
+    
+    def event(payload: Dict[str, Any]) -> str:
+        return json.dumps(payload, ensure_ascii=False) + "\n"
+    
+    yield event({"event": "start", "task_id": task_id, "total": total, "missing_files": missing_files})
+    
+    summaries = {}
+    completed = 0
+    async for item, summary, error in iter_file_summaries(client, file_contents):
+        completed += 1
+        if summary:
+            summaries[item["title"]] = summary
+        
+        progress = int(completed * 100 / total)
+        await asyncio.to_thread(state_store.update_task, task_id, progress=progress)
+        yield event({
+            "event": "file",
+            "file": item["title"],
+            "summary": summary,
+            "error": None if summary else (error or "요약 생성에 실패했습니다"),
+            "completed": completed,
+            "total": total
+        })
+    
+    if not summaries:
+        await asyncio.to_thread(state_store.update_task, task_id, status="failed", error="요약 생성에 실패했습니다")
+        yield event({"event": "error", "task_id": task_id, "detail": "요약 생성에 실패했습니다"})
+        return
+    
+    final_summary = combine_summaries(file_contents, summaries)
+    summary_path = await asyncio.to_thread(save_summary_file, file_names, final_summary)
+    result = {
+        "summary": final_summary,
+        "files": file_names,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "summary_file": str(summary_path)
+    }
+    await asyncio.to_thread(state_store.update_task, task_id, status="completed", message="요약 완료", result=result)
+    yield event({"event": "done", "task_id": task_id, **result})
 
 
 @app.post("/api/v1/summarize", response_model=SummarizeResponse)
@@ -119,6 +389,9 @@ async def summarize_files(request_data: SummarizeRequest):
     """
     파일 요약 API (기존 시스템과 동일한 인터페이스)
     
+    파일별 요약은 MD_SUMMARIZER_CONCURRENCY 만큼 동시에 실행됩니다.
+    stream=True이면 각 파일의 요약이 완료되는 즉시 NDJSON으로 전달합니다.
+    
     Args:
         request_data: 요약할 파일명 리스트
         
@@ -133,28 +406,7 @@ async def summarize_files(request_data: SummarizeRequest):
         client = SGLangClient(sglang_endpoints)
         
         # 파일 내용 수집
-        file_contents = []
-        missing_files = []
-        
-        for file_name in file_names:
-            # 업로드된 파일 경로
-            file_path = UPLOAD_DIR / file_name
-            
-            if not file_path.exists():
-                logger.warning(f"파일을 찾을 수 없음: {file_path}")
-                missing_files.append(file_name)
-                continue
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    file_contents.append({
-                        "title": file_name,
-                        "content": content
-                    })
-                logger.info(f"파일 로드 성공: {file_name}")
-            except Exception as e:
-                logger.error(f"파일 읽기 오류 ({file_name}): {str(e)}")
+        file_contents, missing_files = await asyncio.to_thread(load_request_files, file_names)
         
         if not file_contents:
             if missing_files:
@@ -165,36 +417,26 @@ async def summarize_files(request_data: SummarizeRequest):
             else:
                 raise HTTPException(status_code=404, detail="유효한 파일을 찾을 수 없습니다")
         
-        # 각 파일 요약 생성
-        summaries = []
-        for item in file_contents:
-            try:
-                summary = client.generate_answer(item["content"])
-                if summary and summary != "(관련된 구글 검색 결과를 찾을 수 없습니다)":
-                    summaries.append(f"## {item['title']}\n\n{summary}")
-            except Exception as e:
-                logger.error(f"요약 생성 오류 ({item['title']}): {e}")
+        if request_data.stream:
+            return StreamingResponse(
+                stream_summaries(client, file_names, file_contents, missing_files),
+                media_type="application/x-ndjson"
+            )
+        
+        # 각 파일 요약 생성 (동시 실행)
+        summaries = {}
+        async for item, summary, _ in iter_file_summaries(client, file_contents):
+            if summary:
+                summaries[item["title"]] = summary
         
         if not summaries:
             raise HTTPException(status_code=500, detail="요약 생성에 실패했습니다")
         
-        # 최종 요약 결합
-        final_summary = "\n\n---\n\n".join(summaries)
+        # 최종 요약 결합 (요청 순서 유지)
+        final_summary = combine_summaries(file_contents, summaries)
         
         # 요약 결과 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        summary_filename = f"summary_{timestamp}.md"
-        summary_path = SUMMARIZE_DIR / summary_filename
-        
-        with open(summary_path, "w", encoding="utf-8") as f:
-            f.write(f"# 요약 결과 ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})\n\n")
-            f.write(f"## 요약 대상 파일\n")
-            for file_name in file_names:
-                f.write(f"- {file_name}\n")
-            f.write("\n## 요약 내용\n\n")
-            f.write(final_summary)
-        
-        logger.info(f"요약 완료: {summary_path}")
+        summary_path = await asyncio.to_thread(save_summary_file, file_names, final_summary)
         
         return {
             "summary": final_summary,
@@ -230,6 +472,13 @@ async def upload_file(file: UploadFile = File(...)):
         
         logger.info(f"파일 업로드 성공: {file.filename}")
         
+        # 업로드 문서를 인덱스에 기록 (요약은 요약 API 호출 시 갱신)
+        await record_document(
+            file.filename,
+            content=content.decode("utf-8", errors="replace"),
+            file_path=str(file_path)
+        )
+        
         return {
             "message": "파일 업로드 성공",
             "filename": file.filename,
@@ -253,6 +502,9 @@ async def search_documents(request: SearchRequest):
         SearchResponse: 검색 결과
     """
     try:
+        if not index_ready.is_set():
+            raise HTTPException(status_code=503, detail="인덱스를 로드하는 중입니다")
+        
         if not summarizer.documents:
             raise HTTPException(status_code=404, detail="인덱싱된 문서가 없습니다")
         
@@ -294,19 +546,31 @@ async def get_task_status(task_id: str):
     Returns:
         TaskStatusResponse: 작업 상태
     """
-    if task_id not in tasks:
+    task = await asyncio.to_thread(state_store.get_task, task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail=f"작업 ID {task_id}를 찾을 수 없습니다")
     
-    return TaskStatusResponse(**tasks[task_id])
+    return TaskStatusResponse(**task)
 
 
 if __name__ == "__main__":
+    import argparse
     import uvicorn
     
+    parser = argparse.ArgumentParser(description="MD Summarizer API 서버")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("MD_SUMMARIZER_WORKERS", "1")),
+                        help="워커 프로세스 수 (2 이상이면 운영 모드, reload 비활성화)")
+    parser.add_argument("--reload", action="store_true", help="개발 모드 자동 재시작 (단일 워커)")
+    args = parser.parse_args()
+    
+    # reload와 멀티 워커는 함께 사용할 수 없음
+    workers = 1 if args.reload else max(1, args.workers)
+    
     uvicorn.run(
         "src.api_server:app",
         host="0.0.0.0",
         port= ,
-        reload=True,
+        reload=args.reload,
+        workers=workers,
         log_level="info"
     )
@@ -12,6 +12,19 @@ from datetime import datetime
 from .md_parser import MDParser
 
 
+# 오류 시 generate_answer가 반환하는 문구 (정상 요약과 구분하여 캐시/인덱스에 남기지 않기 위함)
+GENERATION_FAILED_PREFIX = "답변 생성에 실패했습니다"
+# 청킹 요약에서 실패한 청크 자리에 들어가는 표시
+CHUNK_FAILED_MARKER = "(요약 실패:"
+
+
+def is_failed_summary(summary: Optional[str]) -> bool:
+    """generate_answer 결과가 오류 문구이거나 실패한 청크를 포함하는지 여부"""
+    if not summary:
+        return False
+    return summary.startswith(GENERATION_FAILED_PREFIX) or CHUNK_FAILED_MARKER in summary
+
+
 class SGLangClient:
     """SGLang 서버와 통신하는 클라이언트"""
     
@@ -71,7 +84,7 @@ class SGLangClient:
             
         except Exception as e:
             logger.error(f"요약 생성 중 오류: {e}")
-            return f"답변 생성에 실패했습니다: {str(e)}"
+            return f"{GENERATION_FAILED_PREFIX}: {str(e)}"
     
     def _call_sglang(self, endpoint: str, prompt: str, max_tokens: int) -> str:
         """SGLang 서버 호출"""
@@ -134,7 +147,7 @@ class SGLangClient:
             
         except Exception as e:
             logger.error(f"비동기 요약 생성 중 오류: {e}")
-            return f"답변 생성에 실패했습니다: {str(e)}"
+            return f"{GENERATION_FAILED_PREFIX}: {str(e)}"
     
     async def _call_sglang_async(self, endpoint: str, prompt: str, max_tokens: int, client: httpx.AsyncClient) -> str:
         """비동기 SGLang 서버 호출 (공유 클라이언트 사용)"""
@@ -247,7 +260,7 @@ class SGLangClient:
                     
                 except Exception as e:
                     logger.error(f"청크 {i} 요약 실패: {e}")
-                    return (i, f"## 파트 {i}\n\n(요약 실패: {str(e)})")
+                    return (i, f"## 파트 {i}\n\n{CHUNK_FAILED_MARKER} {str(e)})")
             
             # 모든 청크를 병렬로 처리
             tasks = [process_single_chunk(i+1, chunk) for i, chunk in enumerate(chunks)]
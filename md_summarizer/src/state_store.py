@@ -0,0 +1,183 @@
+"""
+Shared State Store
+멀티 워커 API 서버가 공유하는 작업 상태 및 요약 캐시 저장소 (SQLite WAL)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from loguru import logger
+
+
+class SharedStateStore:
+    """
+    SQLite WAL 기반 공유 상태 저장소
+
+    WAL 모드에서는 여러 워커 프로세스가 동시에 읽고, 쓰기는 짧은 트랜잭션으로 직렬화됩니다.
+    sqlite3 연결은 스레드 간 공유할 수 없으므로 스레드마다 별도 연결을 사용합니다.
+    """
+
+    TASK_FIELDS = ("task_id", "status", "message", "progress", "result", "error")
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = 5000):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 경로
+            busy_timeout_ms: 다른 워커가 쓰기 잠금을 가진 경우 대기 시간 (밀리초)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+
+        self._init_schema()
+        logger.info(f"공유 상태 저장소 초기화: {self.db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """현재 스레드의 연결 반환 (없으면 생성)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        """테이블 생성"""
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                message TEXT,
+                progress INTEGER,
+                result TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS summary_cache (
+                content_hash TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+
+    # ------------------------------------------------------------------
+    # 작업 상태
+    # ------------------------------------------------------------------
+
+    def create_task(self, task_id: str, status: str = "pending", message: str = None):
+        """
+        작업 등록
+
+        Args:
+            task_id: 작업 ID
+            status: 초기 상태
+            message: 상태 메시지
+        """
+        self._connect().execute(
+            "INSERT OR REPLACE INTO tasks (task_id, status, message, progress, updated_at) VALUES (?, ?, ?, 0, ?)",
+            (task_id, status, message, time.time())
+        )
+
+    def update_task(self, task_id: str, **fields):
+        """
+        작업 상태 갱신
+
+        Args:
+            task_id: 작업 ID
+            **fields: status, message, progress, result, error 중 갱신할 항목
+        """
+        columns = [key for key in fields if key in self.TASK_FIELDS and key != "task_id"]
+        if not columns:
+            return
+
+        values = [
+            json.dumps(fields[key], ensure_ascii=False) if key == "result" else fields[key]
+            for key in columns
+        ]
+        assignments = ", ".join(f"{key} = ?" for key in columns)
+        self._connect().execute(
+            f"UPDATE tasks SET {assignments}, updated_at = ? WHERE task_id = ?",
+            (*values, time.time(), task_id)
+        )
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        작업 상태 조회
+
+        Args:
+            task_id: 작업 ID
+
+        Returns:
+            dict: 작업 상태 (없으면 None)
+        """
+        row = self._connect().execute(
+            "SELECT task_id, status, message, progress, result, error FROM tasks WHERE task_id = ?",
+            (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        task = dict(row)
+        if task["result"] is not None:
+            task["result"] = json.loads(task["result"])
+        return task
+
+    # ------------------------------------------------------------------
+    # 요약 캐시
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """요약 캐시 키 (문서 내용의 SHA-256)"""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get_cached_summary(self, content: str) -> Optional[str]:
+        """
+        같은 내용에 대한 기존 요약 조회
+
+        Args:
+            content: 문서 내용
+
+        Returns:
+            str: 캐시된 요약 (없으면 None)
+        """
+        row = self._connect().execute(
+            "SELECT summary FROM summary_cache WHERE content_hash = ?",
+            (self.content_hash(content),)
+        ).fetchone()
+        return row["summary"] if row else None
+
+    def put_cached_summary(self, content: str, summary: str):
+        """
+        요약 결과 캐시
+
+        Args:
+            content: 문서 내용
+            summary: 요약 결과
+        """
+        self._connect().execute(
+            "INSERT OR REPLACE INTO summary_cache (content_hash, summary, created_at) VALUES (?, ?, ?)",
+            (self.content_hash(content), summary, time.time())
+        )
+
+    def close(self):
+        """현재 스레드의 연결 종료"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
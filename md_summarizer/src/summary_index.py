@@ -8,8 +8,16 @@ from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 from loguru import logger
 import json
+import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
+try:
+    import fcntl  # 멀티 프로세스 파일 잠금 (POSIX)
+except ImportError:
+    fcntl = None
+
 from .sglang_client import SGLangClient
 from .md_parser import MDParser
 
@@ -33,6 +41,14 @@ class MDSummaryIndex:
         self.summaries: List[str] = []
         self.doc_id_map: Dict[str, int] = {}  # filename -> index
         
+        # 백그라운드 로드/컴팩션과 API 요청이 동시에 접근하므로 잠금으로 보호
+        self._lock = threading.RLock()
+        
+        # 공유 스냅샷/저널 동기화 상태 (멀티 워커 환경)
+        self._snapshot_stamp: Optional[Tuple[int, int]] = None
+        self._journal_offset = 0
+        self._writer_lock_file = None
+        
         logger.info("MDSummaryIndex 초기화 완료")
     
     def add_document(self, doc_id: str, content: str = None, file_path: str = None):
@@ -115,7 +131,21 @@ class MDSummaryIndex:
         Returns:
             list: [(doc_id, score), ...]
         """
-        if not self.summaries:
+        documents, summaries, _ = self._view()
+        return self._rank(query, top_k, documents, summaries)
+    
+    def _view(self) -> Tuple[List[Dict[str, any]], List[str], Dict[str, int]]:
+        """
+        읽기용 (documents, summaries, doc_id_map) 참조
+        
+        load_index는 세 객체를 통째로 교체하므로, 한 번 잡은 참조는 요청 처리 동안 서로 일관됩니다.
+        """
+        with self._lock:
+            return self.documents, self.summaries, self.doc_id_map
+    
+    def _rank(self, query: str, top_k: int, documents: List[Dict[str, any]], summaries: List[str]) -> List[Tuple[str, float]]:
+        """rank_documents 본체 (주어진 뷰 기준)"""
+        if not summaries:
             logger.warning("요약이 생성되지 않았습니다. generate_summaries()를 먼저 호출하세요.")
             return []
         
@@ -123,14 +153,15 @@ class MDSummaryIndex:
         
         ranked_scores = []
         
-        for i, summary in enumerate(self.summaries):
+        # upsert가 documents를 먼저 늘리므로 summaries 길이까지만 보면 항상 짝이 맞음
+        for i, summary in enumerate(summaries[:len(documents)]):
             # 간단한 키워드 매칭 기반 점수 (실제로는 임베딩 사용 권장)
             score = self._calculate_relevance_score(query, summary)
             ranked_scores.append(score)
         
         # 상위 K개 선택
         ranked_indices = np.argsort(ranked_scores)[::-1][:top_k]
-        results = [(self.documents[i]["id"], ranked_scores[i]) for i in ranked_indices]
+        results = [(documents[i]["id"], ranked_scores[i]) for i in ranked_indices]
         
         logger.info(f"상위 {top_k}개 문서: {[doc_id for doc_id, _ in results]}")
         return results
@@ -169,16 +200,17 @@ class MDSummaryIndex:
         Returns:
             list: 검색 결과 [{"doc_id": "...", "summary": "...", "score": 0.0}]
         """
-        ranked_results = self.rank_documents(query, top_k)
+        documents, summaries, doc_id_map = self._view()
+        ranked_results = self._rank(query, top_k, documents, summaries)
         
         results = []
         for doc_id, score in ranked_results:
-            doc_index = self.doc_id_map[doc_id]
+            doc_index = doc_id_map[doc_id]
             results.append({
                 "doc_id": doc_id,
-                "summary": self.summaries[doc_index],
+                "summary": summaries[doc_index],
                 "score": score,
-                "content": self.documents[doc_index]["content"]
+                "content": documents[doc_index]["content"]
             })
         
         return results
@@ -205,49 +237,348 @@ class MDSummaryIndex:
         
         return self.summaries[doc_index]
     
+    def upsert_document(self, doc_id: str, content: str = None, summary: str = None, file_path: str = None) -> Dict[str, any]:
+        """
+        문서 추가 또는 갱신 (doc_id 기준, 요약 리스트와 인덱스 정렬 유지)
+        
+        Args:
+            doc_id: 문서 ID (파일명)
+            content: 문서 내용 (None이면 기존 값 유지)
+            summary: 요약 텍스트 (None이면 기존 값 유지)
+            file_path: 문서 파일 경로
+            
+        Returns:
+            dict: 저널에 기록할 문서 레코드
+        """
+        with self._lock:
+            doc_index = self._upsert_into(self.documents, self.summaries, self.doc_id_map,
+                                          doc_id, content, summary, file_path)
+            return {
+                "document": dict(self.documents[doc_index]),
+                "summary": self.summaries[doc_index]
+            }
+    
+    @staticmethod
+    def _upsert_into(documents: List[Dict[str, any]], summaries: List[str], doc_id_map: Dict[str, int],
+                     doc_id: str, content: str = None, summary: str = None, file_path: str = None) -> int:
+        """
+        주어진 저장소에 문서 upsert (upsert_document / load_index 공용)
+        
+        Returns:
+            int: 문서 인덱스
+        """
+        if doc_id in doc_id_map:
+            doc_index = doc_id_map[doc_id]
+            doc = documents[doc_index]
+            if content is not None:
+                doc["content"] = content
+            if file_path is not None:
+                doc["file_path"] = file_path
+            doc["updated_at"] = datetime.now().isoformat()
+        else:
+            doc_index = len(documents)
+            documents.append({
+                "id": doc_id,
+                "content": content or "",
+                "file_path": file_path,
+                "added_at": datetime.now().isoformat()
+            })
+            doc_id_map[doc_id] = doc_index
+        
+        # 요약이 아직 없는 문서는 빈 문자열로 채워 인덱스 정렬 유지
+        while len(summaries) <= doc_index:
+            summaries.append("")
+        if summary is not None:
+            summaries[doc_index] = summary
+        return doc_index
+    
+    @staticmethod
+    def journal_path(index_path: str) -> Path:
+        """스냅샷 경로에 대응하는 증분 저널 파일 경로"""
+        index_path = Path(index_path)
+        return index_path.with_name(index_path.name + ".journal")
+    
+    @contextmanager
+    def _journal_lock(self, index_path: str, exclusive: bool = False):
+        """
+        워커 간 저널 잠금 (추가는 공유 잠금, 컴팩션은 배타 잠금)
+        
+        저널 파일 자체는 컴팩션 시 삭제되므로 별도의 고정 잠금 파일을 사용합니다.
+        """
+        if fcntl is None:
+            yield
+            return
+        
+        lock_path = Path(index_path).with_name(Path(index_path).name + ".journal.lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    def acquire_writer_lock(self, index_path: str) -> bool:
+        """
+        스냅샷 기록 권한(단일 writer) 획득 시도
+        
+        Args:
+            index_path: 스냅샷 경로
+            
+        Returns:
+            bool: 이 프로세스가 writer이면 True (프로세스 종료 시 자동 해제)
+        """
+        if fcntl is None:
+            return True
+        if self._writer_lock_file is not None:
+            return True
+        
+        lock_path = Path(index_path).with_name(Path(index_path).name + ".writer.lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(lock_path, 'a')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        
+        self._writer_lock_file = lock_file
+        logger.info(f"인덱스 writer 잠금 획득 (pid={os.getpid()})")
+        return True
+    
+    def append_journal(self, index_path: str, record: Dict[str, any]):
+        """
+        문서 레코드를 증분 저널(JSON Lines)에 추가
+        
+        Args:
+            index_path: 스냅샷 경로
+            record: upsert_document()가 반환한 레코드
+        """
+        journal_path = self.journal_path(index_path)
+        journal_path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        
+        with self._lock, self._journal_lock(index_path):
+            # O_APPEND 단일 write로 기록하여 다른 워커의 추가와 섞이지 않도록 함
+            with open(journal_path, 'ab') as f:
+                f.write(line.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def journal_size(self, index_path: str) -> int:
+        """저널 파일 크기 (바이트, 없으면 0)"""
+        journal_path = self.journal_path(index_path)
+        return journal_path.stat().st_size if journal_path.exists() else 0
+    
+    @staticmethod
+    def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+        """스냅샷 변경 감지용 (mtime_ns, size)"""
+        try:
+            stat = Path(path).stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    @staticmethod
+    def _read_snapshot(path: Path) -> Dict[str, any]:
+        """스냅샷 JSON 로드 (빈 파일이면 빈 인덱스)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return {"documents": [], "summaries": []}
+            return json.load(f)
+    
+    @staticmethod
+    def _read_journal(journal_path: Path, offset: int = 0) -> Tuple[List[Dict[str, any]], int]:
+        """
+        저널에서 offset 이후의 완전한 레코드만 읽기
+        
+        Returns:
+            tuple: (레코드 리스트, 다음 offset)
+        """
+        records = []
+        if not journal_path.exists():
+            return records, 0
+        
+        with open(journal_path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        
+        # 쓰는 중인 마지막 줄은 다음 갱신 때 읽음
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"손상된 저널 레코드 무시: {journal_path}")
+        
+        return records, offset + len(complete)
+    
+    def _apply_journal_records(self, records: List[Dict[str, any]], documents: List[Dict[str, any]] = None,
+                               summaries: List[str] = None, doc_id_map: Dict[str, int] = None):
+        """
+        저널 레코드를 인덱스에 재생 (doc_id 기준 upsert이므로 중복 재생해도 안전)
+        
+        documents/summaries/doc_id_map을 주면 현재 인덱스 대신 그 저장소에 반영합니다.
+        """
+        if documents is None:
+            documents, summaries, doc_id_map = self.documents, self.summaries, self.doc_id_map
+        for record in records:
+            doc = record.get("document", {})
+            if "id" not in doc:
+                continue
+            self._upsert_into(
+                documents, summaries, doc_id_map,
+                doc["id"],
+                content=doc.get("content"),
+                summary=record.get("summary"),
+                file_path=doc.get("file_path")
+            )
+    
     def save_index(self, save_path: str):
         """
-        인덱스를 파일로 저장
+        인덱스를 파일로 저장 (임시 파일 기록 후 교체하여 원자적으로 저장)
         
         Args:
             save_path: 저장 경로
         """
-        data = {
-            "documents": self.documents,
-            "summaries": self.summaries,
-            "doc_id_map": self.doc_id_map,
-            "saved_at": datetime.now().isoformat()
-        }
+        with self._lock:
+            data = {
+                "documents": self.documents,
+                "summaries": self.summaries,
+                "doc_id_map": self.doc_id_map,
+                "saved_at": datetime.now().isoformat()
+            }
+            
+            save_path = Path(save_path)
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = save_path.with_name(f"{save_path.name}.{os.getpid()}.tmp")
+            
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, save_path)
         
-        save_path = Path(save_path)
-        save_path.parent.mkdir(parents=True, exist_ok=True)
+        logger.info(f"인덱스 저장 완료: {save_path}")
+    
+    def compact_index(self, index_path: str) -> bool:
+        """
+        현재 인덱스를 스냅샷으로 저장하고 증분 저널 비우기
         
-        with open(save_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        다른 워커가 추가한 저널 레코드를 먼저 반영한 뒤 저널을 비웁니다.
+        멀티 워커 환경에서는 writer 잠금을 가진 프로세스만 호출해야 합니다.
         
-        logger.info(f"인덱스 저장 완료: {save_path}")
+        Args:
+            index_path: 스냅샷 경로
+            
+        Returns:
+            bool: 컴팩션 수행 여부 (저널이 비어 있으면 False)
+        """
+        with self._journal_lock(index_path, exclusive=True):
+            self.refresh_index(index_path)
+            
+            with self._lock:
+                if self.journal_size(index_path) == 0:
+                    return False
+                
+                self.save_index(index_path)
+                self.journal_path(index_path).unlink(missing_ok=True)
+                self._snapshot_stamp = self._file_stamp(index_path)
+                self._journal_offset = 0
+        
+        logger.info(f"인덱스 컴팩션 완료: {index_path} ({len(self.documents)}개 문서)")
+        return True
     
-    def load_index(self, load_path: str):
+    def refresh_index(self, index_path: str) -> bool:
         """
-        저장된 인덱스 로드
+        다른 워커의 변경 사항 반영
+        
+        스냅샷이 교체되었으면 다시 로드하고, 그렇지 않으면 새로 추가된 저널 레코드만 재생합니다.
+        
+        Args:
+            index_path: 스냅샷 경로
+            
+        Returns:
+            bool: 인덱스가 갱신되었으면 True
+        """
+        journal_path = self.journal_path(index_path)
+        journal_size = self.journal_size(index_path)
+        
+        if self._file_stamp(index_path) != self._snapshot_stamp or journal_size < self._journal_offset:
+            if not Path(index_path).exists() and not journal_path.exists():
+                return False
+            self.load_index(index_path, keep_pending=False)
+            return True
+        
+        if journal_size == self._journal_offset:
+            return False
+        
+        records, offset = self._read_journal(journal_path, self._journal_offset)
+        with self._lock:
+            self._apply_journal_records(records)
+            self._journal_offset = offset
+        
+        return bool(records)
+    
+    def load_index(self, load_path: str, keep_pending: bool = True):
+        """
+        저장된 인덱스 로드 (스냅샷 + 증분 저널 재생)
+        
+        같은 doc_id는 최신 레코드가 우선합니다.
         
         Args:
             load_path: 로드 경로
+            keep_pending: 로드 전에 메모리에 추가된 문서를 유지할지 여부
         """
         load_path = Path(load_path)
+        journal_path = self.journal_path(load_path)
         
-        if not load_path.exists():
+        if not load_path.exists() and not journal_path.exists():
             logger.error(f"인덱스 파일을 찾을 수 없습니다: {load_path}")
             return
         
-        with open(load_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        self.documents = data["documents"]
-        self.summaries = data["summaries"]
-        self.doc_id_map = data["doc_id_map"]
+        # 파일 파싱은 잠금 밖에서 수행 (요청 처리 블로킹 최소화)
+        snapshot_stamp = self._file_stamp(load_path)
+        data = self._read_snapshot(load_path) if snapshot_stamp else {"documents": [], "summaries": []}
+        journal_records, journal_offset = self._read_journal(journal_path)
+        
+        # 새 저장소를 따로 만든 뒤 한 번에 교체 (진행 중인 검색은 이전 뷰를 계속 사용)
+        documents: List[Dict[str, any]] = []
+        summaries: List[str] = []
+        doc_id_map: Dict[str, int] = {}
+        
+        snapshot_summaries = data.get("summaries", [])
+        for i, doc in enumerate(data.get("documents", [])):
+            self._upsert_into(
+                documents, summaries, doc_id_map,
+                doc["id"],
+                content=doc.get("content", ""),
+                summary=snapshot_summaries[i] if i < len(snapshot_summaries) else "",
+                file_path=doc.get("file_path")
+            )
+        
+        self._apply_journal_records(journal_records, documents, summaries, doc_id_map)
+        
+        with self._lock:
+            if keep_pending:
+                # 로드 전에 추가된 문서 재적용
+                for i, doc in enumerate(self.documents):
+                    self._upsert_into(
+                        documents, summaries, doc_id_map,
+                        doc["id"],
+                        content=doc.get("content"),
+                        summary=self.summaries[i] if i < len(self.summaries) and self.summaries[i] else None,
+                        file_path=doc.get("file_path")
+                    )
+            
+            self.documents, self.summaries, self.doc_id_map = documents, summaries, doc_id_map
+            self._snapshot_stamp = snapshot_stamp
+            self._journal_offset = journal_offset
         
-        logger.info(f"인덱스 로드 완료: {load_path} ({len(self.documents)}개 문서)")
+        logger.info(f"인덱스 로드 완료: {load_path} ({len(self.documents)}개 문서, 저널 {len(journal_records)}건)")
     
     def get_statistics(self) -> Dict[str, any]:
         """
@@ -0,0 +1,114 @@
+"""
+파일 요약 처리 테스트
+요약 캐시 사용과, 실패한 요약이 캐시/인덱스에 남지 않는지 확인합니다.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import api_server
+from src.sglang_client import CHUNK_FAILED_MARKER, GENERATION_FAILED_PREFIX
+from src.state_store import SharedStateStore
+from src.summary_index import MDSummaryIndex
+
+
+class FakeClient:
+    """정해진 응답을 돌려주는 SGLang 클라이언트"""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = []
+
+    def generate_answer(self, content, **kwargs):
+        self.calls.append(content)
+        return self.answer
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """임시 상태 저장소와 인덱스를 사용하는 api_server"""
+    monkeypatch.setattr(api_server, "state_store", SharedStateStore(str(tmp_path / "state.db")))
+    monkeypatch.setattr(api_server, "summarizer", MDSummaryIndex())
+    monkeypatch.setattr(api_server, "INDEX_PATH", tmp_path / "summary_index.json")
+    monkeypatch.setattr(api_server, "UPLOAD_DIR", tmp_path)
+    return api_server
+
+
+def summarize(server, client, title="a.md", content="본문"):
+    return asyncio.run(server.summarize_file(client, {"title": title, "content": content}))
+
+
+def test_summary_is_cached_and_indexed(server):
+    client = FakeClient("요약")
+    assert summarize(server, client) == "요약"
+
+    assert server.state_store.get_cached_summary("본문") == "요약"
+    assert server.summarizer.get_summary("a.md") == "요약"
+    assert server.summarizer.journal_size(server.INDEX_PATH) > 0
+
+
+def test_cache_hit_skips_llm(server):
+    server.state_store.put_cached_summary("본문", "캐시된 요약")
+    client = FakeClient("새 요약")
+
+    assert summarize(server, client, title="b.md") == "캐시된 요약"
+    assert client.calls == []
+    assert server.summarizer.get_summary("b.md") == "캐시된 요약"
+
+
+@pytest.mark.parametrize("answer", [
+    f"{GENERATION_FAILED_PREFIX}: timeout",
+    f"## 파트 1\n\n요약\n\n## 파트 2\n\n{CHUNK_FAILED_MARKER} timeout)",
+    api_server.NO_RESULT_SUMMARY,
+    "",
+])
+def test_failed_summary_is_not_cached(server, answer):
+    client = FakeClient(answer)
+    assert summarize(server, client) is None
+
+    assert server.state_store.get_cached_summary("본문") is None
+    assert server.summarizer.get_summary("a.md") is None
+    assert server.summarizer.journal_size(server.INDEX_PATH) == 0
+
+    # 다음 요청은 캐시 대신 LLM을 다시 호출
+    retry = FakeClient("요약")
+    assert summarize(server, retry) == "요약"
+    assert retry.calls == ["본문"]
+
+
+def test_iter_file_summaries_reports_each_file(server, monkeypatch):
+    """파일별 결과를 모두 반환하고, 한 파일의 오류가 다른 파일 요약을 막지 않음"""
+    monkeypatch.setattr(server, "SUMMARIZE_CONCURRENCY", 1)
+
+    class Client(FakeClient):
+        def generate_answer(self, content, **kwargs):
+            self.calls.append(content)
+            if content == "오류 발생":
+                raise RuntimeError("boom")
+            return f"{content} 요약"
+
+    client = Client(None)
+    files = [
+        {"title": "long.md", "content": "긴 본문입니다"},
+        {"title": "bad.md", "content": "오류 발생"},
+        {"title": "short.md", "content": "짧음"},
+    ]
+
+    async def collect():
+        return [result async for result in server.iter_file_summaries(client, files)]
+
+    results = {item["title"]: (summary, error) for item, summary, error in asyncio.run(collect())}
+    assert results == {
+        "long.md": ("긴 본문입니다 요약", None),
+        "bad.md": (None, "boom"),
+        "short.md": ("짧음 요약", None),
+    }
+    # 동시 실행 수가 1이면 짧은 파일부터 처리
+    assert client.calls == ["짧음", "오류 발생", "긴 본문입니다"]
@@ -0,0 +1,80 @@
+"""
+공유 상태 저장소 테스트
+작업 상태, 요약 캐시, 스레드/인스턴스 간 공유를 확인합니다.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.state_store import SharedStateStore
+
+
+def test_task_lifecycle(tmp_path):
+    """작업 등록 → 갱신 → 조회 (result는 JSON으로 왕복)"""
+    store = SharedStateStore(str(tmp_path / "state.db"))
+    assert store.get_task("missing") is None
+
+    store.create_task("t1", message="대기 중")
+    assert store.get_task("t1") == {
+        "task_id": "t1", "status": "pending", "message": "대기 중",
+        "progress": 0, "result": None, "error": None
+    }
+
+    store.update_task("t1", status="completed", progress=100, result={"files": ["a.md"], "summary": "요약"})
+    task = store.get_task("t1")
+    assert task["status"] == "completed"
+    assert task["progress"] == 100
+    assert task["result"] == {"files": ["a.md"], "summary": "요약"}
+    assert task["message"] == "대기 중"
+
+
+def test_update_task_ignores_unknown_fields(tmp_path):
+    """TASK_FIELDS 외의 항목은 무시"""
+    store = SharedStateStore(str(tmp_path / "state.db"))
+    store.create_task("t1")
+    store.update_task("t1", unknown="x")
+    store.update_task("t1", error="실패", status="failed", unknown="x")
+
+    task = store.get_task("t1")
+    assert task["status"] == "failed"
+    assert task["error"] == "실패"
+
+
+def test_summary_cache_by_content(tmp_path):
+    """요약 캐시는 내용 해시 기준 (파일명과 무관)"""
+    store = SharedStateStore(str(tmp_path / "state.db"))
+    assert store.get_cached_summary("본문") is None
+
+    store.put_cached_summary("본문", "요약 1")
+    assert store.get_cached_summary("본문") == "요약 1"
+    assert store.get_cached_summary("본문 ") is None
+
+    store.put_cached_summary("본문", "요약 2")
+    assert store.get_cached_summary("본문") == "요약 2"
+    assert SharedStateStore.content_hash("본문") == SharedStateStore.content_hash("본문")
+
+
+def test_state_shared_across_threads_and_instances(tmp_path):
+    """다른 스레드(별도 연결)와 다른 인스턴스(다른 워커)에서 같은 상태 조회"""
+    db_path = str(tmp_path / "state.db")
+    store = SharedStateStore(db_path)
+    store.create_task("t1")
+
+    def worker():
+        store.update_task("t1", status="processing", progress=50)
+        store.put_cached_summary("본문", "요약")
+        store.close()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    other = SharedStateStore(db_path)
+    assert other.get_task("t1")["status"] == "processing"
+    assert other.get_task("t1")["progress"] == 50
+    assert other.get_cached_summary("본문") == "요약"
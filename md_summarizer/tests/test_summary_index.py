@@ -0,0 +1,145 @@
+"""
+요약 인덱스 영속화 테스트
+증분 저널 추가/재생, 컴팩션, 재로드 시 원자적 교체를 확인합니다.
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.summary_index import MDSummaryIndex
+
+
+def make_index(index_path, *docs):
+    """문서를 upsert하고 저널에 기록한 인덱스 생성"""
+    index = MDSummaryIndex()
+    for doc_id, summary in docs:
+        record = index.upsert_document(doc_id, content=f"{doc_id} 본문", summary=summary,
+                                       file_path=f"/tmp/{doc_id}")
+        index.append_journal(index_path, record)
+    return index
+
+
+def test_journal_replay_on_load(tmp_path):
+    """스냅샷 없이 저널만 있어도 로드 시 재생되고, 같은 doc_id는 최신 레코드가 우선"""
+    index_path = tmp_path / "summary_index.json"
+    make_index(index_path, ("a.md", "요약 A"), ("b.md", "요약 B"), ("a.md", "요약 A2"))
+
+    assert MDSummaryIndex.journal_path(index_path) == tmp_path / "summary_index.json.journal"
+
+    loaded = MDSummaryIndex()
+    loaded.load_index(index_path)
+    assert loaded.doc_id_map == {"a.md": 0, "b.md": 1}
+    assert loaded.get_summary("a.md") == "요약 A2"
+    assert loaded.get_summary("b.md") == "요약 B"
+
+
+def test_partial_journal_line_is_read_on_next_refresh(tmp_path):
+    """쓰는 중인 마지막 줄은 건너뛰고, 완성된 뒤의 refresh에서 반영"""
+    index_path = tmp_path / "summary_index.json"
+    make_index(index_path, ("a.md", "요약 A"))
+    reader = MDSummaryIndex()
+    reader.load_index(index_path)
+
+    line = '{"document": {"id": "b.md", "content": "b"}, "summary": "요약 B"}\n'
+    journal = MDSummaryIndex.journal_path(index_path)
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write(line[:20])
+    assert reader.refresh_index(index_path) is False
+    assert reader.get_summary("b.md") is None
+
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write(line[20:])
+    assert reader.refresh_index(index_path) is True
+    assert reader.get_summary("b.md") == "요약 B"
+    assert reader.refresh_index(index_path) is False
+
+
+def test_compaction_truncates_journal(tmp_path):
+    """컴팩션 후 저널은 비고, 스냅샷만으로 같은 인덱스가 로드됨"""
+    index_path = tmp_path / "summary_index.json"
+    index = make_index(index_path, ("a.md", "요약 A"), ("b.md", "요약 B"))
+    assert index.journal_size(index_path) > 0
+
+    assert index.compact_index(index_path) is True
+    assert index.journal_size(index_path) == 0
+    assert not MDSummaryIndex.journal_path(index_path).exists()
+    assert index_path.exists()
+    # 저널이 비어 있으면 다시 컴팩션하지 않음
+    assert index.compact_index(index_path) is False
+
+    loaded = MDSummaryIndex()
+    loaded.load_index(index_path)
+    assert loaded.doc_id_map == index.doc_id_map
+    assert loaded.summaries == index.summaries
+    assert [doc["content"] for doc in loaded.documents] == [doc["content"] for doc in index.documents]
+
+
+def test_compaction_includes_other_workers_records(tmp_path):
+    """다른 워커가 추가한 저널 레코드도 컴팩션 스냅샷에 포함"""
+    index_path = tmp_path / "summary_index.json"
+    compactor = make_index(index_path, ("a.md", "요약 A"))
+    make_index(index_path, ("b.md", "요약 B"))
+
+    assert compactor.compact_index(index_path) is True
+
+    loaded = MDSummaryIndex()
+    loaded.load_index(index_path)
+    assert loaded.get_summary("a.md") == "요약 A"
+    assert loaded.get_summary("b.md") == "요약 B"
+
+
+def test_snapshot_replacement_triggers_reload(tmp_path):
+    """다른 워커가 스냅샷을 교체하면 refresh_index가 전체를 다시 로드"""
+    index_path = tmp_path / "summary_index.json"
+    reader = make_index(index_path, ("a.md", "요약 A"))
+    reader.load_index(index_path)
+
+    writer = MDSummaryIndex()
+    writer.load_index(index_path)
+    writer.append_journal(index_path, writer.upsert_document("b.md", content="b", summary="요약 B"))
+    writer.compact_index(index_path)
+
+    assert reader.refresh_index(index_path) is True
+    assert reader.get_summary("b.md") == "요약 B"
+    assert reader.refresh_index(index_path) is False
+
+
+def test_load_index_swaps_views_atomically(tmp_path):
+    """로드는 새 저장소를 만들어 교체하므로, 이전에 잡은 뷰는 변경되지 않음"""
+    index_path = tmp_path / "summary_index.json"
+    make_index(index_path, ("a.md", "요약 A"), ("b.md", "요약 B")).compact_index(index_path)
+
+    index = MDSummaryIndex()
+    index.upsert_document("pending.md", content="p", summary="요약 P")
+    old_documents, old_summaries, old_map = index._view()
+
+    index.load_index(index_path)
+
+    documents, summaries, doc_id_map = index._view()
+    assert documents is not old_documents
+    assert summaries is not old_summaries
+    assert doc_id_map is not old_map
+    assert [doc["id"] for doc in old_documents] == ["pending.md"]
+    assert old_summaries == ["요약 P"]
+    assert old_map == {"pending.md": 0}
+
+    # keep_pending=True: 로드 전에 추가된 문서를 유지
+    assert set(doc_id_map) == {"a.md", "b.md", "pending.md"}
+    assert len(documents) == len(summaries)
+    assert index.get_summary("pending.md") == "요약 P"
+
+
+def test_load_index_without_pending(tmp_path):
+    """keep_pending=False이면 파일 내용만으로 교체"""
+    index_path = tmp_path / "summary_index.json"
+    make_index(index_path, ("a.md", "요약 A")).compact_index(index_path)
+
+    index = MDSummaryIndex()
+    index.upsert_document("pending.md", content="p", summary="요약 P")
+    index.load_index(index_path, keep_pending=False)
+    assert index.doc_id_map == {"a.md": 0}
+    assert index.get_summary("pending.md") is None
@@ -9,11 +9,14 @@ from .mindmap_generator import (
     NodeShape,
     generate_mermaid_html,
     generate_interactive_html,
-    generate_mindmap_for_api
+    generate_mindmap_for_api,
+    get_mindmap_generator,
+    shutdown_mindmap_generator
 )
 
 from .weaviate_service import WeaviateService
 from .segment_processor import SegmentProcessor
+from .llm_backend import LLMBackend, EngineBackend, HTTPPoolBackend, FakeBackend, create_backend
 
 __all__ = [
     'MindMapGenerator',
@@ -21,7 +24,14 @@ __all__ = [
     'NodeShape',
     'WeaviateService',
     'SegmentProcessor',
+    'LLMBackend',
+    'EngineBackend',
+    'HTTPPoolBackend',
+    'FakeBackend',
+    'create_backend',
     'generate_mermaid_html',
     'generate_interactive_html',
-    'generate_mindmap_for_api'
+    'generate_mindmap_for_api',
+    'get_mindmap_generator',
+    'shutdown_mindmap_generator'
 ]
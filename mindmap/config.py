@@ -32,6 +32,28 @@ class Config:
     SGLANG_MEM_FRACTION = float(config_loader.get('SGLANG_MEM_FRACTION', ''))
     SGLANG_MAX_TOKENS = 8192
     TOKEN_BUFFER = 500
+    # Micro-batching: concurrent completions arriving within this window share one generate call
+    LLM_BATCH_WINDOW_MS = float(config_loader.get('LLM_BATCH_WINDOW_MS', '5'))
+    LLM_MAX_BATCH_SIZE = int(config_loader.get('LLM_MAX_BATCH_SIZE', '32'))
+    # Upper bound on completions in flight at once (shared by all concurrent mindmap requests)
+    LLM_MAX_CONCURRENCY = int(config_loader.get('LLM_MAX_CONCURRENCY', '64'))
+    # Redundancy checks: only pairs of node texts this similar (hashed n-gram cosine) go to the LLM
+    REDUNDANCY_CANDIDATE_THRESHOLD = float(config_loader.get('REDUNDANCY_CANDIDATE_THRESHOLD', '0.3'))
+    REDUNDANCY_MAX_NEIGHBORS = int(config_loader.get('REDUNDANCY_MAX_NEIGHBORS', '8'))
+    # Candidate pairs judged per LLM request by check_similarity_llm_batch
+    REDUNDANCY_JUDGE_BATCH_SIZE = int(config_loader.get('REDUNDANCY_JUDGE_BATCH_SIZE', '8'))
+    # Reality check: nodes covering this share of a chunk's terms are accepted without an LLM call;
+    # the rest are checked against their top-k BM25 chunks, several nodes per prompt
+    VERIFY_LEXICAL_MATCH_THRESHOLD = float(config_loader.get('VERIFY_LEXICAL_MATCH_THRESHOLD', '0.9'))
+    VERIFY_TOP_K_CHUNKS = int(config_loader.get('VERIFY_TOP_K_CHUNKS', '3'))
+    VERIFY_NODES_PER_PROMPT = int(config_loader.get('VERIFY_NODES_PER_PROMPT', '8'))
+    # Words one detail-extraction call is expected to add before any has returned (2-4 details x 10-15 words)
+    EXPANSION_DETAIL_WORDS_ESTIMATE = float(config_loader.get('EXPANSION_DETAIL_WORDS_ESTIMATE', '30'))
+
+    # LLM backend: 'engine' (in-process sgl.Engine), 'http' (existing SGLang servers) or 'fake' (tests)
+    MINDMAP_LLM_BACKEND = config_loader.get('MINDMAP_LLM_BACKEND', 'engine')
+    SGLANG_ENDPOINTS = [url.strip() for url in config_loader.get('SGLANG_ENDPOINTS', '').split(',') if url.strip()]
+    SGLANG_HTTP_TIMEOUT = float(config_loader.get('SGLANG_HTTP_TIMEOUT', '300'))
 
     # Weaviate Configuration
     WEAVIATE_URL = config_loader('WEAVIATE_URL', default='')
@@ -0,0 +1,187 @@
+"""
+Fuzzy de-duplication index for mindmap node names.
+
+Implements the matching rule of ``MindMapGenerator.is_similar_to_existing`` (per content
+type thresholds adjusted by length, four fuzzy ratios combined with type-specific
+weights) over an index that normalizes every string once. With RapidFuzz installed, a
+query is scored against all indexed names by ``process.cdist`` (one call per ratio, all
+cores for large matrices) and the thresholds are applied with numpy; otherwise it falls back to
+pairwise ``fuzzywuzzy`` scoring with the same rule.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence
+import logging
+
+try:
+    import numpy as np
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    from fuzzywuzzy import fuzz
+
+logger = logging.getLogger("mindmap_generator")
+
+BASE_THRESHOLDS = {
+    'topic': 75,
+    'subtopic': 70,
+    'detail': 65
+}
+
+# Weights for (ratio, partial_ratio, token_sort_ratio, token_set_ratio); 0 = not used
+RATIO_WEIGHTS = {
+    'topic': (1.0, 0.0, 1.1, 1.0),
+    'subtopic': (1.0, 1.0, 0.95, 0.9),
+    'detail': (0.95, 0.9, 0.85, 0.8)
+}
+
+# Names scored per round in dedup() (each round: block x kept names, block x block)
+DEDUP_BLOCK_SIZE = 64
+# cdist spreads work over all cores only when a matrix is large enough to pay for the threads
+PARALLEL_MIN_CELLS = 20000
+
+_whitespace_regex = re.compile(r'\s+')
+_non_word_regex = re.compile(r'[^\w\s]')
+
+
+@lru_cache(maxsize=65536)
+def normalize(text: str) -> str:
+    """Lowercase, collapse whitespace and strip punctuation (cached)."""
+    text = _whitespace_regex.sub(' ', str(text).lower().strip())
+    return _non_word_regex.sub('', text)
+
+
+def similarity_threshold(raw_text: str, content_type: str) -> float:
+    """Threshold for ``raw_text`` (length adjustments use the un-normalized text)."""
+    threshold = BASE_THRESHOLDS[content_type]
+    if len(raw_text) < 10:
+        threshold = min(threshold + 10, 95)  # Stricter for very short texts
+    elif len(raw_text) > 100:
+        threshold = max(threshold - 15, 55)  # More lenient for long texts
+    if content_type == 'subtopic':
+        threshold = max(threshold - 10, 60)
+    elif content_type == 'detail':
+        threshold = max(threshold - 10, 55)
+    return threshold
+
+
+def _score_pair(query: str, choice: str, content_type: str) -> float:
+    """Combined ratio for one pair (fuzzywuzzy fallback)."""
+    scores = (
+        fuzz.ratio(query, choice),
+        fuzz.partial_ratio(query, choice),
+        fuzz.token_sort_ratio(query, choice),
+        fuzz.token_set_ratio(query, choice)
+    )
+    final_ratio = max(score * weight for score, weight in zip(scores, RATIO_WEIGHTS[content_type]) if weight)
+    if len(query) < 30:
+        final_ratio *= 1.1  # Boost ratio for short texts
+    return final_ratio
+
+
+def similarity_matrix(raw_queries: Sequence[str], queries: Sequence[str], choices: Sequence[str],
+                      content_type: str):
+    """
+    Boolean matrix ``[i][j]``: query ``i`` counts as a duplicate of choice ``j``.
+
+    Args:
+        raw_queries: Queries as given (for the length-based threshold).
+        queries: Normalized queries.
+        choices: Normalized indexed names.
+        content_type: 'topic', 'subtopic' or 'detail'.
+    """
+    thresholds = [similarity_threshold(raw, content_type) for raw in raw_queries]
+    if not RAPIDFUZZ_AVAILABLE:
+        return [
+            [abs(len(query) - len(choice)) <= len(query) * 0.7
+             and _score_pair(query, choice, content_type) > threshold
+             for choice in choices]
+            for query, threshold in zip(queries, thresholds)
+        ]
+
+    query_lengths = np.array([len(query) for query in queries], dtype=np.float32)[:, None]
+    choice_lengths = np.array([len(choice) for choice in choices], dtype=np.float32)[None, :]
+    final_ratio = np.zeros((len(queries), len(choices)), dtype=np.float32)
+    workers = -1 if len(queries) * len(choices) >= PARALLEL_MIN_CELLS else 1
+    scorers = (rf_fuzz.ratio, rf_fuzz.partial_ratio, rf_fuzz.token_sort_ratio, rf_fuzz.token_set_ratio)
+    for scorer, weight in zip(scorers, RATIO_WEIGHTS[content_type]):
+        if weight:
+            scores = rf_process.cdist(queries, choices, scorer=scorer, dtype=np.float32, workers=workers)
+            np.maximum(final_ratio, np.rint(scores) * weight, out=final_ratio)
+    final_ratio = np.where(query_lengths < 30, final_ratio * 1.1, final_ratio)
+    comparable = np.abs(query_lengths - choice_lengths) <= query_lengths * 0.7
+    return comparable & (final_ratio > np.array(thresholds, dtype=np.float32)[:, None])
+
+
+class FuzzyDedupIndex:
+    """Growing set of names that answers "is this a near-duplicate of something indexed?"."""
+
+    def __init__(self, content_type: str = 'topic', names: Iterable[str] = ()):
+        if content_type not in BASE_THRESHOLDS:
+            raise ValueError(f"Unknown content type: {content_type}")
+        self.content_type = content_type
+        self.names: List[str] = []
+        self._normalized: List[str] = []
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def add(self, name: str) -> None:
+        self.names.append(name)
+        self._normalized.append(normalize(name))
+
+    def find_similar(self, name: str) -> Optional[str]:
+        """First indexed name (insertion order) that ``name`` duplicates, or None."""
+        if not self.names:
+            return None
+        row = similarity_matrix([name], [normalize(name)], self._normalized, self.content_type)[0]
+        for index, similar in enumerate(row):
+            if similar:
+                return self.names[index]
+        return None
+
+    def is_similar(self, name: str) -> bool:
+        return self.find_similar(name) is not None
+
+    def add_if_new(self, name: str) -> bool:
+        """Index ``name`` unless it duplicates an indexed name; returns True if added."""
+        if self.is_similar(name):
+            return False
+        self.add(name)
+        return True
+
+    def dedup(self, names: Sequence[str]) -> List[int]:
+        """
+        Greedy in-order de-duplication of ``names`` against the index and each other.
+
+        A name is kept when it matches no indexed name and no earlier kept name; kept
+        names are added to the index. Names are scored in blocks: one matrix against the
+        names kept so far and one within the block, instead of one call per name.
+
+        Returns:
+            Indices (into ``names``) of the kept names, in order.
+        """
+        kept: List[int] = []
+        for block_start in range(0, len(names), DEDUP_BLOCK_SIZE):
+            block = names[block_start:block_start + DEDUP_BLOCK_SIZE]
+            normalized = [normalize(name) for name in block]
+            offset = len(self.names)
+            matrix = similarity_matrix(block, normalized, self._normalized + normalized, self.content_type)
+            block_kept: List[int] = []
+            for i in range(len(block)):
+                row = matrix[i]
+                if any(row[:offset]) or any(row[offset + j] for j in block_kept):
+                    continue
+                block_kept.append(i)
+            for i in block_kept:
+                self.names.append(block[i])
+                self._normalized.append(normalized[i])
+            kept.extend(block_start + i for i in block_kept)
+        return kept
@@ -0,0 +1,77 @@
+"""
+Lexical chunk index for the mindmap reality check.
+
+Document chunks are indexed once with BM25 over words plus in-word character bigrams
+(so Korean particles and inflections still match the stem). For each mindmap node the
+index returns the best-scoring chunks and how much of the node's vocabulary a chunk
+covers; nodes that are (almost) literally present can be accepted without an LLM call,
+and the rest only need to be checked against their top chunks.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Sequence, Set, Tuple
+import logging
+
+logger = logging.getLogger("mindmap_generator")
+
+_whitespace_regex = re.compile(r'\s+')
+_non_word_regex = re.compile(r'[^\w\s]')
+
+
+def terms(text: str) -> List[str]:
+    """Lowercased words followed by the character bigrams of each word."""
+    words = _non_word_regex.sub(' ', _whitespace_regex.sub(' ', str(text).lower())).split()
+    bigrams = [word[i:i + 2] for word in words for i in range(len(word) - 1)]
+    return words + bigrams
+
+
+class BM25ChunkIndex:
+    """Okapi BM25 over a fixed list of document chunks."""
+
+    def __init__(self, chunks: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._term_counts: List[Counter] = [Counter(terms(chunk)) for chunk in chunks]
+        self._term_sets: List[Set[str]] = [set(counts) for counts in self._term_counts]
+        self._lengths = [sum(counts.values()) for counts in self._term_counts]
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+        document_frequency: Counter = Counter()
+        for term_set in self._term_sets:
+            document_frequency.update(term_set)
+        total = len(self._term_counts)
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in document_frequency.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._term_counts)
+
+    def scores(self, text: str) -> List[float]:
+        """BM25 score of ``text`` against every chunk."""
+        query = Counter(terms(text))
+        results = []
+        for counts, length in zip(self._term_counts, self._lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self._average_length) if self._average_length else self.k1
+            score = 0.0
+            for term, query_count in query.items():
+                frequency = counts.get(term)
+                if frequency:
+                    score += query_count * self._idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            results.append(score)
+        return results
+
+    def top_chunks(self, text: str, k: int) -> List[Tuple[int, float]]:
+        """Up to ``k`` ``(chunk index, score)`` pairs, best first; chunks scoring 0 come last in document order."""
+        ranked = sorted(enumerate(self.scores(text)), key=lambda item: (-item[1], item[0]))
+        return ranked[:max(1, k)]
+
+    def coverage(self, text: str, chunk_index: int) -> float:
+        """Fraction of the distinct terms of ``text`` that occur in the chunk (0.0 to 1.0)."""
+        query = set(terms(text))
+        if not query:
+            return 0.0
+        return len(query & self._term_sets[chunk_index]) / len(query)
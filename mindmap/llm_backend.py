@@ -0,0 +1,247 @@
+"""
+Pluggable LLM backends for the mindmap generator.
+
+- ``EngineBackend``: loads a dedicated ``sgl.Engine`` in this process (previous behaviour).
+- ``HTTPPoolBackend``: sends batches to already-running SGLang servers (the same fleet
+  md_summarizer uses) over a pooled HTTP client, balancing load across endpoints.
+- ``FakeBackend``: deterministic local responses for tests; no model or network.
+
+Every backend exposes ``generate`` / ``async_generate`` taking a list of prompts and a
+matching list of sampling params and returning ``[{"text": ...}, ...]``, which is what
+``CompletionBatcher`` dispatches.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+# 조건부 import
+if __name__ == "__main__":
+    from skill.mindmap.config import Config
+else:
+    try:
+        from .config import Config
+    except ImportError:
+        from skill.mindmap.config import Config
+
+logger = logging.getLogger("mindmap_generator")
+
+
+class LLMBackend(ABC):
+    """Base class for mindmap completion backends; subclasses must implement ``async_generate``."""
+
+    name = "base"
+
+    @abstractmethod
+    async def async_generate(self, prompts: List[str], sampling_params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Complete ``prompts`` (one sampling-params dict each), returning ``[{"text": ...}, ...]``."""
+
+    def generate(self, prompts: List[str], sampling_params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Blocking variant (only for callers without a running event loop)."""
+        return asyncio.run(self.async_generate(prompts, sampling_params))
+
+    def shutdown(self) -> None:
+        pass
+
+
+class EngineBackend(LLMBackend):
+    """In-process SGLang engine pinned to ``Config.SGLANG_DEVICE``."""
+
+    name = "engine"
+
+    def __init__(self, model_path: Optional[str] = None, device: Optional[str] = None,
+                 mem_fraction: Optional[float] = None):
+        import sglang as sgl
+
+        model_path = model_path or Config.SGLANG_MODEL_PATH
+        device = device or Config.SGLANG_DEVICE
+        mem_fraction = mem_fraction if mem_fraction is not None else Config.SGLANG_MEM_FRACTION
+        logger.info(f"Initializing SGLang with model: {model_path}")
+        logger.info(f"Device: {device}")
+        logger.info(f"Memory fraction: {mem_fraction}")
+
+        # SGLang Engine은 환경변수 CUDA_VISIBLE_DEVICES로 GPU 선택
+        os.environ['CUDA_VISIBLE_DEVICES'] = device.replace('cuda:', '')
+
+        self.engine = sgl.Engine(model_path=model_path, mem_fraction_static=mem_fraction)
+        logger.info("SGLang engine initialized successfully")
+
+    async def async_generate(self, prompts: List[str], sampling_params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self.engine.async_generate(prompts, sampling_params)
+
+    def generate(self, prompts: List[str], sampling_params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.engine.generate(prompts, sampling_params)
+
+    def shutdown(self) -> None:
+        self.engine.shutdown()
+
+
+class _Endpoint:
+    """Load and health bookkeeping for one SGLang server."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip('/')
+        self.in_flight = 0
+        self.failures = 0
+        self.down_until = 0.0
+
+    def available(self, now: float) -> bool:
+        return self.down_until <= now
+
+
+class HTTPPoolBackend(LLMBackend):
+    """
+    Pooled HTTP client for existing SGLang servers.
+
+    A batch is split into contiguous shards, one per available endpoint (least loaded
+    first), and the shards are posted to ``/generate`` concurrently. An endpoint that
+    fails is put on cooldown and its shard is retried on another endpoint.
+    """
+
+    name = "http"
+
+    def __init__(self, endpoints: List[str], timeout: float = 300.0, max_connections: int = 32,
+                 cooldown: float = 10.0):
+        """
+        Args:
+            endpoints: SGLang server base URLs (e.g. ``http://gpu-0:30000``).
+            timeout: Per-request timeout in seconds.
+            max_connections: Connection pool size shared by all endpoints.
+            cooldown: Seconds an endpoint is skipped after a failed request.
+        """
+        if not endpoints:
+            raise ValueError("HTTPPoolBackend requires at least one SGLang endpoint")
+        self.endpoints = [_Endpoint(url) for url in endpoints]
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.cooldown = cooldown
+        # httpx.AsyncClient is bound to the loop it was created on; keep one per loop
+        self._clients = weakref.WeakKeyDictionary()
+
+    def _client(self):
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            client = httpx.AsyncClient(timeout=self.timeout, limits=limits)
+            self._clients[loop] = client
+        return client
+
+    def _ranked_endpoints(self) -> List[_Endpoint]:
+        now = time.monotonic()
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.available(now)]
+        # Every endpoint cooling down: try them anyway, soonest-recovering first
+        candidates = healthy or sorted(self.endpoints, key=lambda endpoint: endpoint.down_until)
+        return sorted(candidates, key=lambda endpoint: endpoint.in_flight)
+
+    async def _post(self, endpoint: _Endpoint, prompts: List[str],
+                    sampling_params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        endpoint.in_flight += len(prompts)
+        try:
+            response = await self._client().post(
+                f"{endpoint.url}/generate",
+                json={"text": prompts, "sampling_params": sampling_params}
+            )
+            response.raise_for_status()
+            outputs = response.json()
+        finally:
+            endpoint.in_flight -= len(prompts)
+        endpoint.failures = 0
+        return outputs if isinstance(outputs, list) else [outputs]
+
+    async def _generate_shard(self, prompts: List[str], sampling_params: List[Dict[str, Any]],
+                              preferred: _Endpoint) -> List[Dict[str, Any]]:
+        tried = []
+        candidates = [preferred] + [e for e in self._ranked_endpoints() if e is not preferred]
+        last_error = None
+        for endpoint in candidates:
+            tried.append(endpoint.url)
+            try:
+                return await self._post(endpoint, prompts, sampling_params)
+            except Exception as e:
+                last_error = e
+                endpoint.failures += 1
+                endpoint.down_until = time.monotonic() + self.cooldown
+                logger.warning(f"SGLang endpoint {endpoint.url} failed ({e}); trying next endpoint")
+        raise RuntimeError(f"All SGLang endpoints failed ({', '.join(tried)}): {last_error}")
+
+    async def async_generate(self, prompts: List[str], sampling_params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        endpoints = self._ranked_endpoints()
+        shard_count = min(len(endpoints), len(prompts))
+        if shard_count <= 1:
+            return await self._generate_shard(prompts, sampling_params, endpoints[0])
+
+        bounds = [round(i * len(prompts) / shard_count) for i in range(shard_count + 1)]
+        shards = await asyncio.gather(*(
+            self._generate_shard(prompts[start:end], sampling_params[start:end], endpoint)
+            for start, end, endpoint in zip(bounds, bounds[1:], endpoints)
+        ))
+        return [output for shard in shards for output in shard]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {'url': e.url, 'in_flight': e.in_flight, 'failures': e.failures, 'available': e.available(now)}
+            for e in self.endpoints
+        ]
+
+    def shutdown(self) -> None:
+        for loop, client in list(self._clients.items()):
+            if not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(client.aclose())
+        self._clients = weakref.WeakKeyDictionary()
+
+
+class FakeBackend(LLMBackend):
+    """
+    Deterministic backend for tests.
+
+    ``responder(prompt, sampling_params)`` produces each text; by default an empty JSON
+    array is returned, which every mindmap parser accepts as "nothing found".
+    """
+
+    name = "fake"
+
+    def __init__(self, responder: Optional[Callable[[str, Dict[str, Any]], str]] = None, latency: float = 0.0):
+        self.responder = responder or (lambda prompt, params: "[]")
+        self.latency = latency
+        self.calls: List[List[str]] = []
+
+    async def async_generate(self, prompts: List[str], sampling_params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.calls.append(list(prompts))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [{"text": self.responder(prompt, params)} for prompt, params in zip(prompts, sampling_params)]
+
+    def generate(self, prompts: List[str], sampling_params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.calls.append(list(prompts))
+        return [{"text": self.responder(prompt, params)} for prompt, params in zip(prompts, sampling_params)]
+
+
+def create_backend(kind: Optional[str] = None, **kwargs) -> LLMBackend:
+    """
+    Build the backend selected by ``kind`` or ``Config.MINDMAP_LLM_BACKEND``.
+
+    Args:
+        kind: ``"engine"``, ``"http"`` or ``"fake"``.
+        **kwargs: Passed to the backend constructor (``endpoints`` defaults to
+            ``Config.SGLANG_ENDPOINTS`` for the HTTP backend).
+    """
+    kind = (kind or Config.MINDMAP_LLM_BACKEND).lower()
+    if kind == "engine":
+        return EngineBackend(**kwargs)
+    if kind == "http":
+        kwargs.setdefault("endpoints", Config.SGLANG_ENDPOINTS)
+        kwargs.setdefault("timeout", Config.SGLANG_HTTP_TIMEOUT)
+        logger.info(f"Using SGLang HTTP pool: {kwargs['endpoints']}")
+        return HTTPPoolBackend(**kwargs)
+    if kind == "fake":
+        return FakeBackend(**kwargs)
+    raise ValueError(f"Unknown mindmap LLM backend: {kind} (expected engine, http or fake)")
@@ -0,0 +1,101 @@
+"""
+Micro-batching completion service for the mindmap generator.
+
+Concurrent ``generate_completion`` calls are collected for a short window and
+sent to the engine as a single batched ``generate`` so SGLang can schedule them
+together on the GPU. Every caller still awaits and receives its own result.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger("mindmap_generator")
+
+
+class CompletionBatcher:
+    """Collects concurrent completion requests and dispatches them as one batch."""
+
+    def __init__(self, engine: Any, window_ms: float = 5.0, max_batch_size: int = 32):
+        """
+        Args:
+            engine: Object exposing ``generate(prompts, sampling_params)`` and, optionally,
+                ``async_generate(prompts, sampling_params)`` (e.g. ``sgl.Engine``).
+            window_ms: How long to wait for more requests after the first one arrives.
+            max_batch_size: Flush immediately once this many requests are waiting.
+        """
+        self.engine = engine
+        self.window = max(window_ms, 0.0) / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {'requests': 0, 'batches': 0, 'largest_batch': 0}
+
+    async def generate(self, prompt: str, sampling_params: Dict[str, Any]) -> str:
+        """Queue one prompt and wait for its text once the batch it joined completes."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures are bound to their loop; requests from a previous loop cannot be joined.
+            self._pending = []
+            self._flush_handle = None
+            self._loop = loop
+
+        future = loop.create_future()
+        self._pending.append((prompt, sampling_params, future))
+        self.stats['requests'] += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        # Drop requests whose callers were cancelled while waiting
+        pending = [item for item in self._pending if not item[2].done()]
+        batch, self._pending = pending[:self.max_batch_size], pending[self.max_batch_size:]
+        if self._pending:
+            self._flush_handle = self._loop.call_soon(self._flush)
+        if batch:
+            self._loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        prompts = [prompt for prompt, _, _ in batch]
+        params = [sampling_params for _, sampling_params, _ in batch]
+        self.stats['batches'] += 1
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+        if len(batch) > 1:
+            logger.info(f"Dispatching batched generation: {len(batch)} prompts")
+
+        try:
+            outputs = await self._dispatch(prompts, params)
+            if len(outputs) != len(batch):
+                raise RuntimeError(f"Engine returned {len(outputs)} outputs for {len(batch)} prompts")
+        except Exception as e:
+            if len(batch) > 1:
+                # Isolate the failing prompt so the rest of the batch still gets results
+                logger.warning(f"Batched generation failed ({e}); retrying {len(batch)} prompts individually")
+                await asyncio.gather(*(self._run_batch([item]) for item in batch))
+                return
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), output in zip(batch, outputs):
+            if not future.done():
+                future.set_result(output["text"])
+
+    async def _dispatch(self, prompts: List[str], params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run one batched generation without blocking the event loop."""
+        if hasattr(self.engine, 'async_generate'):
+            outputs = await self.engine.async_generate(prompts, params)
+        else:
+            loop = asyncio.get_running_loop()
+            outputs = await loop.run_in_executor(None, self.engine.generate, prompts, params)
+        return outputs if isinstance(outputs, list) else [outputs]
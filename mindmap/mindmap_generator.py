@@ -1,6 +1,7 @@
 import re
 import os
 import random
+import math
 import json
 import asyncio
 import hashlib
@@ -8,13 +9,18 @@ import base64
 import zlib
 import logging
 import copy
+import contextlib
+import contextvars
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum, auto
 from typing import Dict, Any, List, Union, Optional, Tuple, Set
 from termcolor import colored
 import aiofiles
 from fuzzywuzzy import fuzz
-import sglang as sgl
 import nest_asyncio
 import sys
 from pathlib import Path
@@ -25,17 +31,32 @@ if __name__ == "__main__":
     from skill.mindmap.config import Config
     from skill.mindmap.weaviate_service import WeaviateService
     from skill.mindmap.segment_processor import SegmentProcessor, DocumentSegment
+    from skill.mindmap.llm_batcher import CompletionBatcher
+    from skill.mindmap.llm_backend import LLMBackend, create_backend
+    from skill.mindmap.fuzzy_dedup import FuzzyDedupIndex, normalize, similarity_matrix
+    from skill.mindmap.near_duplicates import candidate_pairs
+    from skill.mindmap.lexical_index import BM25ChunkIndex
 else:
     # 모듈로 import될 때: 상대 import
     try:
         from .config import Config
         from .weaviate_service import WeaviateService
         from .segment_processor import SegmentProcessor, DocumentSegment
+        from .llm_batcher import CompletionBatcher
+        from .llm_backend import LLMBackend, create_backend
+        from .fuzzy_dedup import FuzzyDedupIndex, normalize, similarity_matrix
+        from .near_duplicates import candidate_pairs
+        from .lexical_index import BM25ChunkIndex
     except ImportError:
         # 상대 import 실패 시 절대 import로 폴백
         from skill.mindmap.config import Config
         from skill.mindmap.weaviate_service import WeaviateService
         from skill.mindmap.segment_processor import SegmentProcessor, DocumentSegment
+        from skill.mindmap.llm_batcher import CompletionBatcher
+        from skill.mindmap.llm_backend import LLMBackend, create_backend
+        from skill.mindmap.fuzzy_dedup import FuzzyDedupIndex, normalize, similarity_matrix
+        from skill.mindmap.near_duplicates import candidate_pairs
+        from skill.mindmap.lexical_index import BM25ChunkIndex
 
 def get_logger():
     """Mindmap-specific logger with colored output for generation stages."""
@@ -128,23 +149,30 @@ else:
 
 
 class DocumentOptimizer:
-    """Optimizer using SGLang local model."""
-    def __init__(self):
+    """Optimizer using an SGLang backend (in-process engine, HTTP server pool or fake)."""
+    def __init__(self, backend: Optional[LLMBackend] = None):
         config = Config()
-        logger.info(f"Initializing SGLang with model: {config.SGLANG_MODEL_PATH}")
-        logger.info(f"Device: {config.SGLANG_DEVICE}")
-        logger.info(f"Memory fraction: {config.SGLANG_MEM_FRACTION}")
-        
-        # SGLang Engine은 환경변수 CUDA_VISIBLE_DEVICES로 GPU 선택
-        import os
-        device_id = config.SGLANG_DEVICE.replace('cuda:', '')
-        os.environ['CUDA_VISIBLE_DEVICES'] = device_id
-        
-        self.llm = sgl.Engine(
-            model_path=config.SGLANG_MODEL_PATH,
-            mem_fraction_static=config.SGLANG_MEM_FRACTION
+        # Backend is chosen by MINDMAP_LLM_BACKEND unless one is injected (e.g. FakeBackend in tests)
+        self.llm = backend or create_backend()
+        logger.info(f"Mindmap LLM backend: {self.llm.name}")
+
+        # Concurrent generate_completion calls are merged into batched generate requests
+        self.batcher = CompletionBatcher(
+            self.llm,
+            window_ms=config.LLM_BATCH_WINDOW_MS,
+            max_batch_size=config.LLM_MAX_BATCH_SIZE
         )
-        logger.info("SGLang engine initialized successfully")
+        # Global in-flight budget; asyncio.Semaphore is bound to its loop, so keep one per loop
+        self.max_concurrency = max(1, config.LLM_MAX_CONCURRENCY)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
 
     async def generate_completion(self, prompt: str, max_tokens: int = 5000, request_id: str = None, task: Optional[str] = None) -> Optional[str]:
         try:
@@ -155,11 +183,10 @@ class DocumentOptimizer:
                 f"Prompt preview: {colored(prompt_preview + '...', 'white')}"
             )
 
-            # nest_asyncio 덕분에 동기 함수를 직접 호출 가능
+            # Joins the current micro-batch instead of blocking the event loop on a single generate
             sampling_params = {"temperature": 0.4, "max_new_tokens": max_tokens}
-            outputs = self.llm.generate([prompt], sampling_params)
-            
-            response_text = outputs[0]["text"]
+            async with self._semaphore():
+                response_text = await self.batcher.generate(prompt, sampling_params)
             response_preview = " ".join(response_text.split()[:30])
             logger.info(
                 f"\n{colored('✅ Generated', 'green', attrs=['bold'])}\n"
@@ -252,6 +279,52 @@ class MindMapGenerationError(Exception):
     """Custom exception for mindmap generation errors."""
     pass
 
+class MindMapRequestState:
+    """Per-request generation state.
+
+    A single ``MindMapGenerator`` (engine, Weaviate connection, emoji cache) serves many
+    requests concurrently, so anything that belongs to one document lives here instead of
+    on the generator. The active state is held in a context variable; tasks spawned while
+    generating a mindmap inherit it.
+    """
+    def __init__(self):
+        self.content_cache: Dict[str, Any] = {}
+        self.unique_concepts: Dict[str, Set[str]] = {'topics': set(), 'subtopics': set(), 'details': set()}
+        self.llm_calls: Dict[str, int] = {
+            'topics': 0,
+            'subtopics': 0,
+            'details': 0,
+            'total_topics': 0,
+            'processed_topics': 0,
+            'total_subtopics': 0,
+            'processed_subtopics': 0,
+            'total_details': 0
+        }
+        self.subtopics_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self.details_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self.processed_chunks_by_topic: Dict[str, Set[str]] = {}
+        self.processed_chunks_by_subtopic: Dict[str, Set[str]] = {}
+        self.last_concepts: Optional[Dict[str, Any]] = None
+        # Content items collected by final_pass_filter_for_duplicative_content
+        self.all_content: List['ContentItem'] = []
+        self.content_by_path: Dict[Tuple[str, ...], 'ContentItem'] = {}
+
+_request_state: contextvars.ContextVar = contextvars.ContextVar('mindmap_request_state', default=None)
+
+@contextlib.contextmanager
+def _request_scope():
+    """Run the block in a fresh ``MindMapRequestState`` unless a request is already in scope."""
+    state = _request_state.get()
+    if state is not None:
+        yield state
+        return
+    state = MindMapRequestState()
+    token = _request_state.set(state)
+    try:
+        yield state
+    finally:
+        _request_state.reset(token)
+
 class ContentItem:
     """Class to track content items with their context information."""
     def __init__(self, text: str, path: List[str], node_type: str, importance: str = None):
@@ -265,8 +338,8 @@ class ContentItem:
         return f"{self.text} ({self.node_type} at {self.path_str})"
 
 class MindMapGenerator:
-    def __init__(self):
-        self.optimizer = DocumentOptimizer()
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        self.optimizer = DocumentOptimizer(backend)
         self.weaviate_service = WeaviateService()
         self.config = {
             'max_summary_length': 1800,
@@ -298,6 +371,9 @@ class MindMapGenerator:
             'details': {'total': 0, 'verified': 0}
         }
         self._emoji_cache = {}
+        # Topic names by cluster content hash, shared across requests (bounded LRU)
+        self._topic_name_cache = OrderedDict()
+        self._topic_name_cache_size = 1024
         self.retry_config = {
             'max_retries': 3,
             'base_delay': 1,
@@ -326,6 +402,21 @@ class MindMapGenerator:
         }
         self._emoji_file = os.path.join(os.path.dirname(__file__), "emoji_cache.json")
         self._load_emoji_cache()
+
+    @property
+    def _state(self) -> MindMapRequestState:
+        """State of the request being generated in the current task."""
+        state = _request_state.get()
+        if state is None:
+            # Setting one here would stick to the caller's context and leak into later calls
+            raise RuntimeError("No mindmap request in scope; call through generate_mindmap_with_concepts "
+                               "or a public method that opens a request scope")
+        return state
+
+    def close(self):
+        """Releases the LLM backend and the Weaviate connection."""
+        self.optimizer.llm.shutdown()
+        self.weaviate_service.close()
         
     def _load_emoji_cache(self):
         """Load emoji cache from disk if available."""
@@ -346,7 +437,8 @@ class MindMapGenerator:
         """Save emoji cache to disk for reuse across runs."""
         try:
             # Convert tuple keys to strings for JSON serialization
-            serializable_cache = {str(k): v for k, v in self._emoji_cache.items()}
+            # Snapshot first: other requests may add emojis while this runs in an executor
+            serializable_cache = {str(k): v for k, v in list(self._emoji_cache.items())}
             with open(self._emoji_file, 'w', encoding='utf-8') as f:
                 json.dump(serializable_cache, f)
             logger.info(f"Saved {len(self._emoji_cache)} emoji mappings to cache")
@@ -1632,69 +1724,55 @@ class MindMapGenerator:
         start_count = len(items)
         logger.info(f"Starting early redundancy check for {len(items)} {content_type}s...")
         
-        # Track items to keep (non-redundant)
-        unique_items = []
-        seen_names = {}
-        
-        # First, use simple fuzzy matching to catch obvious duplicates
-        for item in items:
-            item_name = item['name']
-            if not await self.is_similar_to_existing(item_name, seen_names, content_type):
-                unique_items.append(item)
-                seen_names[item_name] = item
+        # First, use simple fuzzy matching to catch obvious duplicates (one scoring matrix)
+        kept_indices = FuzzyDedupIndex(content_type).dedup([item['name'] for item in items])
+        unique_items = [items[i] for i in kept_indices]
         
         # If we still have lots of items, use more aggressive LLM-based similarity
         if len(unique_items) > 3 and len(unique_items) > len(items) * 0.8:  # Only if enough items and not much reduction yet
             try:
-                # Create pairs for comparison
+                # Create pairs for comparison (near neighbours only)
+                candidates = candidate_pairs(
+                    [item['name'] for item in unique_items],
+                    threshold=Config.REDUNDANCY_CANDIDATE_THRESHOLD,
+                    max_neighbors=Config.REDUNDANCY_MAX_NEIGHBORS
+                )
                 pairs_to_check = []
                 for i in range(len(unique_items)-1):
                     for j in range(i+1, len(unique_items)):
-                        pairs_to_check.append((i, j))
+                        if candidates is None or (i, j) in candidates:
+                            pairs_to_check.append((i, j))
                 
-                # Process in batches with semaphore for rate limiting
                 redundant_indices = set()
-                semaphore = asyncio.Semaphore(3)  # Limit concurrent LLM calls
+                context = f"{content_type} of {context_prefix}" if context_prefix else content_type
                 
-                async def check_pair(i, j):
-                    if i in redundant_indices or j in redundant_indices:
-                        return None
-                        
-                    async with semaphore:
-                        try:
-                            context1 = context2 = content_type
-                            if context_prefix:
-                                context1 = context2 = f"{content_type} of {context_prefix}"
-                                
-                            is_redundant = await self.check_similarity_llm(
-                                unique_items[i]['name'],
-                                unique_items[j]['name'],
-                                context1,
-                                context2
-                            )
-                            
-                            if is_redundant:
-                                # Keep item with more detailed information
-                                i_detail = len(unique_items[i].get('name', ''))
-                                j_detail = len(unique_items[j].get('name', ''))
-                                return (j, i) if i_detail > j_detail else (i, j)
-                        except Exception as e:
-                            logger.warning(f"Early redundancy check failed: {str(e)}")
-                            
-                    return None
-                    
-                # Process batches to maintain parallelism
+                # Each round is judged in batched LLM requests; pairs touching an item
+                # found redundant in an earlier round are skipped
                 for batch_idx in range(0, len(pairs_to_check), batch_size):
-                    batch = pairs_to_check[batch_idx:batch_idx + batch_size]
-                    results = await asyncio.gather(*(check_pair(i, j) for i, j in batch))
+                    batch = [(i, j) for i, j in pairs_to_check[batch_idx:batch_idx + batch_size]
+                             if i not in redundant_indices and j not in redundant_indices]
+                    if not batch:
+                        continue
+                    try:
+                        verdicts = await self.check_similarity_llm_batch([
+                            (unique_items[i]['name'], unique_items[j]['name'], context, context)
+                            for i, j in batch
+                        ])
+                    except Exception as e:
+                        logger.warning(f"Early redundancy check failed: {str(e)}")
+                        continue
                     
                     # Process results
-                    for result in results:
-                        if result:
-                            redundant_idx, keep_idx = result
-                            if redundant_idx not in redundant_indices:
-                                redundant_indices.add(redundant_idx)
-                                logger.info(f"Found redundant {content_type}: '{unique_items[redundant_idx]['name']}' similar to '{unique_items[keep_idx]['name']}'")
+                    for (i, j), is_redundant in zip(batch, verdicts):
+                        if not is_redundant:
+                            continue
+                        # Keep item with more detailed information
+                        i_detail = len(unique_items[i].get('name', ''))
+                        j_detail = len(unique_items[j].get('name', ''))
+                        redundant_idx, keep_idx = (j, i) if i_detail > j_detail else (i, j)
+                        if redundant_idx not in redundant_indices:
+                            redundant_indices.add(redundant_idx)
+                            logger.info(f"Found redundant {content_type}: '{unique_items[redundant_idx]['name']}' similar to '{unique_items[keep_idx]['name']}'")
                 
                 # Filter out redundant items
                 unique_items = [item for i, item in enumerate(unique_items) if i not in redundant_indices]
@@ -1707,106 +1785,35 @@ class MindMapGenerator:
         
         return unique_items
 
-    async def is_similar_to_existing(self, name: str, existing_names: Union[dict, set], content_type: str = 'topic') -> bool:
+    async def is_similar_to_existing(self, name: str, existing_names: Union[dict, set, FuzzyDedupIndex], content_type: str = 'topic') -> bool:
         """Check if name is similar to any existing names using stricter fuzzy matching thresholds.
         
         Args:
             name: Text to check for similarity
-            existing_names: Dictionary or set of existing names to compare against
+            existing_names: FuzzyDedupIndex, or dictionary/set of existing names to compare against
             content_type: Type of content being compared ('topic', 'subtopic', or 'detail')
             
         Returns:
             bool: True if similar content exists, False otherwise
         """
-        # Lower thresholds to catch more duplicates
-        base_threshold = {
-            'topic': 75,      # Lower from 85 to catch more duplicates
-            'subtopic': 70,   # Lower from 80 to catch more duplicates
-            'detail': 65      # Lower from 75 to catch more duplicates
-        }[content_type]
-        
-        # Get threshold for this content type
-        threshold = base_threshold
-        
-        # Adjust threshold based on text length - be more lenient with longer texts
-        if len(name) < 10:
-            threshold = min(threshold + 10, 95)  # Stricter for very short texts
-        elif len(name) > 100:
-            threshold = max(threshold - 15, 55)  # More lenient for long texts
-        
-        # Make adjustments for content types to catch more duplicates
-        if content_type == 'subtopic':
-            threshold = max(threshold - 10, 60)  # Lower threshold to catch more duplicates
-        elif content_type == 'detail':
-            threshold = max(threshold - 10, 55)  # Lower threshold to catch more duplicates
-        
-        # Clean and normalize input text
-        name = re.sub(r'\s+', ' ', name.lower().strip())
-        name = re.sub(r'[^\w\s]', '', name)
-        
-        # Special handling for numbered items
-        numbered_pattern = self.numbered_pattern
-        name_without_number = numbered_pattern.sub(r'\1', name)
-        
-        # Handle both dict and set inputs
-        existing_items = existing_names.keys() if isinstance(existing_names, dict) else existing_names
-        
-        for existing_name in existing_items:
-            # Skip if lengths are vastly different
-            existing_clean = re.sub(r'\s+', ' ', str(existing_name).lower().strip())
-            existing_clean = re.sub(r'[^\w\s]', '', existing_clean)
-            
-            if abs(len(name) - len(existing_clean)) > len(name) * 0.7:  # Increased from 0.5
-                continue
-            
-            # Calculate multiple similarity metrics
-            basic_ratio = fuzz.ratio(name, existing_clean)
-            partial_ratio = fuzz.partial_ratio(name, existing_clean)
-            token_sort_ratio = fuzz.token_sort_ratio(name, existing_clean)
-            token_set_ratio = fuzz.token_set_ratio(name, existing_clean)
-            
-            # For numbered items, compare without numbers
-            existing_without_number = numbered_pattern.sub(r'\1', existing_clean)
-            if name_without_number != name or existing_without_number != existing_clean:
-                number_ratio = fuzz.ratio(name_without_number, existing_without_number)
-                basic_ratio = max(basic_ratio, number_ratio)
-            
-            # Weight ratios differently based on content type - higher weights to catch more duplicates
-            if content_type == 'topic':
-                final_ratio = max(
-                    basic_ratio,
-                    token_sort_ratio * 1.1,  # Increased weight
-                    token_set_ratio * 1.0    # Increased weight
-                )
-            elif content_type == 'subtopic':
-                final_ratio = max(
-                    basic_ratio,
-                    partial_ratio * 1.0,     # Increased weight
-                    token_sort_ratio * 0.95, # Increased weight
-                    token_set_ratio * 0.9    # Increased weight
-                )
-            else:  # details
-                final_ratio = max(
-                    basic_ratio * 0.95,
-                    partial_ratio * 0.9,
-                    token_sort_ratio * 0.85,
-                    token_set_ratio * 0.8
-                )
-            
-            # Increase ratio for shorter texts to catch more duplicates
-            if len(name) < 30:
-                final_ratio *= 1.1  # Boost ratio for short texts
-            
-            # Check against adjusted threshold
-            if final_ratio > threshold:
-                logger.debug(
-                    f"Found similar {content_type}:\n"
-                    f"New: '{name}'\n"
-                    f"Existing: '{existing_clean}'\n"
-                    f"Ratio: {final_ratio:.2f} (threshold: {threshold})"
-                )
-                return True
+        # Thresholds, ratio weights and normalization live in fuzzy_dedup; an index keeps
+        # its names normalized, plain containers are normalized through its cache
+        if isinstance(existing_names, FuzzyDedupIndex):
+            similar_to = existing_names.find_similar(name)
+        else:
+            existing_items = [str(existing) for existing in (existing_names.keys() if isinstance(existing_names, dict) else existing_names)]
+            if not existing_items:
+                return False
+            row = similarity_matrix([name], [normalize(name)], [normalize(existing) for existing in existing_items], content_type)[0]
+            similar_to = next((existing_items[i] for i, similar in enumerate(row) if similar), None)
         
+        if similar_to is not None:
+            logger.debug(
+                f"Found similar {content_type}:\n"
+                f"New: '{name}'\n"
+                f"Existing: '{similar_to}'"
+            )
+            return True
         return False
 
     async def check_similarity_llm(self, text1: str, text2: str, context1: str, context2: str) -> bool:
@@ -1865,6 +1872,84 @@ class MindMapGenerator:
             # Default to considering items similar if the check fails
             return True
 
+    async def check_similarity_llm_batch(self, pairs: List[Tuple[str, str, str, str]], batch_size: Optional[int] = None) -> List[bool]:
+        """Judge many (text1, text2, context1, context2) pairs with one LLM request per batch.
+
+        Each request lists up to ``batch_size`` numbered pairs and asks for a JSON verdict per
+        pair. Pairs whose verdict is missing or malformed are re-checked one at a time with
+        ``check_similarity_llm``.
+
+        Returns:
+            List[bool]: True where the pair is redundant, in the order of ``pairs``
+        """
+        batch_size = max(1, batch_size or Config.REDUNDANCY_JUDGE_BATCH_SIZE)
+        
+        async def judge(batch: List[Tuple[str, str, str, str]]) -> List[bool]:
+            if len(batch) == 1:
+                return [await self.check_similarity_llm(*batch[0])]
+            
+            pair_blocks = "\n\n".join(
+                f'Pair {number}:\n'
+                f'        Text 1 (from {context1}): "{text1}"\n'
+                f'        Text 2 (from {context2}): "{text2}"'
+                for number, (text1, text2, context1, context2) in enumerate(batch, 1)
+            )
+            prompt = f"""For each numbered pair below, decide whether the two text elements express similar core information, making one redundant in the mindmap.
+
+        A pair is REDUNDANT if ANY of these apply:
+        1. Both convey the same primary information or main point
+        2. Both cover the same concept from a similar angle or perspective
+        3. The semantic meaning overlaps significantly
+        4. A reader would find having both entries repetitive or confusing
+        5. One could be safely removed without losing important information
+
+        A pair is DISTINCT ONLY if ALL of these apply:
+        1. They focus on clearly different aspects or perspectives
+        2. Each provides substantial unique information not present in the other
+        3. They serve fundamentally different purposes in context
+        4. Both entries together provide significantly more value than either alone
+        5. The conceptual overlap is minimal
+
+        When in doubt, mark as REDUNDANT to create a cleaner, more focused mindmap.
+
+        {pair_blocks}
+
+        Return ONLY a JSON array with one object per pair:
+        [{{"pair": 1, "verdict": "REDUNDANT", "reason": "very brief explanation"}}, ...]
+        "verdict" must be exactly "REDUNDANT" or "DISTINCT"."""
+            
+            verdicts: Dict[int, bool] = {}
+            try:
+                response = await self._retry_generate_completion(
+                    prompt,
+                    max_tokens=50 + 40 * len(batch),
+                    request_id='similarity_check',
+                    task="checking_content_similarity_batch"
+                )
+                for entry in self._parse_llm_response(response, "array"):
+                    if not isinstance(entry, dict):
+                        continue
+                    try:
+                        number = int(entry.get('pair'))
+                    except (TypeError, ValueError):
+                        continue
+                    verdict = str(entry.get('verdict', '')).strip().upper()
+                    if 1 <= number <= len(batch) and number not in verdicts and verdict in ('REDUNDANT', 'DISTINCT'):
+                        verdicts[number] = verdict == 'REDUNDANT'
+            except Exception as e:
+                logger.error(f"Error in batched LLM similarity check: {str(e)}")
+            
+            missing = [number for number in range(1, len(batch) + 1) if number not in verdicts]
+            if missing:
+                logger.warning(f"Batched similarity check returned no valid verdict for {len(missing)}/{len(batch)} pairs; checking them individually")
+                fallback = await asyncio.gather(*(self.check_similarity_llm(*batch[number - 1]) for number in missing))
+                verdicts.update(zip(missing, fallback))
+            return [verdicts[number] for number in range(1, len(batch) + 1)]
+        
+        batches = [pairs[start:start + batch_size] for start in range(0, len(pairs), batch_size)]
+        results = await asyncio.gather(*(judge(batch) for batch in batches))
+        return [verdict for batch_result in results for verdict in batch_result]
+
     async def _process_content_batch(self, content_items: List[ContentItem]) -> Set[int]:
         """Process a batch of content items to identify redundant content with parallel processing.
         
@@ -1877,6 +1962,7 @@ class MindMapGenerator:
         redundant_indices = set()
         comparison_tasks = []
         comparison_counter = 0
+        pruned_pairs = 0
         
         # Create cache of preprocessed texts to avoid recomputing
         processed_texts = {}
@@ -1886,8 +1972,12 @@ class MindMapGenerator:
             text = re.sub(r'[^\w\s]', '', text)
             processed_texts[idx] = text
         
-        # Limit concurrent API calls
-        semaphore = asyncio.Semaphore(10)  # Adjust based on API limits
+        # Embed all texts once; pairs that are not near neighbours are treated as distinct
+        candidates = candidate_pairs(
+            [processed_texts[idx] for idx in range(len(content_items))],
+            threshold=Config.REDUNDANCY_CANDIDATE_THRESHOLD,
+            max_neighbors=Config.REDUNDANCY_MAX_NEIGHBORS
+        )
         
         # Prepare all comparison tasks first
         for i in range(len(content_items)):
@@ -1940,76 +2030,38 @@ class MindMapGenerator:
                 # Skip if one item is already marked for removal
                 if i in redundant_indices or j in redundant_indices:
                     continue
-                    
-                # Add to parallel comparison tasks
-                async def check_similarity_with_context(idx1, idx2):
-                    """Run similarity check with semaphore and return context for logging"""
-                    nonlocal comparison_counter
-                    
-                    # Atomically increment comparison counter
-                    comparison_id = comparison_counter = comparison_counter + 1
-                    
-                    # Log start of comparison
-                    logger.info(f"\nMaking comparison {comparison_id}...")
-                    
-                    # Run the LLM comparison with rate limiting
-                    async with semaphore:
-                        try:
-                            is_redundant = await self.check_similarity_llm(
-                                content_items[idx1].text, 
-                                content_items[idx2].text,
-                                content_items[idx1].path_str, 
-                                content_items[idx2].path_str
-                            )
-                            
-                            # Calculate confidence if redundant
-                            confidence = 0.0
-                            if is_redundant:
-                                # Calculate fuzzy string similarity metrics
-                                fuzz_ratio = fuzz.ratio(processed_texts[idx1], processed_texts[idx2]) / 100.0
-                                token_sort_ratio = fuzz.token_sort_ratio(processed_texts[idx1], processed_texts[idx2]) / 100.0
-                                token_set_ratio = fuzz.token_set_ratio(processed_texts[idx1], processed_texts[idx2]) / 100.0
-                                
-                                # Combine metrics for overall confidence
-                                confidence = (fuzz_ratio * 0.4 + 
-                                            token_sort_ratio * 0.3 + 
-                                            token_set_ratio * 0.3)
-                            
-                            return {
-                                'comparison_id': comparison_id,
-                                'is_redundant': is_redundant,
-                                'confidence': confidence,
-                                'idx1': idx1,
-                                'idx2': idx2,
-                                'success': True
-                            }
-                        except Exception as e:
-                            logger.error(f"Error in comparison {comparison_id}: {str(e)}")
-                            return {
-                                'comparison_id': comparison_id,
-                                'success': False,
-                                'error': str(e),
-                                'idx1': idx1,
-                                'idx2': idx2
-                            }
                 
-                # Add task to our list
-                comparison_tasks.append(check_similarity_with_context(i, j))
+                if candidates is not None and (i, j) not in candidates:
+                    pruned_pairs += 1
+                    continue
+                
+                # Removal requires fuzzy confidence > 0.8 whatever the LLM answers,
+                # so a pair below that bar is not worth a call
+                pair_confidence = self._redundancy_confidence(text1, text2)
+                if pair_confidence <= 0.8:
+                    pruned_pairs += 1
+                    continue
+                    
+                # Queue for the batched LLM judgement
+                comparison_tasks.append((i, j, pair_confidence))
         
-        # Run all comparison tasks in parallel
+        # Judge all queued pairs, several per LLM request
         if comparison_tasks:
-            logger.info(f"Starting {len(comparison_tasks)} parallel similarity comparisons")
-            results = await asyncio.gather(*comparison_tasks)
+            logger.info(f"Starting {len(comparison_tasks)} similarity comparisons "
+                        f"({Config.REDUNDANCY_JUDGE_BATCH_SIZE} pairs per request)")
+            comparison_counter += len(comparison_tasks)
+            verdicts = await self.check_similarity_llm_batch([
+                (content_items[i].text, content_items[j].text,
+                 content_items[i].path_str, content_items[j].path_str)
+                for i, j, _ in comparison_tasks
+            ])
             
             # Process results
             # First, collect all redundancies with confidence scores
             redundancy_candidates = []
-            for result in results:
-                if not result['success']:
-                    continue
-                    
-                if result['is_redundant'] and result['confidence'] > 0.8:  # High confidence threshold
-                    redundancy_candidates.append(result)
+            for (i, j, pair_confidence), is_redundant in zip(comparison_tasks, verdicts):
+                if is_redundant and pair_confidence > 0.8:  # High confidence threshold
+                    redundancy_candidates.append({'idx1': i, 'idx2': j, 'confidence': pair_confidence})
             
             # Sort by confidence (highest first)
             redundancy_candidates.sort(key=lambda x: x['confidence'], reverse=True)
@@ -2049,9 +2101,20 @@ class MindMapGenerator:
                         f"Confidence: {colored(f'{confidence_val:.2f}', 'cyan')}"
                     )
         
-        logger.info(f"\nBatch processing complete. Made {comparison_counter} comparisons.")
+        logger.info(f"\nBatch processing complete. Made {comparison_counter} comparisons, skipped {pruned_pairs} dissimilar pairs.")
         return redundant_indices                
 
+    def _redundancy_confidence(self, text1: str, text2: str) -> float:
+        """Fuzzy confidence (0-1) that two normalized texts say the same thing."""
+        fuzz_ratio = fuzz.ratio(text1, text2) / 100.0
+        token_sort_ratio = fuzz.token_sort_ratio(text1, text2) / 100.0
+        token_set_ratio = fuzz.token_set_ratio(text1, text2) / 100.0
+        
+        # Combine metrics for overall confidence
+        return (fuzz_ratio * 0.4 + 
+                token_sort_ratio * 0.3 + 
+                token_set_ratio * 0.3)
+
     def _get_importance_value(self, importance: str) -> int:
         """Convert importance string to numeric value for comparison."""
         return {'high': 3, 'medium': 2, 'low': 1}.get(importance.lower(), 0)
@@ -2060,6 +2123,7 @@ class MindMapGenerator:
         """Extract all content items with their full paths for filtering."""
         if not node:
             return
+        state = self._state
 
         # Process current node (including root node)
         if 'name' in node:
@@ -2080,8 +2144,8 @@ class MindMapGenerator:
                 # Only add if path is non-empty
                 if current_node_path:
                     path_tuple = tuple(current_node_path)
-                    self.all_content.append(content_item)
-                    self.content_by_path[path_tuple] = content_item
+                    state.all_content.append(content_item)
+                    state.content_by_path[path_tuple] = content_item
 
             # Process details at current level
             for detail in node.get('details', []):
@@ -2096,8 +2160,8 @@ class MindMapGenerator:
                             importance=detail.get('importance', 'medium')
                         )
                         detail_path_tuple = tuple(detail_path)
-                        self.all_content.append(detail_item)
-                        self.content_by_path[detail_path_tuple] = detail_item
+                        state.all_content.append(detail_item)
+                        state.content_by_path[detail_path_tuple] = detail_item
 
             # Process subtopics
             for subtopic in node.get('subtopics', []):
@@ -2109,6 +2173,12 @@ class MindMapGenerator:
 
     async def final_pass_filter_for_duplicative_content(self, mindmap_data: Dict[str, Any], batch_size: int = 50) -> Dict[str, Any]:
         """Enhanced filter for duplicative content with more aggressive detection and safer rebuilding."""
+        # Also callable on its own, outside generate_mindmap
+        with _request_scope():
+            return await self._final_pass_filter_for_duplicative_content(mindmap_data, batch_size)
+
+    async def _final_pass_filter_for_duplicative_content(self, mindmap_data: Dict[str, Any], batch_size: int) -> Dict[str, Any]:
+        """Body of ``final_pass_filter_for_duplicative_content``; runs inside a request scope."""
         USE_VERBOSE = True  # Toggle for verbose logging
         
         def vlog(message: str, color: str = 'white', bold: bool = False):
@@ -2136,10 +2206,11 @@ class MindMapGenerator:
             vlog("WARNING: No 'central_theme' found in mindmap!", 'red', True)
             return mindmap_data  # Return original if no central theme
         
-        # Initialize instance variables for content tracking
+        # Initialize request-scoped content tracking
         vlog("\n🔄 Initializing content tracking...", 'yellow')
-        self.all_content = []
-        self.content_by_path = {}
+        state = self._state
+        state.all_content = []
+        state.content_by_path = {}
         
         # Extract all content items for filtering
         vlog("\n📋 Starting content extraction from central theme...", 'blue', True)
@@ -2148,9 +2219,9 @@ class MindMapGenerator:
             self._extract_content_for_filtering(mindmap_data.get('central_theme', {}), [])
             
             # Verify extraction worked
-            vlog(f"✅ Successfully extracted {len(self.all_content)} total content items:", 'green')
+            vlog(f"✅ Successfully extracted {len(state.all_content)} total content items:", 'green')
             content_types = {}
-            for item in self.all_content:
+            for item in state.all_content:
                 content_types[item.node_type] = content_types.get(item.node_type, 0) + 1
             for node_type, count in content_types.items():
                 vlog(f"  - {node_type}: {count} items", 'green')
@@ -2159,7 +2230,7 @@ class MindMapGenerator:
             return mindmap_data  # Return original data on error
         
         # Check if we have any content to filter
-        initial_count = len(self.all_content)
+        initial_count = len(state.all_content)
         if initial_count == 0:
             vlog("No content extracted - mindmap appears empty", 'red', True)
             return mindmap_data  # Return original data
@@ -2167,8 +2238,8 @@ class MindMapGenerator:
         # Process content in batches for memory efficiency
         vlog("\n🔄 Processing content in batches...", 'yellow', True)
         content_batches = [
-            self.all_content[i:i+batch_size] 
-            for i in range(0, len(self.all_content), batch_size)
+            state.all_content[i:i+batch_size] 
+            for i in range(0, len(state.all_content), batch_size)
         ]
         
         all_to_remove = set()
@@ -2184,17 +2255,17 @@ class MindMapGenerator:
             vlog(f"Batch {batch_idx+1} complete: identified {len(batch_to_remove)} redundant items", 'green')
         
         # Get indices of items to keep
-        keep_indices = set(range(len(self.all_content))) - all_to_remove
+        keep_indices = set(range(len(state.all_content))) - all_to_remove
         
         # Convert to set of paths to keep
         vlog("\n🔄 Converting to paths for rebuild...", 'blue')
-        keep_paths = {tuple(self.all_content[i].path) for i in keep_indices}
+        keep_paths = {tuple(state.all_content[i].path) for i in keep_indices}
         vlog(f"Keeping {len(keep_paths)} unique paths", 'blue')
         
         # Safety check - add at least one path if none remain
-        if not keep_paths and len(self.all_content) > 0:
+        if not keep_paths and len(state.all_content) > 0:
             vlog("⚠️ No paths remained after filtering! Adding at least one path", 'yellow', True)
-            first_item = self.all_content[0]
+            first_item = state.all_content[0]
             keep_paths.add(tuple(first_item.path))
         
         # Rebuild the mindmap with only the paths to keep
@@ -2297,29 +2368,57 @@ class MindMapGenerator:
         Raises:
             MindMapGenerationError: If mindmap generation fails
         """
+        mermaid, _ = await self.generate_mindmap_with_concepts(document_content, request_id, max_topics)
+        return mermaid
+
+    async def generate_mindmap_with_concepts(self, document_content: str, request_id: str,
+                                             max_topics: int = 8) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Generate a mindmap in a fresh request scope.
+
+        Safe to call concurrently on one generator: every call gets its own
+        ``MindMapRequestState`` and its own Weaviate document.
+
+        Returns:
+            Tuple[str, Optional[Dict]]: (Mermaid mindmap, verified concepts for interactive HTML)
+        """
+        state = MindMapRequestState()
+        token = _request_state.set(state)
+        try:
+            mermaid = await self._generate_mindmap(document_content, request_id, max_topics)
+            return mermaid, state.last_concepts
+        finally:
+            _request_state.reset(token)
+
+    async def _generate_mindmap(self, document_content: str, request_id: str, max_topics: int) -> str:
+        """Body of ``generate_mindmap``; runs inside the request scope set up by the caller."""
+        # Unique per call: request ids repeat (e.g. "api_request") and requests share the collection
+        document_name = f"doc_{request_id}_{uuid.uuid4().hex[:8]}"
+        state = self._state
         try:
             logger.info(f"Starting NotebookLM-style mindmap generation (max_topics={max_topics})...", extra={"request_id": request_id})
             
             # Step 1: Segment the document and ingest into Weaviate
-            document_name = f"doc_{request_id}"  # Use a unique name for the document
             segment_processor = SegmentProcessor()
             segment_processor.process(document_content)
             segments_for_ingestion = [
                 {"id": seg.segment_id, "text": seg.text} 
                 for seg in segment_processor.get_all_segments()
             ]
-            self.weaviate_service.ingest_segments(segments_for_ingestion, document_name)
+            # Weaviate client calls block; keep the shared event loop free for other requests
+            await asyncio.to_thread(self.weaviate_service.ingest_segments, segments_for_ingestion, document_name)
 
             # Step 2: Find semantic clusters using Weaviate (use max_topics parameter)
-            clusters = self.weaviate_service.find_semantic_clusters(document_name, num_topics=max_topics)
+            clusters = await asyncio.to_thread(
+                self.weaviate_service.find_semantic_clusters, document_name, num_topics=max_topics
+            )
 
             if not clusters:
                 logger.warning("No semantic clusters found. Falling back to full-document extraction.")
                 main_topics = await self._extract_main_topics(document_content, type_prompts['topics'], request_id)
             else:
                 logger.info(f"Found {len(clusters)} semantic topic clusters.")
-                # Step 3: Generate main topics from clusters
-                # Note: _generate_topics_from_clusters needs to be adapted to handle the new cluster format
+                # Step 3: Generate main topics from clusters (all clusters named concurrently)
+                logger.info("Generating topics from segment clusters...")
                 main_topics = await self._generate_topics_from_clusters(
                     clusters, 
                     request_id
@@ -2327,20 +2426,6 @@ class MindMapGenerator:
             
             logger.info("Starting mindmap generation process...", extra={"request_id": request_id})
             
-            # Initialize content caching and call counts for logging
-            self._content_cache = {}
-            self._unique_concepts = {'topics': set(), 'subtopics': set(), 'details': set()}
-            self._llm_calls = {
-                'topics': 0,
-                'subtopics': 0,
-                'details': 0,
-                'total_topics': 0,
-                'processed_topics': 0,
-                'total_subtopics': 0,
-                'processed_subtopics': 0,
-                'total_details': 0
-            }
-            
             # Set strict LLM call limits with increased bounds
             max_llm_calls = {
                 'topics': 30,      # 더 많은 토픽 생성
@@ -2387,25 +2472,147 @@ class MindMapGenerator:
                         return False
                 return True
                                         
-            # Step 4: Generate topics from clusters using LLM
-            logger.info("Generating topics from segment clusters...")
-            main_topics = await self._generate_topics_from_clusters(
-                clusters,
-                request_id
-            )
-            
             if not main_topics:
                 raise MindMapGenerationError("No topics could be generated from clusters")
             
             completion_stats['total_topics'] = len(main_topics)
             logger.info(f"Generated {len(main_topics)} topics from clusters")
 
-            # Process topics with completion tracking
+            # Process topics with completion tracking.
+            # The tree is expanded level by level in waves: subtopics for every topic of a wave
+            # are extracted concurrently, then details for every subtopic. A wave only holds
+            # topics that early stopping cannot drop and that fit the estimated word budget, and
+            # detail calls only go to subtopics the assembly below will still reach, so no LLM
+            # call is spent on a node it would discard. Topics past the early-stop point are
+            # expanded one at a time once the previous one is assembled.
             processed_topics = {}
             # NEW: Track already processed topics for redundancy checking
-            processed_topic_names = {}
+            processed_topic_names = FuzzyDedupIndex('topic')
+            candidate_topics = []
             
-            for topic_idx, topic in enumerate(main_topics, 1):
+            for topic in main_topics:
+                topic_name = topic['name']
+                
+                # NEW: Check if this topic is redundant with already processed topics
+                similar_to = processed_topic_names.find_similar(topic_name)
+                if similar_to is not None:
+                    logger.info(f"Skipping redundant topic: '{topic_name}' (similar to '{similar_to}')")
+                    continue
+                    
+                # Track this topic for future redundancy checks
+                processed_topic_names.add(topic_name)
+                candidate_topics.append(topic)
+            
+            # Early stopping cannot trigger before this many topics have been assembled
+            eager_topics = max(min_requirements['topics'], math.ceil(len(main_topics) * 0.75))
+            # Observed word counts drive the estimates; config defaults cover the first wave
+            detail_words_observed = {'calls': 0, 'words': 0}
+            
+            def estimated_detail_words() -> float:
+                if detail_words_observed['calls']:
+                    return detail_words_observed['words'] / detail_words_observed['calls']
+                return Config.EXPANSION_DETAIL_WORDS_ESTIMATE
+            
+            def estimated_topic_words() -> float:
+                if completion_stats['processed_topics']:
+                    return current_word_count / completion_stats['processed_topics']
+                return min_requirements['subtopics_per_topic'] * estimated_detail_words()
+            
+            def keep_details(details: List[Dict[str, Any]], word_count: int,
+                             log: bool = False) -> Tuple[List[Dict[str, Any]], int]:
+                """Drop similar details and stop at the word limit; returns kept details and new word count."""
+                seen_details = FuzzyDedupIndex('detail')
+                unique_details = []
+                
+                for detail in details:
+                    detail_words = len(detail['text'].split())
+                    
+                    if word_count + detail_words > word_limit * 0.98:
+                        if log:
+                            logger.info("Approaching word limit during detail processing")
+                        break
+                        
+                    if not seen_details.is_similar(detail['text']):
+                        word_count += detail_words
+                        seen_details.add(detail['text'])
+                        unique_details.append(detail)
+                return unique_details, word_count
+            
+            def plan_detail_jobs(subtopic_results: List[Any], details_by_subtopic: Dict[int, Any],
+                                 detail_slots: int) -> List[Dict[str, Any]]:
+                """Walk the wave as the assembly will and return subtopics still needing a detail call."""
+                word_count = current_word_count
+                jobs = []
+                for topic_offset, subtopics in enumerate(subtopic_results):
+                    if topic_offset and word_count > word_limit * 0.95:
+                        break
+                    if isinstance(subtopics, BaseException):
+                        continue
+                    for subtopic in subtopics:
+                        subtopic_words = len(subtopic['name'].split())
+                        if word_count + subtopic_words > word_limit * 0.95:
+                            break
+                        if id(subtopic) in details_by_subtopic:
+                            details = details_by_subtopic[id(subtopic)]
+                            word_count += subtopic_words
+                            if not isinstance(details, BaseException):
+                                word_count = keep_details(details, word_count)[1]
+                        elif len(details_by_subtopic) + len(jobs) < detail_slots:
+                            jobs.append(subtopic)
+                            word_count += subtopic_words + estimated_detail_words()
+                        else:
+                            return jobs
+                return jobs
+            
+            async def expand_topic(topic: Dict[str, Any]) -> List[Dict[str, Any]]:
+                """Extract subtopics for one topic and drop redundant ones (order preserved)."""
+                topic_name = topic['name']
+                # Generate subtopics from topic's segments
+                topic_segments = segment_processor.get_segments_for_cluster({
+                    'segment_ids': topic.get('citations', [])  # citations는 이미 segment_ids 리스트
+                })
+                logger.info(f"[DEBUG] Topic '{topic_name}' has {len(topic.get('citations', []))} citations, got {len(topic_segments)} segments")
+                
+                subtopics = await self._extract_subtopics_from_segments(
+                    topic, topic_segments, request_id
+                )
+                logger.info(f"[DEBUG] Extracted {len(subtopics)} subtopics for '{topic_name}'")
+                
+                # Perform early redundancy check on subtopics
+                subtopics = await self._batch_redundancy_check(
+                    subtopics, 'subtopic', context_prefix=topic_name
+                )
+                logger.info(f"[DEBUG] After redundancy check: {len(subtopics)} subtopics remain for '{topic_name}'")
+                
+                # NEW: Check redundancy with already processed subtopics
+                unique_subtopics = []
+                processed_subtopic_names = FuzzyDedupIndex('subtopic')
+                for subtopic in subtopics:
+                    subtopic_name = subtopic['name']
+                    similar_to = processed_subtopic_names.find_similar(subtopic_name)
+                    if similar_to is not None:
+                        logger.info(f"Skipping redundant subtopic: '{subtopic_name}' (similar to '{similar_to}')")
+                        continue
+                    processed_subtopic_names.add(subtopic_name)
+                    unique_subtopics.append(subtopic)
+                return unique_subtopics
+            
+            async def expand_subtopic(subtopic: Dict[str, Any]) -> List[Dict[str, Any]]:
+                """Extract details for one subtopic."""
+                # Extract details from subtopic's segments
+                subtopic_segments = segment_processor.get_segments_for_cluster({
+                    'segment_ids': subtopic.get('citations', [])  # citations는 이미 segment_ids 리스트
+                })
+                details = await self._extract_details_from_segments(
+                    subtopic, subtopic_segments, request_id
+                )
+                logger.info(f"✅ Generated {len(details)} details for subtopic '{subtopic['name']}'")
+                return details
+            
+            next_topic = 0
+            while next_topic < len(candidate_topics):
+                topic_idx = next_topic + 1
+                
                 # Don't stop early if we haven't processed minimum topics
                 should_continue = (topic_idx <= min_requirements['topics'] or 
                                 not has_sufficient_content() or
@@ -2414,172 +2621,138 @@ class MindMapGenerator:
                 if not should_continue:
                     logger.info(f"Stopping after processing {topic_idx} topics - sufficient content gathered")
                     break
-        
-                topic_name = topic['name']
-                
-                # NEW: Check if this topic is redundant with already processed topics
-                is_redundant = False
-                for processed_name in processed_topic_names:
-                    if await self.is_similar_to_existing(topic_name, {processed_name: True}, 'topic'):
-                        logger.info(f"Skipping redundant topic: '{topic_name}' (similar to '{processed_name}')")
-                        is_redundant = True
-                        break
-                        
-                if is_redundant:
-                    continue
-                    
-                # Track this topic for future redundancy checks
-                processed_topic_names[topic_name] = True
                 
                 # Enhanced word limit check with buffer
                 if current_word_count > word_limit * 0.95:  # Increased from 0.9 to ensure more completion
                     logger.info(f"Approaching word limit at {current_word_count}/{word_limit:.0f} words")
                     break
-
-                logger.info(f"Processing topic {topic_idx}/{len(main_topics)}: '{topic_name}' "
-                        f"(Words: {current_word_count}/{word_limit:.0f})",
-                        extra={"request_id": request_id})
                 
-                # Track unique concepts with validation
-                if topic_name not in self._unique_concepts['topics']:
-                    self._unique_concepts['topics'].add(topic_name)
-                    completion_stats['processed_topics'] += 1
-
-                try:
-                    # Generate subtopics from topic's segments
-                    topic_segments = segment_processor.get_segments_for_cluster({
-                        'segment_ids': topic.get('citations', [])  # citations는 이미 segment_ids 리스트
-                    })
+                subtopic_slots = max_llm_calls['subtopics'] - state.llm_calls['subtopics']
+                if subtopic_slots <= 0:
+                    logger.info("Reached subtopic LLM call limit")
+                    break
+                
+                # Grow the wave while early stopping cannot drop the next topic and the
+                # estimated words still fit
+                wave = [candidate_topics[next_topic]]
+                projected_words = current_word_count + estimated_topic_words()
+                while (next_topic + len(wave) < len(candidate_topics) and
+                       next_topic + len(wave) < eager_topics and
+                       len(wave) < subtopic_slots and
+                       projected_words + estimated_topic_words() <= word_limit * 0.95):
+                    wave.append(candidate_topics[next_topic + len(wave)])
+                    projected_words += estimated_topic_words()
+                next_topic += len(wave)
+                
+                # Level 1: subtopics for the wave's topics at once. Once the detail budget is
+                # spent a topic keeps no subtopics, so none are extracted for it.
+                detail_slots = max(0, max_llm_calls['details'] - state.llm_calls['details'])
+                if detail_slots:
+                    state.llm_calls['subtopics'] += len(wave)
+                    subtopic_results = await asyncio.gather(
+                        *(expand_topic(topic) for topic in wave), return_exceptions=True
+                    )
+                else:
+                    subtopic_results = [[] for _ in wave]
+                
+                # Level 2: details for the wave's subtopics, in rounds. Each round reserves call
+                # slots for the subtopics the assembly would still reach; later rounds continue
+                # from there once real detail sizes replace the estimate.
+                details_by_subtopic = {}
+                while True:
+                    detail_jobs = plan_detail_jobs(subtopic_results, details_by_subtopic, detail_slots)
+                    if not detail_jobs:
+                        break
+                    state.llm_calls['details'] += len(detail_jobs)
+                    detail_results = await asyncio.gather(
+                        *(expand_subtopic(subtopic) for subtopic in detail_jobs), return_exceptions=True
+                    )
+                    for subtopic, details in zip(detail_jobs, detail_results):
+                        details_by_subtopic[id(subtopic)] = details
+                        if not isinstance(details, BaseException):
+                            detail_words_observed['calls'] += 1
+                            detail_words_observed['words'] += sum(len(detail['text'].split()) for detail in details)
+                
+                # Assemble in topic order, applying the word limit deterministically
+                for offset, (topic, subtopics) in enumerate(zip(wave, subtopic_results)):
+                    topic_idx = next_topic - len(wave) + offset + 1
+                    if isinstance(subtopics, BaseException):
+                        logger.error(f"Error processing topic '{topic['name']}': {str(subtopics)}")
+                    if offset and current_word_count > word_limit * 0.95:
+                        logger.info(f"Approaching word limit at {current_word_count}/{word_limit:.0f} words")
+                        next_topic = len(candidate_topics)
+                        break
                     
-                    logger.info(f"[DEBUG] Topic '{topic_name}' has {len(topic.get('citations', []))} citations, got {len(topic_segments)} segments")
+                    topic_name = topic['name']
+                    
+                    logger.info(f"Processing topic {topic_idx}/{len(main_topics)}: '{topic_name}' "
+                            f"(Words: {current_word_count}/{word_limit:.0f})",
+                            extra={"request_id": request_id})
+                    
+                    # Track unique concepts with validation
+                    if topic_name not in state.unique_concepts['topics']:
+                        state.unique_concepts['topics'].add(topic_name)
+                        completion_stats['processed_topics'] += 1
                     
-                    if self._llm_calls['subtopics'] < max_llm_calls['subtopics']:
-                        subtopics = await self._extract_subtopics_from_segments(
-                            topic, topic_segments, request_id
-                        )
-                        logger.info(f"[DEBUG] Extracted {len(subtopics)} subtopics for '{topic_name}'")
-                        
-                        # Perform early redundancy check on subtopics
-                        subtopics = await self._batch_redundancy_check(
-                            subtopics, 'subtopic', context_prefix=topic_name
-                        )
-                        
-                        self._llm_calls['subtopics'] += 1
-                    else:
-                        logger.info("Reached subtopic LLM call limit")
-                        break
-                            
                     topic['subtopics'] = []
+                    if isinstance(subtopics, BaseException) or not subtopics:
+                        logger.warning(f"[DEBUG] No subtopics for '{topic_name}' after processing")
+                        processed_topics[topic_name] = topic
+                        continue
                     
-                    logger.info(f"[DEBUG] After redundancy check: {len(subtopics)} subtopics remain for '{topic_name}'")
+                    completion_stats['total_subtopics'] += len(subtopics)
+                    processed_subtopics = {}
                     
-                    if subtopics:
-                        completion_stats['total_subtopics'] += len(subtopics)
-                        processed_subtopics = {}
+                    # Process each subtopic with completion tracking
+                    for subtopic in subtopics:
+                        subtopic_name = subtopic['name']
                         
-                        # NEW: Track already processed subtopics for redundancy checking
-                        processed_subtopic_names = {}
+                        # Track word count for subtopics
+                        subtopic_words = len(subtopic_name.split())
+                        if current_word_count + subtopic_words > word_limit * 0.95:
+                            logger.info("Approaching word limit during subtopic processing")
+                            break
                         
-                        # Process each subtopic with completion tracking
-                        for subtopic_idx, subtopic in enumerate(subtopics, 1):
-                            if self._llm_calls['details'] >= max_llm_calls['details']:
-                                logger.info("Reached maximum LLM calls for detail extraction")
-                                break
-                                
-                            subtopic_name = subtopic['name']
+                        if id(subtopic) not in details_by_subtopic:
+                            logger.info("Reached maximum LLM calls for detail extraction")
+                            break
                             
-                            # NEW: Check redundancy with already processed subtopics
-                            is_redundant = False
-                            for processed_name in processed_subtopic_names:
-                                if await self.is_similar_to_existing(subtopic_name, {processed_name: True}, 'subtopic'):
-                                    logger.info(f"Skipping redundant subtopic: '{subtopic_name}' (similar to '{processed_name}')")
-                                    is_redundant = True
-                                    break
-                                    
-                            if is_redundant:
-                                continue
-                                
-                            # Track this subtopic for future redundancy checks
-                            processed_subtopic_names[subtopic_name] = True
+                        current_word_count += subtopic_words
+                        
+                        # Track unique subtopics
+                        state.unique_concepts['subtopics'].add(subtopic_name)
+                        completion_stats['processed_subtopics'] += 1
+                        
+                        details = details_by_subtopic[id(subtopic)]
+                        if isinstance(details, BaseException):
+                            logger.error(f"Error processing details for subtopic '{subtopic_name}': {str(details)}")
+                            details = []
+                        
+                        subtopic['details'] = []
+                        
+                        if details:
+                            completion_stats['total_details'] += len(details)
                             
-                            # Track word count for subtopics
-                            subtopic_words = len(subtopic_name.split())
-                            if current_word_count + subtopic_words > word_limit * 0.95:
-                                logger.info("Approaching word limit during subtopic processing")
-                                break
-                                
-                            current_word_count += subtopic_words
+                            # Process details with completion tracking
+                            unique_details, current_word_count = keep_details(details, current_word_count, log=True)
+                            for detail in unique_details:
+                                state.unique_concepts['details'].add(detail['text'])
                             
-                            # Track unique subtopics
-                            self._unique_concepts['subtopics'].add(subtopic_name)
-                            completion_stats['processed_subtopics'] += 1
-
-                            try:
-                                # Extract details from subtopic's segments
-                                subtopic_segments = segment_processor.get_segments_for_cluster({
-                                    'segment_ids': subtopic.get('citations', [])  # citations는 이미 segment_ids 리스트
-                                })
-                                
-                                if self._llm_calls['details'] < max_llm_calls['details']:
-                                    details = await self._extract_details_from_segments(
-                                        subtopic, subtopic_segments, request_id
-                                    )
-                                    self._llm_calls['details'] += 1
-                                    logger.info(f"✅ Generated {len(details)} details for subtopic '{subtopic_name}'")
-                                else:
-                                    details = []
-                                    logger.warning(f"⚠️ Skipped details for '{subtopic_name}' - reached LLM call limit")
-                                
-                                subtopic['details'] = []
-                                
-                                if details:
-                                    completion_stats['total_details'] += len(details)
-                                    
-                                    # Process details with completion tracking
-                                    seen_details = {}
-                                    unique_details = []
-                                    
-                                    for detail in details:
-                                        detail_words = len(detail['text'].split())
-                                        
-                                        if current_word_count + detail_words > word_limit * 0.98:
-                                            logger.info("Approaching word limit during detail processing")
-                                            break
-                                            
-                                        if not await self.is_similar_to_existing(detail['text'], seen_details, 'detail'):
-                                            current_word_count += detail_words
-                                            seen_details[detail['text']] = True
-                                            unique_details.append(detail)
-                                            self._unique_concepts['details'].add(detail['text'])
-                                    
-                                    subtopic['details'] = unique_details
-                                
-                                processed_subtopics[subtopic_name] = subtopic
-                                
-                            except Exception as e:
-                                logger.error(f"Error processing details for subtopic '{subtopic_name}': {str(e)}")
-                                processed_subtopics[subtopic_name] = subtopic
-                                continue
+                            subtopic['details'] = unique_details
                         
-                        topic['subtopics'] = list(processed_subtopics.values())
-                        logger.info(f"[DEBUG] Final: Topic '{topic_name}' has {len(topic['subtopics'])} subtopics")
-                    else:
-                        logger.warning(f"[DEBUG] No subtopics for '{topic_name}' after processing")
+                        processed_subtopics[subtopic_name] = subtopic
                     
+                    topic['subtopics'] = list(processed_subtopics.values())
+                    logger.info(f"[DEBUG] Final: Topic '{topic_name}' has {len(topic['subtopics'])} subtopics")
                     processed_topics[topic_name] = topic
-                        
-                except Exception as e:
-                    logger.error(f"Error processing topic '{topic_name}': {str(e)}")
-                    processed_topics[topic_name] = topic
-                    continue
-                
-                # Log completion status
-                logger.info(
-                    f"Completion status: "
-                    f"Topics: {completion_stats['processed_topics']}/{completion_stats['total_topics']}, "
-                    f"Subtopics: {completion_stats['processed_subtopics']}/{completion_stats['total_subtopics']}, "
-                    f"Details: {completion_stats['total_details']}"
-                )
+                    
+                    # Log completion status
+                    logger.info(
+                        f"Completion status: "
+                        f"Topics: {completion_stats['processed_topics']}/{completion_stats['total_topics']}, "
+                        f"Subtopics: {completion_stats['processed_subtopics']}/{completion_stats['total_subtopics']}, "
+                        f"Details: {completion_stats['total_details']}"
+                    )
             
             if not processed_topics:
                 raise MindMapGenerationError("No topics could be processed")
@@ -2591,10 +2764,10 @@ class MindMapGenerator:
                 'completion_percentage': (current_word_count/word_limit)*100,
                 'topics_processed': completion_stats['processed_topics'],
                 'total_topics': completion_stats['total_topics'],
-                'unique_topics': len(self._unique_concepts['topics']),
-                'unique_subtopics': len(self._unique_concepts['subtopics']),
-                'unique_details': len(self._unique_concepts['details']),
-                'llm_calls': self._llm_calls,
+                'unique_topics': len(state.unique_concepts['topics']),
+                'unique_subtopics': len(state.unique_concepts['subtopics']),
+                'unique_details': len(state.unique_concepts['details']),
+                'llm_calls': state.llm_calls,
                 'early_stopping': has_sufficient_content()
             }
             
@@ -2606,9 +2779,9 @@ class MindMapGenerator:
                 f"\n- Unique topics: {final_stats['unique_topics']}"
                 f"\n- Unique subtopics: {final_stats['unique_subtopics']}"
                 f"\n- Unique details: {final_stats['unique_details']}"
-                f"\n- LLM calls: topics={self._llm_calls['topics']}, "
-                f"subtopics={self._llm_calls.get('subtopics', 0)}, "
-                f"details={self._llm_calls.get('details', 0)}"
+                f"\n- LLM calls: topics={state.llm_calls['topics']}, "
+                f"subtopics={state.llm_calls.get('subtopics', 0)}, "
+                f"details={state.llm_calls.get('details', 0)}"
                 f"\n- Early stopping: {final_stats['early_stopping']}",
                 extra={"request_id": request_id}
             )
@@ -2644,7 +2817,7 @@ class MindMapGenerator:
                 
                 logger.info("Successfully verified against source document, generating final mindmap...")
                 # Store concepts for interactive HTML generation
-                self._last_concepts = verified_concepts
+                state.last_concepts = verified_concepts
                 return self._generate_mermaid_mindmap(verified_concepts)
                 
             except Exception as e:
@@ -2656,6 +2829,11 @@ class MindMapGenerator:
         except Exception as e:
             logger.error(f"Error in mindmap generation: {str(e)}", extra={"request_id": request_id})
             raise MindMapGenerationError(f"Failed to generate mindmap: {str(e)}")
+        finally:
+            try:
+                await asyncio.to_thread(self.weaviate_service.delete_document, document_name)
+            except Exception as e:
+                logger.warning(f"Failed to clean up segments for '{document_name}': {str(e)}")
 
     async def _generate_topics_from_clusters(
         self, 
@@ -2671,20 +2849,25 @@ class MindMapGenerator:
         Returns:
             List of topic dictionaries with names, summaries, and citations.
         """
-        topics = []
-        
-        for cluster_idx, cluster in enumerate(clusters):
+        async def name_cluster(cluster_idx: int, cluster: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
             # Extract texts and segment IDs from the cluster
             segment_texts = [seg['text'] for seg in cluster[:3]]  # Use top 3 segments for prompt
-            combined_text = "\n\n".join(segment_texts)
+            combined_text = "\n\n".join(segment_texts)[:1500]
             all_segment_ids = [seg['segment_id'] for seg in cluster]
 
-            # Generate topic name and summary from cluster
-            # The prompt can be simplified as we no longer have pre-computed keywords
-            prompt = f"""다음 텍스트 세그먼트들의 핵심 주제를 나타내는 간결한 토픽 제목을 만드세요.
+            # Same cluster text (retry or re-run of a document) -> reuse the earlier name
+            cache_key = hashlib.md5(combined_text.encode()).hexdigest()
+            topic_data = self._topic_name_cache.get(cache_key)
+            if topic_data is not None:
+                self._topic_name_cache.move_to_end(cache_key)
+                logger.info(f"Reusing cached topic name for cluster {cluster_idx}")
+            else:
+                # Generate topic name and summary from cluster
+                # The prompt can be simplified as we no longer have pre-computed keywords
+                prompt = f"""다음 텍스트 세그먼트들의 핵심 주제를 나타내는 간결한 토픽 제목을 만드세요.
 
 텍스트:
-{combined_text[:1500]}
+{combined_text}
 
 JSON 형식으로 반환:
 - "name": 3-5단어의 핵심 토픽 제목 (원문 언어 사용)
@@ -2694,36 +2877,42 @@ JSON 형식으로 반환:
 
 JSON 객체만 반환하세요."""
 
-            try:
-                response = await self.optimizer.generate_completion(
-                    prompt,
-                    max_tokens=200,
-                    request_id=request_id,
-                    task=f"generate_topic_cluster_{cluster_idx}"
-                )
-                
-                topic_data = self._parse_llm_response(response, "object")
-                
-                if topic_data and 'name' in topic_data:
-                    # Add segment citations (limit to top 5)
-                    topic = {
-                        'name': topic_data.get('name', f"Topic {cluster_idx + 1}"),
-                        'summary': topic_data.get('summary', ''),
-                        'notes': '',
-                        'citations': all_segment_ids[:5],  # Use segment IDs from cluster
-                        'emoji': '',  # No emoji for NotebookLM style
-                        'importance': 'high',
-                        'subtopics': [],
-                        'details': []
-                    }
-                    topics.append(topic)
-                    logger.info(f"Generated topic: {topic['name']} (from {len(all_segment_ids)} segments)")
-                    
-            except Exception as e:
-                logger.error(f"Error generating topic from cluster {cluster_idx}: {e}")
-                continue
-        
-        return topics
+                try:
+                    response = await self.optimizer.generate_completion(
+                        prompt,
+                        max_tokens=200,
+                        request_id=request_id,
+                        task=f"generate_topic_cluster_{cluster_idx}"
+                    )
+                    topic_data = self._parse_llm_response(response, "object")
+                except Exception as e:
+                    logger.error(f"Error generating topic from cluster {cluster_idx}: {e}")
+                    return None
+
+                if not topic_data or 'name' not in topic_data:
+                    return None
+                topic_data = {'name': topic_data.get('name'), 'summary': topic_data.get('summary', '')}
+                self._topic_name_cache[cache_key] = topic_data
+                if len(self._topic_name_cache) > self._topic_name_cache_size:
+                    self._topic_name_cache.popitem(last=False)
+
+            # Add segment citations (limit to top 5)
+            topic = {
+                'name': topic_data['name'] or f"Topic {cluster_idx + 1}",
+                'summary': topic_data['summary'],
+                'notes': '',
+                'citations': all_segment_ids[:5],  # Use segment IDs from cluster
+                'emoji': '',  # No emoji for NotebookLM style
+                'importance': 'high',
+                'subtopics': [],
+                'details': []
+            }
+            logger.info(f"Generated topic: {topic['name']} (from {len(all_segment_ids)} segments)")
+            return topic
+
+        # One naming call per cluster, all in flight together (merged into batches by the optimizer)
+        named = await asyncio.gather(*(name_cluster(idx, cluster) for idx, cluster in enumerate(clusters)))
+        return [topic for topic in named if topic is not None]
 
     async def _extract_subtopics_from_segments(
         self,
@@ -2978,6 +3167,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
             # Initialize concurrent processing controls
             semaphore = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
             topics_with_metrics = {}  # Track topic frequency and importance
+            topic_key_index = FuzzyDedupIndex('topic')  # Keys of topics_with_metrics
             unique_topics_seen = set()
             max_chunks_to_process = 5  # Increased from 3
 
@@ -3007,14 +3197,11 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                     topic_key = topic['name'].lower()
                     
                     # Check for similar existing topics with stricter criteria
-                    similar_found = False
-                    for existing_key in list(topics_with_metrics.keys()):
-                        if await self.is_similar_to_existing(topic_key, {existing_key: True}, 'topic'):
-                            topics_with_metrics[existing_key]['frequency'] += 1
-                            similar_found = True
-                            break
-                    
-                    if not similar_found:
+                    existing_key = topic_key_index.find_similar(topic_key)
+                    if existing_key is not None:
+                        topics_with_metrics[existing_key]['frequency'] += 1
+                    else:
+                        topic_key_index.add(topic_key)
                         topics_with_metrics[topic_key] = {
                             'topic': topic,
                             'frequency': 1,
@@ -3108,6 +3295,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
             )
 
             final_topics = []
+            final_topic_names = FuzzyDedupIndex('topic')
             seen_final = set()
             
             # Select final topics with more aggressive deduplication
@@ -3117,13 +3305,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                     break
                     
                 if topic['name'] not in seen_final:
-                    similar_exists = False
-                    for existing_topic in final_topics:
-                        if await self.is_similar_to_existing(topic['name'], {existing_topic['name']: True}, 'topic'):
-                            similar_exists = True
-                            break
-                    
-                    if not similar_exists:
+                    if final_topic_names.add_if_new(topic['name']):
                         seen_final.add(topic['name'])
                         final_topics.append(topic)
 
@@ -3134,13 +3316,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                         break
                         
                     if topic['name'] not in seen_final:
-                        similar_exists = False
-                        for existing_topic in final_topics:
-                            if await self.is_similar_to_existing(topic['name'], {existing_topic['name']: True}, 'topic'):
-                                similar_exists = True
-                                break
-                        
-                        if not similar_exists:
+                        if final_topic_names.add_if_new(topic['name']):
                             seen_final.add(topic['name'])
                             final_topics.append(topic)
 
@@ -3188,21 +3364,15 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
         content_hash = hashlib.md5(content.encode()).hexdigest()
         cache_key = f"subtopics_{topic['name']}_{content_hash}_{request_id}"
         
-        if not hasattr(self, '_subtopics_cache'):
-            self._subtopics_cache = {}
-            
-        if not hasattr(self, '_processed_chunks_by_topic'):
-            self._processed_chunks_by_topic = {}
-        
-        if topic['name'] not in self._processed_chunks_by_topic:
-            self._processed_chunks_by_topic[topic['name']] = set()
+        state = self._state
+        processed_chunks = state.processed_chunks_by_topic.setdefault(topic['name'], set())
 
         async def extract_from_chunk(chunk: str) -> List[Dict[str, Any]]:
             chunk_hash = hashlib.md5(chunk.encode()).hexdigest()
-            if chunk_hash in self._processed_chunks_by_topic[topic['name']]:
+            if chunk_hash in processed_chunks:
                 return []
                 
-            self._processed_chunks_by_topic[topic['name']].add(chunk_hash)
+            processed_chunks.add(chunk_hash)
                 
             enhanced_prompt = f"""You are an expert at identifying distinct, relevant subtopics that support a main topic.
 
@@ -3247,7 +3417,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                 parsed_response = self._parse_llm_response(response, "array")
                 
                 chunk_subtopics = []
-                seen_names = {}
+                seen_names = FuzzyDedupIndex('subtopic')
                 
                 for subtopic_name in parsed_response:
                     if isinstance(subtopic_name, str) and subtopic_name.strip():
@@ -3261,7 +3431,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                                 emoji=emoji
                             )
                             chunk_subtopics.append(node)
-                            seen_names[cleaned_name] = node
+                            seen_names.add(cleaned_name)
                 
                 return chunk_subtopics
                 
@@ -3271,8 +3441,8 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                 return []
 
         try:
-            if cache_key in self._subtopics_cache:
-                return self._subtopics_cache[cache_key]
+            if cache_key in state.subtopics_cache:
+                return state.subtopics_cache[cache_key]
                 
             chunk_size = min(8000, len(content) // 3) if len(content) > 6000 else 4000
             content_chunks = [content[i:i + chunk_size] 
@@ -3280,7 +3450,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
             
             # Initialize concurrent processing controls
             semaphore = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
-            seen_names = {}
+            seen_names = FuzzyDedupIndex('subtopic')
             all_subtopics = []
             
             async def process_chunk(chunk: str) -> List[Dict[str, Any]]:
@@ -3299,7 +3469,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
             for chunk_subtopics in chunk_results:
                 for subtopic in chunk_subtopics:
                     if not await self.is_similar_to_existing(subtopic['name'], seen_names, 'subtopic'):
-                        seen_names[subtopic['name']] = subtopic
+                        seen_names.add(subtopic['name'])
                         all_subtopics.append(subtopic)
 
             if not all_subtopics:
@@ -3337,7 +3507,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                 consolidated_names = self._parse_llm_response(consolidation_response, "array")
                 
                 if consolidated_names:
-                    seen_names = {}
+                    seen_names = FuzzyDedupIndex('subtopic')
                     consolidated_subtopics = []
                     
                     for name in consolidated_names:
@@ -3352,7 +3522,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                                     emoji=emoji
                                 )
                                 consolidated_subtopics.append(node)
-                                seen_names[cleaned_name] = node
+                                seen_names.add(cleaned_name)
                     
                     if consolidated_subtopics:
                         all_subtopics = consolidated_subtopics
@@ -3396,7 +3566,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                             continue
             
             final_subtopics = all_subtopics[:MAX_SUBTOPICS]
-            self._subtopics_cache[cache_key] = final_subtopics
+            state.subtopics_cache[cache_key] = final_subtopics
             
             logger.info(f"Successfully extracted {len(final_subtopics)} subtopics for {topic['name']}", 
                         extra={"request_id": request_id})
@@ -3452,24 +3622,17 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
         content_hash = hashlib.md5(content.encode()).hexdigest()
         cache_key = f"details_{subtopic['name']}_{content_hash}_{request_id}"
         
-        if not hasattr(self, '_details_cache'):
-            self._details_cache = {}
-        
-        if not hasattr(self, '_processed_chunks_by_subtopic'):
-            self._processed_chunks_by_subtopic = {}
-        
-        if subtopic['name'] not in self._processed_chunks_by_subtopic:
-            self._processed_chunks_by_subtopic[subtopic['name']] = set()
-
-        if not hasattr(self, '_current_details'):
-            self._current_details = []
+        state = self._state
+        processed_chunks = state.processed_chunks_by_subtopic.setdefault(subtopic['name'], set())
+        # Valid details collected so far by this call (used for early stopping and error recovery)
+        current_details = []
 
         async def extract_from_chunk(chunk: str) -> List[Dict[str, Any]]:
             chunk_hash = hashlib.md5(chunk.encode()).hexdigest()
-            if chunk_hash in self._processed_chunks_by_subtopic[subtopic['name']]:
+            if chunk_hash in processed_chunks:
                 return []
                 
-            self._processed_chunks_by_subtopic[subtopic['name']].add(chunk_hash)
+            processed_chunks.add(chunk_hash)
                 
             enhanced_prompt = f"""You are an expert at identifying distinct, important details that support a specific subtopic.
 
@@ -3505,11 +3668,11 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                 
                 raw_details = self._clean_detail_response(response)
                 chunk_details = []
-                seen_texts = {}
+                seen_texts = FuzzyDedupIndex('detail')
                 
                 for detail in raw_details:
                     if self._validate_detail(detail) and not await self.is_similar_to_existing(detail['text'], seen_texts, 'detail'):
-                        seen_texts[detail['text']] = True
+                        seen_texts.add(detail['text'])
                         
                         # Ensure importance is valid
                         detail['importance'] = detail['importance'].lower()
@@ -3521,9 +3684,9 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                             'text': detail['text'],
                             'importance': detail['importance']
                         })
-                        self._current_details.append(detail)
+                        current_details.append(detail)
                         
-                        if len(self._current_details) >= MINIMUM_VALID_DETAILS:
+                        if len(current_details) >= MINIMUM_VALID_DETAILS:
                             logger.info(f"Reached minimum required details ({MINIMUM_VALID_DETAILS}) during chunk processing")
                             return chunk_details
                 
@@ -3535,16 +3698,15 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                 return chunk_details if 'chunk_details' in locals() else []
 
         try:
-            if cache_key in self._details_cache:
-                return self._details_cache[cache_key]
+            if cache_key in state.details_cache:
+                return state.details_cache[cache_key]
 
-            self._current_details = []
             chunk_size = min(8000, len(content) // 3) if len(content) > 6000 else 4000
             content_chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
             
             # Initialize concurrent processing controls
             semaphore = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
-            seen_texts = {}
+            seen_texts = FuzzyDedupIndex('detail')
             all_details = []
             early_stop = asyncio.Event()
 
@@ -3559,7 +3721,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                     )
                     
                     # Check if we've reached minimum details
-                    if len(self._current_details) >= MINIMUM_VALID_DETAILS:
+                    if len(current_details) >= MINIMUM_VALID_DETAILS:
                         early_stop.set()
                     
                     return chunk_details
@@ -3573,7 +3735,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
             for chunk_details in chunk_results:
                 for detail in chunk_details:
                     if not await self.is_similar_to_existing(detail['text'], seen_texts, 'detail'):
-                        seen_texts[detail['text']] = True
+                        seen_texts.add(detail['text'])
                         all_details.append(detail)
 
                         if len(all_details) >= MINIMUM_VALID_DETAILS:
@@ -3617,12 +3779,12 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                 consolidated_raw = self._clean_detail_response(consolidation_response)
                 
                 if consolidated_raw:
-                    seen_texts = {}
+                    seen_texts = FuzzyDedupIndex('detail')
                     consolidated_details = []
                     
                     for detail in consolidated_raw:
                         if self._validate_detail(detail) and not await self.is_similar_to_existing(detail['text'], seen_texts, 'detail'):
-                            seen_texts[detail['text']] = True
+                            seen_texts.add(detail['text'])
                             detail['importance'] = detail['importance'].lower()
                             if detail['importance'] not in ['high', 'medium', 'low']:
                                 detail['importance'] = 'medium'
@@ -3643,9 +3805,9 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                         seen.add(detail['text'])
                         deduplicated_details.append(detail)
                 all_details = deduplicated_details
-                if len(self._current_details) >= MINIMUM_VALID_DETAILS:
-                    logger.info(f"Using {len(self._current_details)} previously collected valid details")
-                    all_details = self._current_details
+                if len(current_details) >= MINIMUM_VALID_DETAILS:
+                    logger.info(f"Using {len(current_details)} previously collected valid details")
+                    all_details = current_details
                 else:
                     importance_order = {"high": 0, "medium": 1, "low": 2}
                     all_details = sorted(
@@ -3700,7 +3862,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                 all_details, 
                 key=lambda x: (importance_order.get(x["importance"].lower(), 3), -len(x["text"]))
             )[:MAX_DETAILS]            
-            self._details_cache[cache_key] = final_details
+            state.details_cache[cache_key] = final_details
             
             logger.info(f"Successfully extracted {len(final_details)} details for {subtopic['name']}", 
                             extra={"request_id": request_id})
@@ -3709,9 +3871,9 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
         except Exception as e:
             logger.error(f"Failed to extract details for subtopic {subtopic['name']}: {str(e)}", 
                         extra={"request_id": request_id})
-            if hasattr(self, '_current_details') and len(self._current_details) > 0:
-                logger.info(f"Returning {len(self._current_details)} collected details despite error")
-                return self._current_details[:MAX_DETAILS]
+            if current_details:
+                logger.info(f"Returning {len(current_details)} collected details despite error")
+                return current_details[:MAX_DETAILS]
             return []
             
     async def _retry_generate_completion(self, prompt: str, max_tokens: int, request_id: str, task: str) -> str:
@@ -3786,8 +3948,8 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                         'path': current_path,
                         'type': node_type,
                         'verified': False,
-                        'node_ref': node,  # Store reference to original node
-                        'node_id': id(node),  # Store unique object ID as backup
+                        'node_ref': node,  # Keeps the node alive so node_id stays unique
+                        'node_id': id(node),  # Stable key into verification_state
                         'structural_importance': 'high' if node_type in ['root', 'topic'] else 'medium'
                     })
                     current_path = current_path + [node['name']]
@@ -3800,8 +3962,8 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                             'path': current_path,
                             'type': 'detail',
                             'verified': False,
-                            'node_ref': detail,  # Store reference to original node
-                            'node_id': id(detail),  # Store unique object ID as backup
+                            'node_ref': detail,  # Keeps the node alive so node_id stays unique
+                            'node_id': id(detail),  # Stable key into verification_state
                             'structural_importance': 'low',
                             'importance': detail.get('importance', 'medium')
                         })
@@ -3814,10 +3976,6 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
             extract_nodes(mindmap_data.get('central_theme', {}))
             logger.info(f"Extracted {len(all_nodes)} nodes for verification")
             
-            # Create verification batches to limit concurrent API calls
-            batch_size = 5  # Number of nodes to verify in parallel
-            node_batches = [all_nodes[i:i+batch_size] for i in range(0, len(all_nodes), batch_size)]
-            
             # Track verification statistics
             verification_stats = {
                 'total': len(all_nodes),
@@ -3909,40 +4067,148 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                     # Be more lenient on errors - consider verified
                     return True
             
-            # Process each node batch
-            for batch_idx, batch in enumerate(node_batches):
-                logger.info(f"Verifying batch {batch_idx+1}/{len(node_batches)} ({len(batch)} nodes)")
+            # Function to verify several nodes against one document chunk in a single call
+            async def verify_nodes_in_chunk(nodes, chunk):
+                """Batched variant of verify_node_in_chunk; nodes without a valid verdict are checked one at a time."""
+                if len(nodes) == 1:
+                    return [await verify_node_in_chunk(nodes[0], chunk)]
                 
-                # For each node, try to verify against any document chunk
-                for node in batch:
-                    if node.get('verified', False):
-                        continue  # Skip if already verified
-                        
-                    node_verified = False
-                    
-                    # Try to verify against each chunk
-                    for chunk_idx, chunk in enumerate(doc_chunks):
-                        if await verify_node_in_chunk(node, chunk):
-                            node['verified'] = True
-                            node_verified = True
-                            verification_stats['verified'] += 1
-                            node_type = node.get('type', 'unknown')
-                            if node_type in verification_stats['by_type']:
-                                verification_stats['by_type'][node_type]['verified'] += 1
-                            logger.info(
-                                f"{colored('✅ VERIFIED', 'green', attrs=['bold'])}: "
-                                f"{node.get('type', 'NODE').upper()} '{node.get('text', '')[:50]}...' "
-                                f"(Found in chunk {chunk_idx+1})"
-                            )
-                            break
-                    
-                    if not node_verified:
-                        verification_stats['not_verified'] += 1
-                        logger.info(
-                            f"{colored('❓ NOT VERIFIED', 'yellow', attrs=['bold'])}: "
-                            f"{node.get('type', 'NODE').upper()} '{node.get('text', '')[:50]}...' "
-                            f"(Not found in any chunk)"
-                        )
+                node_lines = "\n".join(
+                    f"{number}. {node['type'].title()}: \"{node['text']}\" "
+                    f"(Path: {' → '.join(node['path']) if node['path'] else 'root'})"
+                    for number, node in enumerate(nodes, 1)
+                )
+                prompt = f"""You are an expert fact-checker verifying if information in a mindmap can be reasonably derived from the original document.
+
+            Task: For each numbered mindmap item below, determine if it is supported by the document text or could be reasonably inferred from it.
+
+            Items:
+            {node_lines}
+
+            Document chunk:
+            ```
+            {chunk}
+            ```
+
+            VERIFICATION GUIDELINES:
+            1. An item can be EXPLICITLY mentioned OR reasonably inferred from the document, even through logical deduction
+            2. Logical synthesis, interpretation, and summarization of concepts in the document are STRONGLY encouraged
+            3. Content that represents a reasonable conclusion or implication from the document should be VERIFIED
+            4. Content that groups, categorizes, or abstracts ideas from the document should be VERIFIED
+            5. High-level insights that connect multiple concepts from the document should be VERIFIED
+            6. Only mark as unsupported if it contains specific claims that DIRECTLY CONTRADICT the document
+            7. GIVE THE BENEFIT OF THE DOUBT - if the content could plausibly be derived from the document, verify it
+            8. When uncertain, LEAN TOWARDS VERIFICATION rather than rejection - mindmaps are meant to be interpretive, not literal
+            9. For details specifically, allow for more interpretive latitude - they represent insights derived from the document
+            10. Consider historical and domain context that would be natural to include in an analysis
+
+            Return ONLY a JSON array with one object per item:
+            [{{"item": 1, "verdict": "YES", "reason": "brief explanation"}}, ...]
+            "verdict" must be exactly "YES" (supported or derivable) or "NO" (directly contradicts the document).
+
+            IMPORTANT: Remember to be GENEROUS in your interpretation. If there's any reasonable way the content could be derived from the document, even through multiple logical steps, mark it as verified. Only reject content that introduces completely new facts not derivable from the document or directly contradicts it."""
+                
+                verdicts = {}
+                try:
+                    response = await self._retry_generate_completion(
+                        prompt,
+                        max_tokens=50 + 60 * len(nodes),
+                        request_id='verify_node',
+                        task="verifying_against_source_batch"
+                    )
+                    for entry in self._parse_llm_response(response, "array"):
+                        if not isinstance(entry, dict):
+                            continue
+                        try:
+                            number = int(entry.get('item'))
+                        except (TypeError, ValueError):
+                            continue
+                        verdict = str(entry.get('verdict', '')).strip().upper()
+                        if 1 <= number <= len(nodes) and number not in verdicts and verdict in ('YES', 'NO'):
+                            verdicts[number] = verdict == 'YES'
+                except Exception as e:
+                    logger.error(f"Error in batched node verification: {str(e)}")
+                
+                missing = [number for number in range(1, len(nodes) + 1) if number not in verdicts]
+                if missing:
+                    logger.warning(f"Batched verification returned no valid verdict for {len(missing)}/{len(nodes)} nodes; verifying them individually")
+                    fallback = await asyncio.gather(*(verify_node_in_chunk(nodes[number - 1], chunk) for number in missing))
+                    verdicts.update(zip(missing, fallback))
+                return [verdicts[number] for number in range(1, len(nodes) + 1)]
+            
+            def mark_verified(node, reason):
+                node['verified'] = True
+                verification_stats['verified'] += 1
+                node_type = node.get('type', 'unknown')
+                if node_type in verification_stats['by_type']:
+                    verification_stats['by_type'][node_type]['verified'] += 1
+                logger.info(
+                    f"{colored('✅ VERIFIED', 'green', attrs=['bold'])}: "
+                    f"{node.get('type', 'NODE').upper()} '{node.get('text', '')[:50]}...' "
+                    f"({reason})"
+                )
+            
+            # Locate candidate chunks per node lexically; near-literal matches need no LLM call
+            chunk_index = BM25ChunkIndex(doc_chunks)
+            top_k = max(1, Config.VERIFY_TOP_K_CHUNKS)
+            candidate_chunks = {}
+            auto_verified = 0
+            for node_idx, node in enumerate(all_nodes):
+                if node.get('verified', False):
+                    continue
+                if node.get('type') == 'root':
+                    mark_verified(node, "root node")
+                    continue
+                ranked = chunk_index.top_chunks(node['text'], top_k)
+                if not ranked:
+                    # No chunks to check against (empty document): leave the node unverified
+                    continue
+                best_chunk = ranked[0][0]
+                if chunk_index.coverage(node['text'], best_chunk) >= Config.VERIFY_LEXICAL_MATCH_THRESHOLD:
+                    auto_verified += 1
+                    mark_verified(node, f"Lexical match in chunk {best_chunk+1}")
+                    continue
+                candidate_chunks[node_idx] = [chunk_idx for chunk_idx, _ in ranked]
+            
+            logger.info(
+                f"Lexical pre-verification: {auto_verified} nodes matched directly, "
+                f"{len(candidate_chunks)} nodes left for LLM verification against their top {top_k} chunks"
+            )
+            
+            # Round r checks every still-unverified node against its r-th best chunk; nodes
+            # sharing a chunk go into the same prompt and all prompts of a round run concurrently
+            nodes_per_prompt = max(1, Config.VERIFY_NODES_PER_PROMPT)
+            for rank in range(top_k):
+                by_chunk = {}
+                for node_idx, chunk_ids in candidate_chunks.items():
+                    if rank < len(chunk_ids) and not all_nodes[node_idx].get('verified', False):
+                        by_chunk.setdefault(chunk_ids[rank], []).append(node_idx)
+                if not by_chunk:
+                    break
+                
+                groups = [
+                    (chunk_idx, node_ids[start:start + nodes_per_prompt])
+                    for chunk_idx, node_ids in sorted(by_chunk.items())
+                    for start in range(0, len(node_ids), nodes_per_prompt)
+                ]
+                logger.info(f"Verification round {rank+1}/{top_k}: {sum(len(ids) for _, ids in groups)} nodes in {len(groups)} prompts")
+                results = await asyncio.gather(*(
+                    verify_nodes_in_chunk([all_nodes[node_idx] for node_idx in node_ids], doc_chunks[chunk_idx])
+                    for chunk_idx, node_ids in groups
+                ))
+                for (chunk_idx, node_ids), verdicts in zip(groups, results):
+                    for node_idx, is_verified in zip(node_ids, verdicts):
+                        if is_verified:
+                            mark_verified(all_nodes[node_idx], f"Found in chunk {chunk_idx+1}")
+            
+            for node in all_nodes:
+                if not node.get('verified', False):
+                    verification_stats['not_verified'] += 1
+                    logger.info(
+                        f"{colored('❓ NOT VERIFIED', 'yellow', attrs=['bold'])}: "
+                        f"{node.get('type', 'NODE').upper()} '{node.get('text', '')[:50]}...' "
+                        f"(Not found in top {top_k} chunks)"
+                    )
             
             # Calculate verification percentages
             verification_percentage = (verification_stats['verified'] / verification_stats['total'] * 100) if verification_stats['total'] > 0 else 0
@@ -3973,6 +4239,12 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
             if verified_topics < min_topics_required or verification_percentage < min_verification_ratio * 100:
                 logger.warning(f"Verification would remove too much content (only {verified_topics} topics verified). Using preservation mode.")
                 
+                # Paths under which at least one detail was verified
+                verified_detail_paths = {
+                    tuple(n.get('path', [])) for n in all_nodes
+                    if n.get('type') == 'detail' and n.get('verified', False)
+                }
+                
                 # Mark important structural nodes as verified to preserve mindmap structure
                 for node in all_nodes:
                     # Always keep root and topic nodes
@@ -3981,11 +4253,7 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                     # Keep subtopics with a high enough importance
                     elif node.get('type') == 'subtopic' and not node.get('verified', False):
                         # Keep subtopics if they have verified details or are needed for structure
-                        has_verified_details = any(
-                            n.get('verified', False) and n.get('type') == 'detail' and n.get('path') == node.get('path', []) + [node.get('text', '')]
-                            for n in all_nodes
-                        )
-                        if has_verified_details:
+                        if tuple(node.get('path', []) + [node.get('text', '')]) in verified_detail_paths:
                             node['verified'] = True
                 
                 # Recalculate statistics
@@ -3999,77 +4267,35 @@ JSON 배열만 반환하세요. 텍스트는 매우 간결하게."""
                 logger.info(f"Not verified after preservation: {verification_stats['not_verified']} ({100-verification_percentage:.1f}%)")
                 logger.info("="*80 + "\n")
             
+            # Verification status by node ID, so the rebuild is a dict lookup per node
+            verification_state = {n['node_id']: n.get('verified', False) for n in all_nodes}
+            
             # Rebuild mindmap with preserving structure
             def rebuild_mindmap(node):
-                """Recursively rebuild mindmap keeping only verified nodes."""
+                """Recursively rebuild mindmap keeping only verified nodes (one pass, no deep copies)."""
                 if not node:
                     return None
-                    
-                result = copy.deepcopy(node)
-                result['subtopics'] = []
+                
+                # Shallow copy: the children lists are rebuilt, kept details are shared with the input
+                result = dict(node)
                 
                 # Process subtopics and keep only verified ones
                 verified_subtopics = []
                 for subtopic in node.get('subtopics', []):
-                    if not subtopic.get('name'):
+                    if not subtopic.get('name') or not verification_state.get(id(subtopic), False):
                         continue
-                        
-                    # Check if this subtopic is verified by comparing with stored nodes
-                    subtopic_verified = False
-                    subtopic_id = id(subtopic)
-                    
-                    for n in all_nodes:
-                        # First try to match by direct object reference
-                        if n.get('node_ref') is subtopic and n.get('verified', False):
-                            subtopic_verified = True
-                            break
-                        # Fallback to matching by object ID if reference comparison fails
-                        elif n.get('node_id') == subtopic_id and n.get('verified', False):
-                            subtopic_verified = True
-                            break
-                        # Last resort: match by name and path
-                        elif (n.get('type') in ['topic', 'subtopic'] and 
-                            n.get('text') == subtopic.get('name') and 
-                            n.get('verified', False)):
-                            subtopic_verified = True
-                            break
-                    
-                    if subtopic_verified:
-                        rebuilt_subtopic = rebuild_mindmap(subtopic)
-                        if rebuilt_subtopic:
-                            verified_subtopics.append(rebuilt_subtopic)
+                    rebuilt_subtopic = rebuild_mindmap(subtopic)
+                    if rebuilt_subtopic:
+                        verified_subtopics.append(rebuilt_subtopic)
                 
                 result['subtopics'] = verified_subtopics
                 
                 # Filter details to keep only verified ones
                 if 'details' in result:
-                    verified_details = []
-                    for detail in result.get('details', []):
-                        if not isinstance(detail, dict) or 'text' not in detail:
-                            continue
-                            
-                        # Check if this detail is verified
-                        detail_verified = False
-                        detail_id = id(detail)
-                        
-                        for n in all_nodes:
-                            # First try to match by direct object reference
-                            if n.get('node_ref') is detail and n.get('verified', False):
-                                detail_verified = True
-                                break
-                            # Fallback to matching by object ID
-                            elif n.get('node_id') == detail_id and n.get('verified', False):
-                                detail_verified = True
-                                break
-                            # Last resort: match by text content
-                            elif n.get('type') == 'detail' and n.get('text') == detail.get('text') and n.get('verified', False):
-                                detail_verified = True
-                                break
-                        
-                        if detail_verified:
-                            verified_details.append(detail)
-                    
-                    result['details'] = verified_details
+                    result['details'] = [
+                        detail for detail in node.get('details', [])
+                        if isinstance(detail, dict) and 'text' in detail and verification_state.get(id(detail), False)
+                    ]
                 
                 # Only return node if it has content
                 if result.get('subtopics') or result.get('details'):
@@ -4284,7 +4510,7 @@ async def generate_document_mindmap(document_id: str, request_id: str) -> Tuple[
         Tuple[str, str]: (mindmap_file_path, markdown_file_path)
     """
     try:
-        generator = MindMapGenerator()
+        generator = get_mindmap_generator()
         db = await initialize_db()
         document = await db.get_document_by_id(document_id)
         if not document:
@@ -4392,6 +4618,27 @@ def generate_interactive_html(concepts: Dict[str, Any]) -> str:
     
     return html
 
+# Process-wide generator: the LLM backend and the Weaviate connection are created once and
+# shared by every request (request state is isolated per call, see MindMapRequestState)
+_shared_generator: Optional[MindMapGenerator] = None
+_shared_generator_lock = threading.Lock()
+
+def get_mindmap_generator() -> MindMapGenerator:
+    """Return the shared MindMapGenerator, creating it on first use."""
+    global _shared_generator
+    with _shared_generator_lock:
+        if _shared_generator is None:
+            _shared_generator = MindMapGenerator()
+        return _shared_generator
+
+def shutdown_mindmap_generator() -> None:
+    """Close the shared generator (e.g. on application shutdown)."""
+    global _shared_generator
+    with _shared_generator_lock:
+        generator, _shared_generator = _shared_generator, None
+    if generator is not None:
+        generator.close()
+
 async def process_text_file(filepath: str, max_topics: int = 8):
     """Process a single text file and generate mindmap outputs."""
     logger = get_logger()
@@ -4406,13 +4653,12 @@ async def process_text_file(filepath: str, max_topics: int = 8):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         base_filename = os.path.splitext(os.path.basename(filepath))[0]
         document_id = f"{base_filename}_{content_hash}_{timestamp}"
-        # Initialize the mindmap generator
-        generator = MindMapGenerator()
+        # Reuse the shared mindmap generator
+        generator = get_mindmap_generator()
         # Generate the mindmap with concepts (max_topics 전달)
-        mindmap = await generator.generate_mindmap(content, request_id=document_id, max_topics=max_topics)
-        
-        # Get concepts for interactive HTML (need to store during generation)
-        concepts = getattr(generator, '_last_concepts', None)
+        mindmap, concepts = await generator.generate_mindmap_with_concepts(
+            content, request_id=document_id, max_topics=max_topics
+        )
         
         # Generate HTML outputs
         html = generate_mermaid_html(mindmap)
@@ -4540,19 +4786,16 @@ async def generate_mindmap_for_api(
         # 임시 데이터베이스에 저장
         MinimalDatabaseStub.store_text(document_content)
         
-        # 생성기 초기화
-        generator = MindMapGenerator()
+        # 공유 생성기 사용 (모델/Weaviate 연결은 프로세스당 한 번만 초기화)
+        generator = get_mindmap_generator()
         
-        # 마인드맵 생성 (max_topics 파라미터 전달)
-        mermaid_result = await generator.generate_mindmap(
+        # 마인드맵 생성 (max_topics 파라미터 전달, 요청별 상태는 분리됨)
+        mermaid_result, concepts = await generator.generate_mindmap_with_concepts(
             document_content,
             request_id=request_id or "api_request",
             max_topics=max_topics
         )
         
-        # 개념 추출 (마지막 생성 결과에서)
-        concepts = getattr(generator, '_last_concepts', None)
-        
         # HTML 생성
         html = generate_mermaid_html(mermaid_result)
         interactive_html = generate_interactive_html(concepts) if concepts else html
@@ -0,0 +1,94 @@
+"""
+Near-duplicate candidate generation for mindmap redundancy checks.
+
+Every node text is embedded once with a hashing vectorizer (character 2/3-grams plus
+words, so Korean particles and inflections still overlap), the cosine similarity of all
+texts is computed in one matrix product, and only pairs above a threshold are returned.
+The expensive LLM pairwise check then runs on those candidates instead of on every pair.
+"""
+
+import hashlib
+import re
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+import logging
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger("mindmap_generator")
+
+_whitespace_regex = re.compile(r'\s+')
+_non_word_regex = re.compile(r'[^\w\s]')
+
+
+class HashingEmbedder:
+    """Stateless hashing n-gram embedder (no model, no fitting)."""
+
+    def __init__(self, dimensions: int = 2048, ngram_range: Tuple[int, int] = (2, 3)):
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+
+    def _features(self, text: str) -> List[str]:
+        text = _non_word_regex.sub('', _whitespace_regex.sub(' ', text.lower().strip()))
+        features = text.split()
+        low, high = self.ngram_range
+        for word in features[:]:
+            padded = f" {word} "
+            for n in range(low, high + 1):
+                features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return features
+
+    def _bucket(self, feature: str) -> int:
+        # Stable across processes (built-in hash() is salted per process)
+        digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') % self.dimensions
+
+    def embed(self, texts: Sequence[str]):
+        """L2-normalized sublinear-TF vectors, shape ``(len(texts), dimensions)``."""
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                matrix[row, self._bucket(feature)] += 1.0
+        np.log1p(matrix, out=matrix)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def candidate_pairs(texts: Sequence[str], threshold: float = 0.3, max_neighbors: int = 8,
+                    embed: Optional[Callable[[Sequence[str]], "np.ndarray"]] = None) -> Optional[Set[Tuple[int, int]]]:
+    """
+    Index pairs ``(i, j)`` with ``i < j`` whose texts are close enough to be worth an LLM check.
+
+    Args:
+        texts: Node texts.
+        threshold: Minimum cosine similarity.
+        max_neighbors: Keep at most this many nearest neighbours per text.
+        embed: Optional embedding function (e.g. a local sentence-embedding model) returning
+            L2-normalized rows; defaults to ``HashingEmbedder().embed``.
+
+    Returns:
+        Set of candidate pairs, or None when numpy is unavailable (caller checks every pair).
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    if len(texts) < 2:
+        return set()
+
+    vectors = (embed or HashingEmbedder().embed)(texts)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, -1.0)
+
+    neighbors = min(max_neighbors, len(texts) - 1)
+    # Top-k neighbours per row, then keep those above the threshold
+    nearest = np.argpartition(-similarity, neighbors - 1, axis=1)[:, :neighbors]
+    rows = np.repeat(np.arange(len(texts)), neighbors)
+    cols = nearest.ravel()
+    above = similarity[rows, cols] >= threshold
+    pairs = {(int(min(i, j)), int(max(i, j))) for i, j in zip(rows[above], cols[above])}
+
+    total = len(texts) * (len(texts) - 1) // 2
+    logger.info(f"Near-duplicate candidates: {len(pairs)}/{total} pairs above {threshold:.2f}")
+    return pairs
@@ -0,0 +1,134 @@
+"""
+Tests for FuzzyDedupIndex: block-wise ``dedup`` must keep exactly the names that the
+pairwise ``MindMapGenerator.is_similar_to_existing`` check keeps one name at a time.
+"""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from mindmap import fuzzy_dedup
+from mindmap.fuzzy_dedup import DEDUP_BLOCK_SIZE, FuzzyDedupIndex, normalize
+from mindmap.mindmap_generator import MindMapGenerator
+
+WORDS = ["solar", "wind", "storage", "battery", "grid", "hydrogen", "carbon", "nuclear",
+         "policy", "cost", "demand", "subsidy", "efficiency", "charging", "offshore", "market"]
+
+
+def make_names(count, seed=0):
+    """Names with many near-duplicates (case, punctuation, word order, typos)."""
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        if names and rng.random() < 0.4:
+            name = rng.choice(names)
+            variant = rng.randrange(4)
+            if variant == 0:
+                name = name.upper()
+            elif variant == 1:
+                name = name + "!"
+            elif variant == 2:
+                name = " ".join(reversed(name.split()))
+            else:
+                position = rng.randrange(len(name))
+                name = name[:position] + "x" + name[position + 1:]
+        else:
+            name = " ".join(rng.sample(WORDS, rng.randint(1, 4)))
+            if rng.random() < 0.2:
+                name += " " + " ".join(rng.choice(WORDS) for _ in range(30))
+        names.append(name)
+    return names
+
+
+def pairwise_dedup(names, existing, content_type):
+    """Reference: one is_similar_to_existing call per name against everything kept so far."""
+    generator = MindMapGenerator.__new__(MindMapGenerator)
+    seen = list(existing)
+    kept = []
+
+    async def run():
+        for index, name in enumerate(names):
+            if not await generator.is_similar_to_existing(name, set(seen), content_type):
+                seen.append(name)
+                kept.append(index)
+
+    asyncio.run(run())
+    return kept
+
+
+@pytest.mark.parametrize("content_type", ["topic", "subtopic", "detail"])
+def test_dedup_matches_pairwise_check(content_type):
+    names = make_names(DEDUP_BLOCK_SIZE * 2 + 17)
+    kept = FuzzyDedupIndex(content_type).dedup(names)
+
+    assert kept == pairwise_dedup(names, [], content_type)
+    assert 0 < len(kept) < len(names)
+
+
+def test_dedup_respects_indexed_names():
+    existing = ["Solar storage cost", "Wind grid policy"]
+    names = ["solar storage cost!", "Hydrogen market", "WIND GRID POLICY", "hydrogen markets"]
+    index = FuzzyDedupIndex("topic", existing)
+
+    kept = index.dedup(names)
+
+    assert kept == pairwise_dedup(names, existing, "topic")
+    assert [names[i] for i in kept] == ["Hydrogen market"]
+    assert index.names == existing + ["Hydrogen market"]
+
+
+def test_index_queries():
+    index = FuzzyDedupIndex("subtopic", ["Battery recycling programs"])
+
+    assert index.find_similar("battery recycling program") == "Battery recycling programs"
+    assert index.is_similar("Offshore wind subsidies") is False
+    assert index.add_if_new("Offshore wind subsidies") is True
+    assert index.add_if_new("offshore wind subsidies.") is False
+    assert list(index) == ["Battery recycling programs", "Offshore wind subsidies"]
+    assert FuzzyDedupIndex("detail").find_similar("anything") is None
+
+
+def test_is_similar_to_existing_accepts_an_index():
+    generator = MindMapGenerator.__new__(MindMapGenerator)
+    index = FuzzyDedupIndex("topic", ["Carbon market design"])
+
+    assert asyncio.run(generator.is_similar_to_existing("carbon market design", index, "topic"))
+    assert not asyncio.run(generator.is_similar_to_existing("Nuclear policy", index, "topic"))
+    assert not asyncio.run(generator.is_similar_to_existing("Nuclear policy", {}, "topic"))
+
+
+def test_normalize():
+    assert normalize("  Solar,  Storage!\tCOST ") == "solar storage cost"
+
+
+def test_unknown_content_type():
+    with pytest.raises(ValueError):
+        FuzzyDedupIndex("chapter")
+
+
+def test_fallback_scoring_matches_rapidfuzz(monkeypatch):
+    """The pairwise fallback applies the same rule as the vectorized path."""
+    if not fuzzy_dedup.RAPIDFUZZ_AVAILABLE:
+        pytest.skip("rapidfuzz is not installed")
+    from rapidfuzz import fuzz as rf_fuzz
+
+    class RoundedFuzz:
+        # fuzzywuzzy returns integer ratios
+        ratio = staticmethod(lambda a, b: round(rf_fuzz.ratio(a, b)))
+        partial_ratio = staticmethod(lambda a, b: round(rf_fuzz.partial_ratio(a, b)))
+        token_sort_ratio = staticmethod(lambda a, b: round(rf_fuzz.token_sort_ratio(a, b)))
+        token_set_ratio = staticmethod(lambda a, b: round(rf_fuzz.token_set_ratio(a, b)))
+
+    names = make_names(DEDUP_BLOCK_SIZE + 9, seed=1)
+    expected = {content_type: FuzzyDedupIndex(content_type).dedup(names)
+                for content_type in fuzzy_dedup.BASE_THRESHOLDS}
+
+    monkeypatch.setattr(fuzzy_dedup, "RAPIDFUZZ_AVAILABLE", False)
+    monkeypatch.setattr(fuzzy_dedup, "fuzz", RoundedFuzz, raising=False)
+    for content_type, kept in expected.items():
+        assert FuzzyDedupIndex(content_type).dedup(names) == kept
@@ -0,0 +1,96 @@
+"""
+Tests for BM25ChunkIndex and the lexical pre-pass of the reality check.
+"""
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from mindmap.lexical_index import BM25ChunkIndex, terms
+from mindmap.mindmap_generator import MindMapGenerator
+
+CHUNKS = [
+    "Solar panels convert sunlight into electricity for homes.",
+    "Wind turbines produce electricity offshore and onshore.",
+    "원가관리회계는 제품의 원가를 계산한다.",
+    "Battery storage smooths the output of solar and wind farms.",
+]
+
+
+def test_terms_include_words_and_bigrams():
+    assert terms("Wind, farm!") == ["wind", "farm", "wi", "in", "nd", "fa", "ar", "rm"]
+    assert terms("") == []
+
+
+def test_top_chunks_ranks_best_match_first():
+    index = BM25ChunkIndex(CHUNKS)
+    ranked = index.top_chunks("wind turbines offshore", 2)
+
+    assert len(ranked) == 2
+    assert ranked[0][0] == 1
+    assert ranked[0][1] > ranked[1][1] > 0
+
+
+def test_top_chunks_bounds():
+    index = BM25ChunkIndex(CHUNKS)
+
+    ranked = index.top_chunks("solar", 10)
+    assert {chunk for chunk, _ in ranked[:2]} == {0, 3}
+    # Chunks without a shared term score 0 and keep document order
+    assert ranked[2:] == [(1, 0.0), (2, 0.0)]
+    # k < 1 still returns the best chunk
+    assert len(index.top_chunks("solar", 0)) == 1
+    # Nothing matches: zero scores in document order
+    assert index.top_chunks("zzz", 2) == [(0, 0.0), (1, 0.0)]
+
+
+def test_korean_particles_match_through_bigrams():
+    index = BM25ChunkIndex(CHUNKS)
+    ranked = index.top_chunks("원가관리회계의 제품 원가", 1)
+
+    assert ranked[0][0] == 2
+    assert index.coverage("원가관리회계의 제품 원가", 2) > 0.7
+    assert index.coverage("원가관리회계의 제품 원가", 0) == 0.0
+
+
+def test_coverage():
+    index = BM25ChunkIndex(CHUNKS)
+
+    assert index.coverage("Solar panels convert sunlight", 0) == 1.0
+    assert index.coverage("Solar panels convert sunlight", 1) < 0.5
+    assert index.coverage("", 0) == 0.0
+    assert index.coverage("!!!", 0) == 0.0
+
+
+def test_empty_chunk_list():
+    index = BM25ChunkIndex([])
+
+    assert len(index) == 0
+    assert index.scores("solar") == []
+    assert index.top_chunks("solar", 3) == []
+
+
+def test_reality_check_on_empty_document(caplog):
+    """No chunks: nodes stay unverified without an LLM call or an error."""
+    generator = MindMapGenerator.__new__(MindMapGenerator)
+    prompts = []
+
+    async def complete(prompt, *args, **kwargs):
+        prompts.append(prompt)
+        return "[]"
+
+    generator._retry_generate_completion = complete
+    mindmap = {'central_theme': {'name': 'Energy', 'subtopics': [
+        {'name': 'Solar power', 'subtopics': [], 'details': [{'text': 'Panels on roofs', 'importance': 'high'}]}
+    ]}}
+
+    with caplog.at_level(logging.ERROR, logger="mindmap_generator"):
+        result = asyncio.run(generator.verify_mindmap_against_source(mindmap, ""))
+
+    assert prompts == []
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+    # Nothing verified beyond the preserved structure: the original mindmap is returned
+    assert result is mindmap
@@ -0,0 +1,113 @@
+"""
+Tests for CompletionBatcher: concurrent requests share one generate call, and a failed
+batch is split back into single calls so one bad prompt does not fail its neighbours.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from mindmap.llm_backend import FakeBackend
+from mindmap.llm_batcher import CompletionBatcher
+
+PARAMS = {"temperature": 0.0}
+
+
+def echo(prompt, params):
+    if prompt.startswith("bad"):
+        raise RuntimeError(f"cannot complete {prompt}")
+    return f"answer to {prompt}"
+
+
+async def run_all(batcher, prompts):
+    return await asyncio.gather(*(batcher.generate(prompt, PARAMS) for prompt in prompts),
+                                return_exceptions=True)
+
+
+def test_concurrent_requests_share_one_batch():
+    backend = FakeBackend(echo)
+    batcher = CompletionBatcher(backend, window_ms=5, max_batch_size=32)
+
+    results = asyncio.run(run_all(batcher, ["a", "b", "c"]))
+
+    assert results == ["answer to a", "answer to b", "answer to c"]
+    assert backend.calls == [["a", "b", "c"]]
+    assert batcher.stats == {'requests': 3, 'batches': 1, 'largest_batch': 3}
+
+
+def test_max_batch_size_splits_batches():
+    backend = FakeBackend(echo)
+    batcher = CompletionBatcher(backend, window_ms=50, max_batch_size=2)
+
+    prompts = [f"p{i}" for i in range(5)]
+    results = asyncio.run(run_all(batcher, prompts))
+
+    assert results == [f"answer to p{i}" for i in range(5)]
+    assert sorted(len(call) for call in backend.calls) == [1, 2, 2]
+    assert batcher.stats['largest_batch'] == 2
+
+
+def test_failed_batch_is_retried_one_by_one():
+    backend = FakeBackend(echo)
+    batcher = CompletionBatcher(backend, window_ms=5)
+
+    results = asyncio.run(run_all(batcher, ["a", "bad", "c"]))
+
+    assert results[0] == "answer to a"
+    assert isinstance(results[1], RuntimeError)
+    assert str(results[1]) == "cannot complete bad"
+    assert results[2] == "answer to c"
+    assert backend.calls[0] == ["a", "bad", "c"]
+    assert sorted(backend.calls[1:]) == [["a"], ["bad"], ["c"]]
+    assert batcher.stats == {'requests': 3, 'batches': 4, 'largest_batch': 3}
+
+
+def test_wrong_output_count_is_retried_one_by_one():
+    class ShortBackend(FakeBackend):
+        async def async_generate(self, prompts, sampling_params):
+            outputs = await super().async_generate(prompts, sampling_params)
+            return outputs[:1]
+
+    backend = ShortBackend(echo)
+    batcher = CompletionBatcher(backend, window_ms=5)
+
+    results = asyncio.run(run_all(batcher, ["a", "b"]))
+
+    assert results == ["answer to a", "answer to b"]
+    assert len(backend.calls) == 3
+
+
+def test_single_failure_is_raised_to_caller():
+    batcher = CompletionBatcher(FakeBackend(echo), window_ms=0)
+
+    with pytest.raises(RuntimeError, match="cannot complete bad"):
+        asyncio.run(batcher.generate("bad", PARAMS))
+
+
+def test_sync_engine_runs_in_executor():
+    class SyncEngine:
+        def __init__(self):
+            self.calls = []
+
+        def generate(self, prompts, sampling_params):
+            self.calls.append(list(prompts))
+            return [{"text": prompt.upper()} for prompt in prompts]
+
+    engine = SyncEngine()
+    batcher = CompletionBatcher(engine, window_ms=5)
+
+    assert asyncio.run(run_all(batcher, ["a", "b"])) == ["A", "B"]
+    assert engine.calls == [["a", "b"]]
+
+
+def test_batcher_survives_a_new_event_loop():
+    backend = FakeBackend(echo)
+    batcher = CompletionBatcher(backend, window_ms=5)
+
+    assert asyncio.run(run_all(batcher, ["a"])) == ["answer to a"]
+    assert asyncio.run(run_all(batcher, ["b", "c"])) == ["answer to b", "answer to c"]
+    assert backend.calls == [["a"], ["b", "c"]]
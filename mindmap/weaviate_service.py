@@ -37,25 +37,34 @@ class WeaviateService:
         self.class_name = Config.WEAVIATE_CLASS_NAME
         self._ensure_schema()
 
+    SEGMENT_PROPERTIES = ("text", "segment_id", "source_document")
+
     def _ensure_schema(self):
-        """Creates the 'Segment' class in Weaviate if it doesn't exist."""
-        # Temporarily delete the class to ensure the new schema is applied
+        """Creates the 'Segment' class in Weaviate if it doesn't exist.
+
+        An existing class is kept (other requests may be using it); it is only recreated
+        when it is missing one of ``SEGMENT_PROPERTIES``, i.e. was created by an older schema.
+        """
         if self.client.collections.exists(self.class_name):
-            logger.warning(f"Deleting existing class '{self.class_name}' to apply new schema.")
+            existing = self.client.collections.get(self.class_name).config.get()
+            existing_properties = {prop.name for prop in existing.properties}
+            missing = [name for name in self.SEGMENT_PROPERTIES if name not in existing_properties]
+            if not missing:
+                return
+            logger.warning(f"Class '{self.class_name}' is missing properties {missing}; recreating it with the current schema.")
             self.client.collections.delete(self.class_name)
 
-        if not self.client.collections.exists(self.class_name):
-            logger.info(f"Schema '{self.class_name}' not found. Creating it...")
-            self.client.collections.create(
-                name=self.class_name,
-                vector_index_config=wvc.config.Configure.VectorIndex.hnsw(),
-                properties=[
-                    wvc.config.Property(name="text", data_type=wvc.config.DataType.TEXT),
-                    wvc.config.Property(name="segment_id", data_type=wvc.config.DataType.TEXT, tokenization=Tokenization.WORD),
-                    wvc.config.Property(name="source_document", data_type=wvc.config.DataType.TEXT, tokenization=Tokenization.WORD),
-                ]
-            )
-            logger.info(f"Schema '{self.class_name}' created successfully.")
+        logger.info(f"Schema '{self.class_name}' not found. Creating it...")
+        self.client.collections.create(
+            name=self.class_name,
+            vector_index_config=wvc.config.Configure.VectorIndex.hnsw(),
+            properties=[
+                wvc.config.Property(name="text", data_type=wvc.config.DataType.TEXT),
+                wvc.config.Property(name="segment_id", data_type=wvc.config.DataType.TEXT, tokenization=Tokenization.WORD),
+                wvc.config.Property(name="source_document", data_type=wvc.config.DataType.TEXT, tokenization=Tokenization.WORD),
+            ]
+        )
+        logger.info(f"Schema '{self.class_name}' created successfully.")
 
     def ingest_segments(self, segments: List[Dict[str, Any]], document_name: str):
         """Ingests a list of document segments into Weaviate."""
@@ -110,6 +119,14 @@ class WeaviateService:
         logger.info(f"Created {len(clusters)} simple clusters (fallback mode).")
         return clusters
 
+    def delete_document(self, document_name: str):
+        """Removes every segment ingested for ``document_name`` (request cleanup)."""
+        segments_collection = self.client.collections.get(self.class_name)
+        result = segments_collection.data.delete_many(
+            where=wvc.query.Filter.by_property("source_document").equal(document_name)
+        )
+        logger.info(f"Deleted {getattr(result, 'successful', 0)} segments for document '{document_name}'.")
+
     def close(self):
         """Closes the Weaviate client connection."""
         self.client.close()
@@ -5,13 +5,34 @@ Search Skill Module
 
 from .google_search import GoogleSearchClient
 from .summarizer import Summarizer, simple_summarize
-from .pipeline import search_google, summarize_search_results, search_and_summarize
+from .extractive import extractive_summarize
+try:
+    from llm_engine import EngineManager
+except ImportError:
+    from skill.llm_engine import EngineManager
+from .crawl_scheduler import CrawlScheduler, crawl_results
+from .parse_pool import ParsePool, get_parse_pool
+from .output_store import CrawlOutputStore
+from .pipeline import (
+    search_google, search_google_async, search_google_stream, summarize_search_results,
+    search_and_summarize, search_crawl_summarize_stream
+)
 
 __all__ = [
     'GoogleSearchClient',
     'Summarizer',
     'simple_summarize',
+    'extractive_summarize',
+    'EngineManager',
     'search_google',
+    'search_google_async',
+    'search_google_stream',
     'summarize_search_results',
     'search_and_summarize',
+    'search_crawl_summarize_stream',
+    'CrawlScheduler',
+    'crawl_results',
+    'ParsePool',
+    'get_parse_pool',
+    'CrawlOutputStore',
 ]
@@ -0,0 +1,318 @@
+"""
+Crawl Scheduler
+검색 결과 링크를 사이트별 추출기로 동시에 크롤링하는 비동기 스케줄러
+"""
+import asyncio, time, traceback
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import httpx
+
+from google_search import run_sync
+from http_cache import http_cache
+from parse_pool import PARSE_POOL_ENABLED, get_parse_pool
+from output_store import crawl_output_store
+from util import (
+    title_from_url, site_output_paths, web_output_paths, write_crawl_output,
+    extract_web_markdown, web_error_markdown, web_cache_extra
+)
+from crawler.namuwiki import extract_namuwiki_markdown, namuwiki_output_filename
+from crawler.wikipedia import extract_wikipedia_markdown, wikipedia_output_filename
+from crawler.natenews import extract_natenews_markdown, natenews_output_filename
+
+# 요청 헤더 (기존 크롤러와 동일한 User-Agent)
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+}
+
+# 호스트 접미사 -> 사이트 추출기 이름
+SITE_RULES = [
+    ('namu.wiki', 'namuwiki'),
+    ('wikipedia.org', 'wikipedia'),
+    ('news.nate.com', 'natenews'),
+]
+
+
+def detect_site(url: str) -> str:
+    """
+    URL에 맞는 사이트 추출기 이름 반환 (해당 없으면 'web')
+    """
+    host = (urlparse(url).hostname or '').lower()
+    for suffix, site in SITE_RULES:
+        if host == suffix or host.endswith('.' + suffix):
+            return site
+    return 'web'
+
+
+def parse_page(site: str, html: bytes, result: dict):
+    """
+    HTML을 사이트별 추출기로 마크다운 변환 (CPU 작업, 스레드/프로세스 풀에서 실행)
+
+    Args:
+        site: 사이트 추출기 이름
+        html: 페이지 HTML 바이트
+        result: 검색 결과 ({'title', 'link', 'snippet'})
+
+    Returns:
+        str: 마크다운 (본문을 찾지 못하면 None)
+    """
+    link = result.get('link', '')
+    if site == 'namuwiki':
+        return extract_namuwiki_markdown(html, title_from_url(link))
+    if site == 'wikipedia':
+        return extract_wikipedia_markdown(html)
+    if site == 'natenews':
+        return extract_natenews_markdown(html)
+    return extract_web_markdown(html, result)
+
+
+def markdown_cache_extra(site: str, result: dict) -> str:
+    """마크다운 캐시 키에 포함할 값 (본문 외에 추출 결과에 영향을 주는 값)"""
+    if site == 'namuwiki':
+        return title_from_url(result.get('link', ''))
+    if site == 'web':
+        return web_cache_extra(result)
+    return ''
+
+
+def output_paths_for(site: str, result: dict, output_dir: str) -> list:
+    """
+    사이트별 기존 크롤러와 동일한 저장 경로
+    """
+    link = result.get('link', '')
+    if site == 'namuwiki':
+        return site_output_paths(output_dir, namuwiki_output_filename(title_from_url(link)))
+    if site == 'wikipedia':
+        return site_output_paths(output_dir, wikipedia_output_filename(link))
+    if site == 'natenews':
+        return site_output_paths(output_dir, natenews_output_filename(link))
+    return web_output_paths(output_dir, result.get('title', 'untitled'))
+
+
+class CrawlScheduler:
+    """
+    비동기 크롤링 스케줄러
+
+    - 전체 동시 요청 수와 호스트별 동시 요청 수를 제한
+    - 같은 호스트에 대한 요청 시작 간격(politeness delay) 유지
+    - 다운로드는 이벤트 루프에서, 파싱은 프로세스 풀(parse_pool)에서 수행하여 서로 겹치도록 처리
+    - 페이지가 끝나는 순서대로 결과를 스트리밍
+    """
+
+    def __init__(self, output_dir: str, max_concurrency: int = 8, per_host_limit: int = 2,
+                 politeness_delay: float = 0.5, timeout: float = 10.0, executor=None, parse_pool=None,
+                 output_store=None):
+        """
+        Args:
+            output_dir: 크롤링 결과 저장 디렉토리
+            max_concurrency: 전체 동시 요청 수
+            per_host_limit: 호스트별 동시 요청 수
+            politeness_delay: 같은 호스트 요청 시작 간 최소 간격 (초)
+            timeout: 요청 타임아웃 (초)
+            executor: 파싱 실행기 (지정하면 프로세스 풀 대신 사용)
+            parse_pool: 파싱 프로세스 풀 (기본값: 프로세스 공용 풀)
+            output_store: 결과 저장소 (기본값: 프로세스 공용 저장소, memory 모드이면 디스크에 쓰지 않음)
+        """
+        self.output_dir = output_dir
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.politeness_delay = politeness_delay
+        self.timeout = timeout
+        self.output_store = output_store or crawl_output_store
+        self.executor = executor
+        self.parse_pool = None
+        if executor is None:
+            if parse_pool is not None or PARSE_POOL_ENABLED:
+                self.parse_pool = parse_pool or get_parse_pool()
+            else:
+                # SEARCH_PARSE_POOL=0: 기존과 같이 스레드 풀에서 파싱
+                self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="crawl-parse")
+        self._host_slots = {}
+        self._host_next_start = {}
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_slots[host]
+
+    async def _wait_politeness(self, host: str):
+        """같은 호스트의 이전 요청 시작 후 politeness_delay만큼 대기"""
+        now = time.monotonic()
+        start_at = max(now, self._host_next_start.get(host, now))
+        self._host_next_start[host] = start_at + self.politeness_delay
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str, global_slots: asyncio.Semaphore):
+        """페이지 다운로드 (HTTP 캐시 재검증 포함), CachedResponse 반환"""
+        entry = await asyncio.to_thread(http_cache.lookup, url)
+        if entry[0] is not None and http_cache.is_fresh(entry[1]):
+            return entry[0]
+
+        host = (urlparse(url).hostname or '').lower()
+        # 호스트 슬롯을 먼저 잡아 한 호스트의 대기 요청이 전체 슬롯을 점유하지 않도록 함
+        async with self._host_slot(host):
+            await self._wait_politeness(host)
+            async with global_slots:
+                return await http_cache.afetch(client, url, entry)
+
+    async def _parse(self, site: str, html: bytes, result: dict):
+        """HTML 바이트를 마크다운으로 변환 (프로세스 풀 또는 지정된 실행기)"""
+        if self.parse_pool is not None:
+            return await self.parse_pool.parse(site, html, result)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, parse_page, site, html, result)
+
+    async def _crawl_one(self, client: httpx.AsyncClient, global_slots: asyncio.Semaphore, result: dict) -> dict:
+        link = result.get('link', '')
+        site = detect_site(link)
+        item = {'link': link, 'title': result.get('title', 'untitled'), 'site': site,
+                'path': None, 'content': None, 'error': None}
+
+        try:
+            response = await self._fetch(client, link, global_slots)
+            extra = markdown_cache_extra(site, result)
+            content = await asyncio.to_thread(http_cache.get_markdown, site, response.body_hash, extra)
+            if content is None:
+                content = await self._parse(site, response.content, result)
+                if content is not None:
+                    await asyncio.to_thread(http_cache.put_markdown, site, response.body_hash, content, extra)
+            if content is None:
+                item['error'] = "본문 콘텐츠를 찾을 수 없습니다"
+                return item
+        except Exception as e:
+            print(f"[ERROR] 크롤링 실패 ({link}): {e}")
+            item['error'] = str(e)
+            if site != 'web':
+                return item
+            # 일반 웹 페이지는 기존과 동일하게 스니펫만이라도 저장
+            content = web_error_markdown(result, e)
+
+        try:
+            paths = output_paths_for(site, result, self.output_dir)
+            if self.output_store.in_memory:
+                item['path'] = self.output_store.write(content, paths)
+            else:
+                item['path'] = await asyncio.to_thread(write_crawl_output, content, paths, self.output_store)
+            item['content'] = content
+        except Exception as e:
+            print(f"[ERROR] 크롤링 결과 저장 실패 ({link}): {e}")
+            print(traceback.format_exc())
+            item['error'] = str(e)
+        return item
+
+    def _client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+        return httpx.AsyncClient(headers=DEFAULT_HEADERS, timeout=self.timeout, follow_redirects=True, limits=limits)
+
+    async def crawl(self, results: list):
+        """
+        검색 결과를 동시에 크롤링하고 끝나는 순서대로 반환
+
+        Args:
+            results: search_google 결과 리스트
+
+        Yields:
+            dict: {'link', 'title', 'site', 'path', 'content', 'error'}
+        """
+        results = [r for r in results if r.get('link')]
+        if not results:
+            return
+
+        print(f"[INFO] 크롤링 시작 - {len(results)}개 페이지 (동시 {self.max_concurrency}, 호스트별 {self.per_host_limit})")
+        global_slots = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._client() as client:
+            tasks = [asyncio.create_task(self._crawl_one(client, global_slots, r)) for r in results]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    item = await next_done
+                    status = "완료" if item['error'] is None else "실패"
+                    print(f"[INFO] 크롤링 {status}: {item['link']}")
+                    yield item
+            finally:
+                for task in tasks:
+                    task.cancel()
+                if self.parse_pool is not None:
+                    print(f"[INFO] 파싱 풀 상태: {self.parse_pool.health()}")
+
+    async def crawl_stream(self, source, max_pending: int = None):
+        """
+        비동기로 들어오는 검색 결과를 받는 즉시 크롤링하고 끝나는 순서대로 반환
+
+        진행 중인 크롤링이 max_pending개에 도달하면 source에서 다음 결과를 가져오지 않으므로
+        (backpressure) 검색 단계가 크롤링보다 너무 앞서 나가지 않습니다.
+
+        Args:
+            source: 검색 결과 비동기 이터레이터 (예: search_google_stream)
+            max_pending: 동시에 진행할 최대 크롤링 수 (기본값: max_concurrency * 2)
+
+        Yields:
+            dict: {'link', 'title', 'site', 'path', 'content', 'error'}
+        """
+        max_pending = max_pending or self.max_concurrency * 2
+        global_slots = asyncio.Semaphore(self.max_concurrency)
+        source = source.__aiter__()
+        pending = set()
+        pull = None
+        exhausted = False
+
+        async with self._client() as client:
+            try:
+                while True:
+                    if pull is None and not exhausted and len(pending) < max_pending:
+                        pull = asyncio.ensure_future(source.__anext__())
+                    waiting = pending | ({pull} if pull is not None else set())
+                    if not waiting:
+                        break
+
+                    done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                    if pull in done:
+                        try:
+                            result = pull.result()
+                            if result.get('link'):
+                                pending.add(asyncio.create_task(self._crawl_one(client, global_slots, result)))
+                        except StopAsyncIteration:
+                            exhausted = True
+                        pull = None
+
+                    for task in done & pending:
+                        pending.discard(task)
+                        item = task.result()
+                        status = "완료" if item['error'] is None else "실패"
+                        print(f"[INFO] 크롤링 {status}: {item['link']}")
+                        yield item
+            finally:
+                if pull is not None:
+                    pull.cancel()
+                for task in pending:
+                    task.cancel()
+
+    async def crawl_all(self, results: list) -> list:
+        """모든 크롤링 결과를 리스트로 반환 (검색 결과 순서 유지)"""
+        items = {item['link']: item async for item in self.crawl(results)}
+        return [items[r['link']] for r in results if r.get('link') in items]
+
+    def shutdown(self):
+        """파싱 실행기 종료 (공용 프로세스 풀은 다음 크롤링에서 재사용하므로 유지)"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+
+def crawl_results(results: list, output_dir: str, **kwargs) -> list:
+    """
+    검색 결과 크롤링 (동기 래퍼)
+
+    Args:
+        results: search_google 결과 리스트
+        output_dir: 크롤링 결과 저장 디렉토리
+        **kwargs: CrawlScheduler 옵션
+
+    Returns:
+        list: 크롤링 결과 리스트
+    """
+    scheduler = CrawlScheduler(output_dir, **kwargs)
+    try:
+        return run_sync(scheduler.crawl_all(results))
+    finally:
+        scheduler.shutdown()
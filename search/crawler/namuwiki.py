@@ -1,8 +1,10 @@
-import requests, argparse, time, re, os, hashlib, traceback
+import requests, argparse, time, re, traceback
 from urllib.parse import urlparse, unquote
 from markdownify import markdownify as md
 from bs4 import BeautifulSoup
-from util import request_url, find_table_and_remove_style
+from util import request_url, find_table_and_remove_style, shorten_title, site_output_paths, write_crawl_output
+from http_cache import http_cache
+from html_extract import use_fast_backend, namuwiki_article_text
 
 
 # 정규식 패턴: HTML에서 제거 후 남은 텍스트 잔여물 처리용
@@ -25,104 +27,129 @@ NAMU_CLEAN_PATTERNS = re.compile(
     flags=re.DOTALL | re.MULTILINE # 여러 줄에 걸친 패턴 및 라인 시작(^) 처리
 )
 
+# "에서 넘어옴"이 없는 문서용 패턴 (결과는 같음)
+# ".*?에서 넘어옴"은 매칭되지 않을 때도 모든 위치에서 문서 끝까지 탐색하므로(O(n^2)) 미리 제외
+NAMU_CLEAN_PATTERNS_NO_REDIRECT = re.compile(
+    NAMU_CLEAN_PATTERNS.pattern.replace(r".*?에서 넘어옴|", ""),
+    flags=re.DOTALL | re.MULTILINE
+)
+
+def extract_namuwiki_markdown(html, title: str):
+    """
+    나무위키 HTML에서 본문을 추출하여 마크다운으로 변환 (네트워크/파일 I/O 없음)
+
+    Args:
+        html: 페이지 HTML (bytes 또는 str)
+        title: 문서 제목
+
+    Returns:
+        str: 마크다운 문자열 (본문을 찾지 못하면 None)
+    """
+    # lxml 빠른 경로 (한 번의 순회로 제거 대상 건너뛰기 + 텍스트 수집)
+    if use_fast_backend():
+        article_text = namuwiki_article_text(html)
+        if article_text is None:
+            print("[WARNING] 본문 콘텐츠('div.a2-QXwj\\+.uAm4KzJH')를 찾을 수 없습니다.")
+            return None
+        return clean_namuwiki_text(article_text, title)
+
+    # BeautifulSoup 경로 (SEARCH_HTML_BACKEND=bs4 또는 lxml 미설치)
+    soup = BeautifulSoup(html, 'lxml')
+
+    # 2. 본문 콘텐츠 추출
+    article = soup.select_one("div.a2-QXwj\\+.uAm4KzJH") # JoGBTQdA.M09iyvKq, kG-54h5\\+._0KZTdzFT
+    if not article:
+        print("[WARNING] 본문 콘텐츠('div.a2-QXwj\\+.uAm4KzJH')를 찾을 수 없습니다.")
+        return None
+
+    # 3. HTML 단계에서 모든 불필요한 요소 제거 (가장 안정적인 방식)
+    selectors_to_remove = [
+        '.wiki-macro-toc',          # 목차
+        '.wiki-edit-section',       # 편집 버튼
+        'div.wiki-macro-footnote',  # 각주
+        'div.wiki-category',        # 분류
+        'dl.wiki-folding',          # [펼치기·접기]가 포함된 접힘 메뉴
+        'img',                      # 모든 이미지 태그 (data:image 포함)
+        'iframe',                   # 유튜브 등 외부 콘텐츠 프레임
+        # 'table',                    # 모든 테이블 제거
+        'noscript',                 # noscript 태그 제거
+        'style',                    # 스타일 태그 제거
+        'script',                   # 스크립트 태그 제거
+        'svg',                      # SVG 태그 제거
+        'lite-youtube'              # 유튜브 임베드 제거
+    ]
+    for selector in selectors_to_remove:
+        for element in article.select(selector):
+            element.decompose()
+
+    # 3-1. 모든 하이퍼링크 제거 (텍스트는 유지)
+    for a_tag in article.find_all('a'):
+        a_tag.unwrap()
+        
+    # 3-2. 모든 HTML 태그의 속성 제거 (텍스트만 유지)
+    for tag in article.find_all(True):
+        # 태그의 모든 속성을 복사하여 순회합니다. (원본을 수정하면서 순회하면 에러 발생)
+        # list(tag.attrs)를 통해 복사본을 만듭니다.
+        for attr in list(tag.attrs):
+            # 모든 속성 제거
+            del tag[attr]
+            
+    # 3-3. 모든 HTML 태그를 텍스트로 변환 (태그 구조 제거)
+    for tag in article.find_all(['div', 'span', 'strong', 'ruby', 'rt', 'rp', 'dl', 'dt', 'dd', 'br']):
+        tag.unwrap()
+
+
+    # 5. 텍스트로 변환 및 최종 정규식 정리
+    article_text = article.get_text(separator='\n', strip=True)
+    
+    return clean_namuwiki_text(article_text, title)
+
+def clean_namuwiki_text(article_text: str, title: str) -> str:
+    """
+    추출된 나무위키 본문 텍스트의 잔여물 정리 및 제목 추가
+    """
+    # 최적화된 단일 정규식으로 텍스트 잔여물 정리
+    patterns = NAMU_CLEAN_PATTERNS if "에서 넘어옴" in article_text else NAMU_CLEAN_PATTERNS_NO_REDIRECT
+    clean_text = patterns.sub('\n\n', article_text).strip()
+    clean_text = re.sub(r'\n{3,}', '\n\n', clean_text).strip() # 여러 줄바꿈을 2개로
+    
+    # 추가 정리: 빈 줄 제거 및 특수 문자 정리
+    clean_text = re.sub(r'\[\d+\]', '', clean_text)  # 각주 번호 제거
+    clean_text = re.sub(r'\s*\n\s*', '\n', clean_text)  # 줄바꿈 주변 공백 제거
+    
+    # 최종 텍스트 설정
+    final_content = f"# {title}\n\n{clean_text}"
+
+    # 7. 페이지 제목 추가
+    final_content = f"# {title}\n\n{final_content}"
+    return final_content
+
+def namuwiki_output_filename(title: str) -> str:
+    """나무위키 크롤링 결과 파일명"""
+    return f"{shorten_title(title)}_나무.md"
+
 def crawl_namuwiki_page(url: str, output_dir: str = "./"):
     """
     (최종 클리닝 버전)
     모든 이미지 및 UI 요소를 제거하고, 테이블은 완벽히 보존하는 나무위키 크롤러.
     """
     try:
-        # 1. URL 크롤링 및 lxml 파서 사용
+        # 1. URL 크롤링
         response, title = request_url(url)
         if response is None:
             print(f"[ERROR] URL에 접근할 수 없습니다: {url}")
             return None
-        soup = BeautifulSoup(response.text, 'lxml')
 
-        # 2. 본문 콘텐츠 추출
-        article = soup.select_one("div.a2-QXwj\\+.uAm4KzJH") # JoGBTQdA.M09iyvKq, kG-54h5\\+._0KZTdzFT
-        if not article:
-            print("[WARNING] 본문 콘텐츠('div.a2-QXwj\\+.uAm4KzJH')를 찾을 수 없습니다.")
+        # 2~7. 본문 추출 및 정리
+        final_content = http_cache.cached_extract(
+            'namuwiki', response, lambda: extract_namuwiki_markdown(response.content, title), extra=title
+        )
+        if final_content is None:
             return None
 
-        # 3. HTML 단계에서 모든 불필요한 요소 제거 (가장 안정적인 방식)
-        selectors_to_remove = [
-            '.wiki-macro-toc',          # 목차
-            '.wiki-edit-section',       # 편집 버튼
-            'div.wiki-macro-footnote',  # 각주
-            'div.wiki-category',        # 분류
-            'dl.wiki-folding',          # [펼치기·접기]가 포함된 접힘 메뉴
-            'img',                      # 모든 이미지 태그 (data:image 포함)
-            'iframe',                   # 유튜브 등 외부 콘텐츠 프레임
-            # 'table',                    # 모든 테이블 제거
-            'noscript',                 # noscript 태그 제거
-            'style',                    # 스타일 태그 제거
-            'script',                   # 스크립트 태그 제거
-            'svg',                      # SVG 태그 제거
-            'lite-youtube'              # 유튜브 임베드 제거
-        ]
-        for selector in selectors_to_remove:
-            for element in article.select(selector):
-                element.decompose()
-
-        # 3-1. 모든 하이퍼링크 제거 (텍스트는 유지)
-        for a_tag in article.find_all('a'):
-            a_tag.unwrap()
-            
-        # 3-2. 모든 HTML 태그의 속성 제거 (텍스트만 유지)
-        for tag in article.find_all(True):
-            # 태그의 모든 속성을 복사하여 순회합니다. (원본을 수정하면서 순회하면 에러 발생)
-            # list(tag.attrs)를 통해 복사본을 만듭니다.
-            for attr in list(tag.attrs):
-                # 모든 속성 제거
-                del tag[attr]
-                
-        # 3-3. 모든 HTML 태그를 텍스트로 변환 (태그 구조 제거)
-        for tag in article.find_all(['div', 'span', 'strong', 'ruby', 'rt', 'rp', 'dl', 'dt', 'dd', 'br']):
-            tag.unwrap()
-
-
-        # 5. 텍스트로 변환 및 최종 정규식 정리
-        article_text = article.get_text(separator='\n', strip=True)
-        
-        # 최적화된 단일 정규식으로 텍스트 잔여물 정리
-        clean_text = NAMU_CLEAN_PATTERNS.sub('\n\n', article_text).strip()
-        clean_text = re.sub(r'\n{3,}', '\n\n', clean_text).strip() # 여러 줄바꿈을 2개로
-        
-        # 추가 정리: 빈 줄 제거 및 특수 문자 정리
-        clean_text = re.sub(r'\[\d+\]', '', clean_text)  # 각주 번호 제거
-        clean_text = re.sub(r'\s*\n\s*', '\n', clean_text)  # 줄바꿈 주변 공백 제거
-        
-        # 최종 텍스트 설정
-        final_content = f"# {title}\n\n{clean_text}"
-
-        # 7. 페이지 제목 추가
-        final_content = f"# {title}\n\n{final_content}"
-
-        # 8. 파일 저장
+        # 8. 파일 저장 (output_dir + OCR 결과 디렉토리)
         # output_folder = os.path.join(output_dir, '1.namuwiki')
-        os.makedirs(output_dir, exist_ok=True)
-        safe_title = re.sub(r'[\/*?:"<>|]', "_", title)
-        
-        # 한글 파일명 길이 제한 및 해시 추가로 고유성 확보
-        if len(safe_title) > 10:  # 한글은 글자당 3바이트이므로 길이 제한 확대
-            # 한글 인코딩 고려하여 앞부분 추출
-            short_title = safe_title[:8]  # 한글 2-3글자 정도
-            # 원본 제목의 해시값 추가하여 구분성 확보
-            hash_suffix = hashlib.md5(safe_title.encode()).hexdigest()[:4]
-            safe_title = f"{short_title}_{hash_suffix}"
-            
-        output_path = os.path.join(output_dir, f"{safe_title}_나무.md")
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(final_content)
-        
-        # OCR 결과 디렉토리에도 동일한 파일 저장
-        ocr_results_dir = os.path.join(os.path.dirname(output_dir), 'Results', '3.OCR_results')
-        os.makedirs(ocr_results_dir, exist_ok=True)
-        ocr_file_path = os.path.join(ocr_results_dir, f"{safe_title}_나무.md")
-        
-        with open(ocr_file_path, "w", encoding="utf-8") as f:
-            f.write(final_content)
+        output_path = write_crawl_output(final_content, site_output_paths(output_dir, namuwiki_output_filename(title)))
         
         print(f"\n✅ 성공! '{output_path}' 파일이 저장되었습니다.")
         return output_path
@@ -1,8 +1,10 @@
-import requests, argparse, traceback, re, os, hashlib
+import requests, argparse, traceback, re
 from urllib.parse import urlparse, unquote
 from markdownify import markdownify as md
 from bs4 import BeautifulSoup
-from util import request_url, find_table_and_remove_style
+from util import request_url, find_table_and_remove_style, shorten_title, site_output_paths, write_crawl_output
+from http_cache import http_cache
+from html_extract import use_fast_backend, mediawiki_article_html
 
 # 정규식 패턴: 링크 제거는 BeautifulSoup이 처리하므로 관련 규칙 삭제
 CLEAN_PATTERNS = re.compile(
@@ -13,91 +15,108 @@ CLEAN_PATTERNS = re.compile(
     r"\n{3,}"                    # 3번 이상의 연속된 개행을 2번으로
 )
 
+def extract_wikipedia_markdown(html):
+    """
+    위키피디아 HTML에서 본문을 추출하여 마크다운으로 변환 (네트워크/파일 I/O 없음)
+
+    Args:
+        html: 페이지 HTML (bytes 또는 str)
+
+    Returns:
+        str: 마크다운 문자열 (본문을 찾지 못하면 None)
+    """
+    if use_fast_backend():
+        return _extract_fast(html)
+
+    soup = BeautifulSoup(html, 'lxml')
+
+    # 2. 본문 콘텐츠 추출
+    article = soup.select_one("#mw-content-text .mw-parser-output")
+    if not article:
+        print("[WARNING] 본문 콘텐츠('#mw-content-text .mw-parser-output')를 찾을 수 없습니다.")
+        return None
+
+    # 3. HTML 단계에서 모든 불필요한 요소 제거
+    # 3-1. 사이드바, 편집 버튼 등 제거
+    for element in article.select('.sidebar, .mw-editsection, .thumbcaption .magnify, .noprint, .catlinks, #toc, span[typeof]'):
+        element.decompose()
+
+    # 3-2. (핵심) 모든 하이퍼링크 제거 (텍스트는 유지)
+    for a_tag in article.find_all('a'):
+        a_tag.unwrap()
+        
+    # 3-3. 테이블 처리 - 테이블을 텍스트로 변환하기 위한 전처리
+    for table in article.find_all('table'):
+        # 테이블 내 모든 태그의 속성 제거
+        for tag in table.find_all(True):
+            for attr in list(tag.attrs):
+                del tag[attr]
+        
+        # 테이블 내 불필요한 태그 unwrap
+        for tag in table.find_all(['span', 'div', 'strong', 'em', 'i', 'b']):
+            tag.unwrap()
+
+    # 4. 모든 HTML을 마크다운으로 변환 (테이블 포함)
+    article_html = str(article)
+    article_md = md(article_html, heading_style="ATX")
+    clean_md = CLEAN_PATTERNS.sub('\n\n', article_md).strip()
+    
+    # 5. 추가 정리: 각주 번호 제거 및 여러 줄바꿈 정리
+    clean_md = re.sub(r'\[\d+\]', '', clean_md)  # 각주 번호 제거
+    clean_md = re.sub(r'\n{3,}', '\n\n', clean_md)  # 여러 줄바꿈을 2개로
+    
+    # 6. 최종 텍스트 설정
+    final_content = clean_md
+
+    # 7. 페이지 제목 추가
+    page_title = soup.select_one("#firstHeading")
+    if page_title:
+        final_content = f"# {page_title.get_text(strip=True)}\n\n{final_content}"
+
+    return final_content.strip()
+
+def _extract_fast(html):
+    """lxml 빠른 경로 (정리는 한 번의 순회로, 마크다운 변환 이후는 BeautifulSoup 경로와 동일)"""
+    article_html, page_title = mediawiki_article_html(html)
+    if article_html is None:
+        print("[WARNING] 본문 콘텐츠('#mw-content-text .mw-parser-output')를 찾을 수 없습니다.")
+        return None
+
+    article_md = md(article_html, heading_style="ATX")
+    clean_md = CLEAN_PATTERNS.sub('\n\n', article_md).strip()
+    clean_md = re.sub(r'\[\d+\]', '', clean_md)  # 각주 번호 제거
+    clean_md = re.sub(r'\n{3,}', '\n\n', clean_md)  # 여러 줄바꿈을 2개로
+
+    final_content = clean_md
+    if page_title:
+        final_content = f"# {page_title}\n\n{final_content}"
+    return final_content.strip()
+
+def wikipedia_output_filename(url: str) -> str:
+    """위키피디아 크롤링 결과 파일명 (URL 마지막 경로 기반)"""
+    return f"{shorten_title(unquote(urlparse(url).path.split('/')[-1]))}_위키.md"
+
 def crawl_wikipedia_page(url: str, output_dir: str = "./"):
     """
     (최종 안정화 버전)
     모든 하이퍼링크를 제거하고, 테이블도 텍스트로 변환하여 깔끔한 마크다운 텍스트만 출력합니다.
     """
     try:
-        # 1. URL 크롤링 및 lxml 파싱
+        # 1. URL 크롤링
         response, _ = request_url(url)
         if response is None:
             print(f"[ERROR] URL에 접근할 수 없습니다: {url}")
             return None
-        soup = BeautifulSoup(response.text, 'lxml')
 
-        # 2. 본문 콘텐츠 추출
-        article = soup.select_one("#mw-content-text .mw-parser-output")
-        if not article:
-            print("[WARNING] 본문 콘텐츠('#mw-content-text .mw-parser-output')를 찾을 수 없습니다.")
+        # 2~7. 본문 추출 및 마크다운 변환
+        final_content = http_cache.cached_extract(
+            'wikipedia', response, lambda: extract_wikipedia_markdown(response.content)
+        )
+        if final_content is None:
             return None
 
-        # 3. HTML 단계에서 모든 불필요한 요소 제거
-        # 3-1. 사이드바, 편집 버튼 등 제거
-        for element in article.select('.sidebar, .mw-editsection, .thumbcaption .magnify, .noprint, .catlinks, #toc, span[typeof]'):
-            element.decompose()
-
-        # 3-2. (핵심) 모든 하이퍼링크 제거 (텍스트는 유지)
-        for a_tag in article.find_all('a'):
-            a_tag.unwrap()
-            
-        # 3-3. 테이블 처리 - 테이블을 텍스트로 변환하기 위한 전처리
-        for table in article.find_all('table'):
-            # 테이블 내 모든 태그의 속성 제거
-            for tag in table.find_all(True):
-                for attr in list(tag.attrs):
-                    del tag[attr]
-            
-            # 테이블 내 불필요한 태그 unwrap
-            for tag in table.find_all(['span', 'div', 'strong', 'em', 'i', 'b']):
-                tag.unwrap()
-
-        # 4. 모든 HTML을 마크다운으로 변환 (테이블 포함)
-        article_html = str(article)
-        article_md = md(article_html, heading_style="ATX")
-        clean_md = CLEAN_PATTERNS.sub('\n\n', article_md).strip()
-        
-        # 5. 추가 정리: 각주 번호 제거 및 여러 줄바꿈 정리
-        clean_md = re.sub(r'\[\d+\]', '', clean_md)  # 각주 번호 제거
-        clean_md = re.sub(r'\n{3,}', '\n\n', clean_md)  # 여러 줄바꿈을 2개로
-        
-        # 6. 최종 텍스트 설정
-        final_content = clean_md
-
-        # 7. 페이지 제목 추가
-        page_title = soup.select_one("#firstHeading")
-        if page_title:
-            final_content = f"# {page_title.get_text(strip=True)}\n\n{final_content}"
-
-        # 8. 파일 저장
-        path = urlparse(url).path
-        title = unquote(path.split('/')[-1])
-        
-        # 한글 파일명 처리 개선
-        safe_title = re.sub(r'[\/*?:"<>|]', "_", title)
-        
-        # 한글 파일명 길이 제한 및 해시 추가로 고유성 확보
-        if len(safe_title) > 10:  # 한글은 글자당 3바이트이므로 길이 제한 확대
-            # 한글 인코딩 고려하여 앞부분 추출
-            short_title = safe_title[:8]  # 한글 2-3글자 정도
-            # 원본 제목의 해시값 추가하여 구분성 확보
-            hash_suffix = hashlib.md5(safe_title.encode()).hexdigest()[:4]
-            safe_title = f"{short_title}_{hash_suffix}"
-        
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, f"{safe_title}_위키.md")
-        
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(final_content.strip())
-        
-        # OCR 결과 디렉토리에도 동일한 파일 저장
-        ocr_results_dir = os.path.join(os.path.dirname(output_dir), 'Results', '3.OCR_results')
-        os.makedirs(ocr_results_dir, exist_ok=True)
-        ocr_file_path = os.path.join(ocr_results_dir, f"{safe_title}_위키.md")
-        
-        with open(ocr_file_path, "w", encoding="utf-8") as f:
-            f.write(final_content.strip())
+        # 8. 파일 저장 (output_dir + OCR 결과 디렉토리)
+        output_path = write_crawl_output(final_content, site_output_paths(output_dir, wikipedia_output_filename(url)))
         
         print(f"\n성공! '{output_path}' 파일이 저장되었습니다.")
         return output_path
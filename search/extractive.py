@@ -0,0 +1,175 @@
+"""
+Extractive Summarizer
+LLM 없이 CPU만으로 동작하는 추출 요약 (TF-IDF + TextRank)
+
+- 한국어 문장 분리 (종결 부호, 줄바꿈, 마크다운 목록/제목 처리)
+- 한글은 음절 bigram, 영문/숫자는 단어 단위로 토큰화 (조사가 붙어도 같은 특징으로 매칭)
+- 문장-특징 행렬을 COO 배열로 만들고 np.bincount로 희소 행렬 곱을 계산하여
+  문장 유사도 행렬(n x n)을 만들지 않고 TextRank를 반복 (반복당 O(nnz))
+"""
+import re
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 문장 종결: 마침표/물음표/느낌표(+닫는 따옴표/괄호) 뒤 공백, 또는 줄바꿈
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?。])\s+|(?<=[.!?。]["\'”’)\]])\s+|\n+')
+# 마크다운 줄머리 기호 (제목, 목록, 인용)
+MARKDOWN_PREFIX = re.compile(r'^\s*(?:#{1,6}\s+|[-*+]\s+|\d+[.)]\s+|>\s*)+')
+TOKEN_PATTERN = re.compile(r'[가-힣]+|[a-zA-Z]+|\d+')
+
+# 요약 후보로 쓰기에 너무 짧은 문장 (문자 수)
+MIN_SENTENCE_CHARS = 10
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+
+def split_sentences(text: str) -> list:
+    """
+    한국어/영어 혼합 텍스트를 문장 단위로 분리
+
+    Args:
+        text: 입력 텍스트 (마크다운 가능)
+
+    Returns:
+        list: 문장 리스트 (원문 순서)
+    """
+    sentences = []
+    for piece in SENTENCE_BOUNDARY.split(text):
+        if not piece:
+            continue
+        piece = MARKDOWN_PREFIX.sub('', piece).strip()
+        # 표 행/구분선과 URL만 있는 줄은 제외
+        if not piece or piece.startswith('|') or piece.startswith('http'):
+            continue
+        sentences.append(piece)
+    return sentences
+
+
+def sentence_features(sentence: str) -> list:
+    """문장 특징 (한글 음절 bigram + 영문/숫자 단어)"""
+    features = []
+    for token in TOKEN_PATTERN.findall(sentence.lower()):
+        if '가' <= token[0] <= '힣':
+            if len(token) == 1:
+                features.append(token)
+            else:
+                features.extend(token[i:i + 2] for i in range(len(token) - 1))
+        elif len(token) > 1:
+            features.append(token)
+    return features
+
+
+def _tfidf(sentences: list):
+    """
+    TF-IDF 행렬 (COO 형식, 행 단위 L2 정규화)
+
+    Returns:
+        tuple: (rows, cols, values, 특징 수)
+    """
+    vocab = {}
+    rows, cols, counts = [], [], []
+    for i, sentence in enumerate(sentences):
+        term_counts = {}
+        for feature in sentence_features(sentence):
+            index = vocab.setdefault(feature, len(vocab))
+            term_counts[index] = term_counts.get(index, 0) + 1
+        rows.extend([i] * len(term_counts))
+        cols.extend(term_counts.keys())
+        counts.extend(term_counts.values())
+
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    n_sentences, n_features = len(sentences), len(vocab)
+
+    document_freq = np.bincount(cols, minlength=n_features)
+    idf = np.log((1 + n_sentences) / (1 + document_freq)) + 1.0
+    values = (1.0 + np.log(np.asarray(counts, dtype=np.float64))) * idf[cols]
+
+    norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=n_sentences))
+    values = values / np.where(norms > 0, norms, 1.0)[rows]
+    return rows, cols, values, n_features
+
+
+def textrank_scores(sentences: list):
+    """
+    문장별 TextRank 점수
+
+    유사도 S = X·Xᵀ - I (X는 정규화된 TF-IDF 행렬)를 직접 만들지 않고
+    S·v = X(Xᵀv) - v 로 계산합니다.
+
+    Returns:
+        np.ndarray: 문장별 점수
+    """
+    n = len(sentences)
+    rows, cols, values, n_features = _tfidf(sentences)
+
+    def similarity_dot(vector):
+        projected = np.bincount(cols, weights=values * vector[rows], minlength=n_features)
+        return np.bincount(rows, weights=values * projected[cols], minlength=n) - vector
+
+    degree = similarity_dot(np.ones(n))
+    # 다른 문장과 겹치는 특징이 없는 문장은 균등하게 분배
+    isolated = degree <= 1e-12
+    degree[isolated] = 1.0
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        weighted = scores / degree
+        spread = similarity_dot(np.where(isolated, 0.0, weighted))
+        dangling = scores[isolated].sum() / n
+        updated = (1 - DAMPING) / n + DAMPING * (spread + dangling)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def extractive_summarize(text: str, max_chars: int = None, ratio: float = 0.3, max_sentences: int = None) -> str:
+    """
+    추출 요약 (중요도가 높은 문장을 골라 원문 순서로 이어 붙임)
+
+    Args:
+        text: 요약할 텍스트
+        max_chars: 요약 최대 문자 수 (기본값: 원문 길이 * ratio)
+        ratio: max_chars가 없을 때 원문 대비 요약 비율
+        max_sentences: 최대 문장 수
+
+    Returns:
+        str: 요약 (문장을 찾지 못하면 빈 문자열)
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("extractive_summarize에는 numpy가 필요합니다")
+    if max_chars is None:
+        max_chars = int(len(text) * ratio)
+
+    # 중복 문장 제거 (검색 결과 여러 개에 같은 문장이 반복되는 경우)
+    sentences, seen = [], set()
+    for sentence in split_sentences(text):
+        key = ' '.join(sentence.split())
+        if len(key) >= MIN_SENTENCE_CHARS and key not in seen:
+            seen.add(key)
+            sentences.append(sentence)
+    if not sentences:
+        return ''
+    if len(sentences) == 1:
+        return sentences[0][:max_chars]
+
+    scores = textrank_scores(sentences)
+
+    selected, used = [], 0
+    for index in np.argsort(-scores, kind='stable'):
+        length = len(sentences[index]) + 1
+        if selected and used + length > max_chars:
+            continue
+        selected.append(int(index))
+        used += length
+        if used >= max_chars or (max_sentences and len(selected) >= max_sentences):
+            break
+
+    return '\n'.join(sentences[i] for i in sorted(selected))[:max_chars]
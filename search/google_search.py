@@ -1,29 +1,205 @@
 """
 Google Search API 불러오는 클래스
 """
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import asyncio
+import random
+import threading
+import time
+import weakref
+from datetime import date
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+# 재시도 대상 HTTP 상태 코드 (쿼터 초과 + 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class _LoopThread:
+    """
+    동기 호출용 백그라운드 이벤트 루프
+
+    동기 search() 호출이 모두 같은 루프(= 같은 keep-alive 연결 풀)를 사용하도록 합니다.
+    """
+
+    _lock = threading.Lock()
+    _loop = None
+
+    @classmethod
+    def get_loop(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="google-search-loop", daemon=True)
+                thread.start()
+                cls._loop = loop
+            return cls._loop
+
+
+def run_sync(coro):
+    """
+    코루틴을 백그라운드 루프에서 실행하고 결과를 기다림
+
+    Args:
+        coro: 실행할 코루틴
+
+    Returns:
+        코루틴 실행 결과
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _LoopThread.get_loop())
+    return future.result()
+
+
+class RateLimiter:
+    """
+    토큰 버킷 방식의 초당 요청 수 제한 (스레드/루프 공용)
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        """
+        Args:
+            rate (float): 초당 허용 요청 수
+            burst (int, optional): 순간 최대 요청 수 (기본값: rate)
+        """
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        토큰 1개를 예약하고 대기해야 할 시간(초)을 반환
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    async def acquire(self):
+        """요청 전 호출 (필요 시 비동기 대기)"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class DailyQuota:
+    """
+    클라이언트 측 일일 요청 한도 (날짜가 바뀌면 초기화)
+    """
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit (int): 하루 최대 요청 수
+        """
+        self.limit = limit
+        self.used = 0
+        self.day = date.today()
+        self._lock = threading.Lock()
+
+    def consume(self) -> bool:
+        """
+        요청 1건 차감
+
+        Returns:
+            bool: 한도 내이면 True
+        """
+        with self._lock:
+            today = date.today()
+            if today != self.day:
+                self.day, self.used = today, 0
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return max(0, self.limit - self.used) if self.day == date.today() else self.limit
+
 
 class GoogleSearchClient:
     """
     Google Custom Search JSON API 클라이언트
     """
 
-    def __init__(self, api_key: str, cx_id: str):
+    # 같은 API 키를 쓰는 클라이언트끼리 속도 제한/쿼터 공유
+    _shared_limits = {}
+    _shared_limits_lock = threading.Lock()
+
+    def __init__(self, api_key: str, cx_id: str, max_retries: int = 3, backoff_factor: float = 0.5,
+                 max_backoff: float = 8.0, qps: float = None, daily_quota: int = None):
         """
         생성자
         Args:
             api_key (str): Google 검색 API 키
             cx_id (str): 검색 엔진 ID (CX)
+            max_retries (int): 429/5xx/네트워크 오류 재시도 횟수
+            backoff_factor (float): 지수 백오프 기본 대기 시간 (초)
+            max_backoff (float): 백오프 최대 대기 시간 (초)
+            qps (float, optional): 초당 최대 요청 수 (None이면 제한 없음)
+            daily_quota (int, optional): 하루 최대 요청 수 (None이면 제한 없음)
         """
         self.api_key = api_key
         self.cx_id = cx_id
         self.base_url = " "
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.rate_limiter, self.quota = self._get_shared_limits(api_key, qps, daily_quota)
 
-    def search(self, query: str, extra_params: dict = None, timeout_config: dict = None) -> dict:
+        # 이벤트 루프별 AsyncClient (AsyncClient는 생성된 루프에서만 사용 가능)
+        self._clients = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def _get_shared_limits(cls, api_key: str, qps: float, daily_quota: int):
+        with cls._shared_limits_lock:
+            rate_limiter, quota = cls._shared_limits.get(api_key, (None, None))
+            if rate_limiter is None and qps:
+                rate_limiter = RateLimiter(qps)
+            if quota is None and daily_quota:
+                quota = DailyQuota(daily_quota)
+            cls._shared_limits[api_key] = (rate_limiter, quota)
+            return rate_limiter, quota
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프의 keep-alive 연결 풀 반환"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                headers={'User-Agent': 'Mozilla/5.0 (compatible; SearchBot/1.0)'},
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+            self._clients[loop] = client
+        return client
+
+    def _retry_delay(self, attempt: int, response: httpx.Response = None) -> float:
         """
-        검색 수행 (연결 관리 개선)
+        재시도 대기 시간 계산 (Retry-After 우선, 없으면 full jitter 지수 백오프)
+        """
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(self.max_backoff, max(0.0, float(retry_after)))
+                except ValueError:
+                    try:
+                        wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                        return min(self.max_backoff, max(0.0, wait))
+                    except (TypeError, ValueError):
+                        pass
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+    async def asearch(self, query: str, extra_params: dict = None, timeout_config: dict = None) -> dict:
+        """
+        비동기 검색 수행 (연결 재사용, 재시도, 속도 제한)
 
         Args:
             query (str): 검색할 쿼리
@@ -44,49 +220,66 @@ class GoogleSearchClient:
         # 타임아웃 설정 (기본값)
         connect_timeout = 10
         read_timeout = 30
-        
+
         if timeout_config:
             connect_timeout = timeout_config.get('connection_timeout', 10)
             read_timeout = timeout_config.get('read_timeout', 30)
 
-        # 세션 생성 및 연결 관리 설정
-        session = requests.Session()
-        
-        # 연결 풀링 비활성화 및 연결 즉시 종료 설정
-        adapter = HTTPAdapter(
-            pool_connections=1,  # 연결 풀 최소화
-            pool_maxsize=1,      # 최대 연결 수 제한
-            max_retries=Retry(total=1, backoff_factor=0.1)
-        )
-        session.mount('https://', adapter)
-        session.mount('http://', adapter)
-        
-        # Connection: close 헤더 추가 (연결 즉시 종료)
-        headers = {
-            'Connection': 'close',
-            'User-Agent': 'Mozilla/5.0 (compatible; SearchBot/1.0)'
-        }
+        timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        client = self._get_client()
 
-        try:
-            response = session.get(
-                self.base_url, 
-                params=params, 
-                timeout=(connect_timeout, read_timeout),
-                headers=headers
-            )
-            response.raise_for_status()
-            result = response.json()
-            
-            # 세션 명시적 종료
-            session.close()
-            
-            return result
-            
-        except requests.exceptions.RequestException as e:
-            print(f"API 요청 중 오류 발생: {e}")
-            # 오류 발생 시도 세션 종료
-            session.close()
-            return None
+        for attempt in range(self.max_retries + 1):
+            if self.quota is not None and not self.quota.consume():
+                print(f"[WARNING] 일일 검색 쿼터 초과 (한도: {self.quota.limit}건)")
+                return None
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+
+            try:
+                response = await client.get(self.base_url, params=params, timeout=timeout)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    print(f"API 요청 중 오류 발생: {e}")
+                    return None
+                delay = self._retry_delay(attempt)
+                print(f"[WARNING] 네트워크 오류, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response)
+                print(f"[WARNING] API 응답 {response.status_code}, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+                continue
+
+            try:
+                response.raise_for_status()
+                return response.json()
+            except (httpx.HTTPStatusError, ValueError) as e:
+                print(f"API 요청 중 오류 발생: {e}")
+                return None
+
+        return None
+
+    def search(self, query: str, extra_params: dict = None, timeout_config: dict = None) -> dict:
+        """
+        검색 수행 (asearch의 동기 래퍼)
+
+        Args:
+            query (str): 검색할 쿼리
+            extra_params (dict, optional): 추가 파라미터
+            timeout_config (dict, optional): 타임아웃 설정
+
+        Returns:
+            dict: 검색 결과 JSON (실패 시 None)
+        """
+        return run_sync(self.asearch(query, extra_params=extra_params, timeout_config=timeout_config))
+
+    async def aclose(self):
+        """현재 이벤트 루프의 연결 풀 종료"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
 
 # --- 사용 예시 ---
 if __name__ == "__main__":
@@ -0,0 +1,212 @@
+"""
+HTML Extract
+사이트 크롤러용 빠른 HTML 추출 엔진 (lxml)
+
+BeautifulSoup 트리를 만든 뒤 선택자마다 전체 트리를 다시 훑는 대신,
+lxml 트리를 한 번 순회하면서 제거/언랩/속성 정리를 함께 처리합니다.
+lxml을 사용할 수 없거나 SEARCH_HTML_BACKEND=bs4이면 기존 BeautifulSoup 경로를 사용합니다.
+"""
+import os
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# 추출 엔진 선택 ('lxml' 또는 'bs4')
+HTML_BACKEND = os.environ.get("SEARCH_HTML_BACKEND", "lxml").lower()
+
+
+def use_fast_backend() -> bool:
+    """lxml 빠른 경로 사용 여부"""
+    return HTML_BACKEND == "lxml" and LXML_AVAILABLE
+
+
+def _parse(html):
+    """bytes/str HTML을 lxml 문서로 파싱 (UTF-8 우선, 실패 시 lxml의 인코딩 감지)"""
+    if isinstance(html, bytes):
+        try:
+            html = html.decode("utf-8")
+        except UnicodeDecodeError:
+            return lxml.html.document_fromstring(html)
+    return lxml.html.document_fromstring(html)
+
+
+def _classes(el) -> set:
+    return set((el.get("class") or "").split())
+
+
+class Selector:
+    """
+    단순 CSS 선택자 매칭 (tag, .class, #id, tag.class, tag[attr], 자손 선택자 'A B')
+    """
+
+    def __init__(self, selector: str):
+        self.parts = [self._parse_simple(part) for part in selector.split()]
+
+    @staticmethod
+    def _parse_simple(simple: str):
+        attr = None
+        if "[" in simple:
+            simple, attr = simple.split("[", 1)
+            attr = attr.rstrip("]")
+        element_id = None
+        if "#" in simple:
+            simple, element_id = simple.split("#", 1)
+        tag, *classes = simple.replace("\\+", "\0").split(".")
+        classes = {c.replace("\0", "+") for c in classes}
+        return (tag.replace("\0", "+") or None, classes, element_id, attr)
+
+    @staticmethod
+    def _match_simple(el, part) -> bool:
+        tag, classes, element_id, attr = part
+        if tag and el.tag != tag:
+            return False
+        if classes and not classes <= _classes(el):
+            return False
+        if element_id and el.get("id") != element_id:
+            return False
+        if attr and el.get(attr) is None:
+            return False
+        return True
+
+    def matches(self, el) -> bool:
+        if not self._match_simple(el, self.parts[-1]):
+            return False
+        # 자손 선택자: 나머지 부분을 조상에서 순서대로 찾음
+        remaining = len(self.parts) - 2
+        ancestor = el.getparent()
+        while remaining >= 0 and ancestor is not None:
+            if self._match_simple(ancestor, self.parts[remaining]):
+                remaining -= 1
+            ancestor = ancestor.getparent()
+        return remaining < 0
+
+
+def _compile(selectors) -> list:
+    if isinstance(selectors, str):
+        selectors = selectors.split(",")
+    return [Selector(s.strip()) for s in selectors if s.strip()]
+
+
+def _find_first(root, selector: str):
+    compiled = Selector(selector)
+    for el in root.iter(etree.Element):
+        if compiled.matches(el):
+            return el
+    return None
+
+
+def _matches_any(el, compiled: list) -> bool:
+    return any(selector.matches(el) for selector in compiled)
+
+
+# ----------------------------------------------------------------------
+# 나무위키
+# ----------------------------------------------------------------------
+
+NAMU_ARTICLE_SELECTOR = "div.a2-QXwj\\+.uAm4KzJH"
+
+NAMU_REMOVE_SELECTORS = _compile([
+    '.wiki-macro-toc', '.wiki-edit-section', 'div.wiki-macro-footnote', 'div.wiki-category',
+    'dl.wiki-folding', 'img', 'iframe', 'noscript', 'style', 'script', 'svg', 'lite-youtube'
+])
+
+
+def namuwiki_article_text(html):
+    """
+    나무위키 본문 텍스트 추출 (BeautifulSoup 경로의 get_text(separator='\\n', strip=True)와 동일한 결과)
+
+    제거 대상 서브트리는 건너뛰고, 나머지 텍스트 노드를 한 번의 순회로 수집합니다.
+    링크 언랩/속성 제거/태그 언랩은 텍스트 결과에 영향을 주지 않으므로 별도 패스가 필요 없습니다.
+
+    Returns:
+        str: 본문 텍스트 (본문을 찾지 못하면 None)
+    """
+    root = _parse(html)
+    article = _find_first(root, NAMU_ARTICLE_SELECTOR)
+    if article is None:
+        return None
+
+    pieces = []
+
+    def add(text):
+        if text:
+            text = text.strip()
+            if text:
+                pieces.append(text)
+
+    def walk(el):
+        add(el.text)
+        for child in el:
+            # 주석/처리 명령은 텍스트에서 제외 (tail은 부모 텍스트)
+            if isinstance(child.tag, str) and not _matches_any(child, NAMU_REMOVE_SELECTORS):
+                walk(child)
+            add(child.tail)
+
+    walk(article)
+    return "\n".join(pieces)
+
+
+# ----------------------------------------------------------------------
+# 위키피디아 / 네이트 뉴스 (MediaWiki 구조)
+# ----------------------------------------------------------------------
+
+MEDIAWIKI_ARTICLE_SELECTOR = "#mw-content-text .mw-parser-output"
+
+MEDIAWIKI_REMOVE_SELECTORS = _compile(
+    '.sidebar, .mw-editsection, .thumbcaption .magnify, .noprint, .catlinks, #toc, span[typeof]'
+)
+
+# 테이블 안에서 언랩할 태그
+MEDIAWIKI_TABLE_UNWRAP_TAGS = {'span', 'div', 'strong', 'em', 'i', 'b'}
+
+
+def mediawiki_article_html(html):
+    """
+    MediaWiki 본문 정리 후 HTML 반환 (markdownify 입력용)
+
+    한 번의 순회로 제거 대상 수집, 링크 언랩, 테이블 내부 속성 제거/태그 언랩을 처리합니다.
+
+    Returns:
+        tuple: (본문 HTML, 페이지 제목) — 본문을 찾지 못하면 (None, None)
+    """
+    root = _parse(html)
+    article = _find_first(root, MEDIAWIKI_ARTICLE_SELECTOR)
+    if article is None:
+        return None, None
+
+    heading = root.get_element_by_id("firstHeading", None)
+    # BeautifulSoup get_text(strip=True)와 동일 (공백 제거한 텍스트 노드를 이어 붙임)
+    page_title = "".join(t.strip() for t in heading.itertext()) if heading is not None else None
+
+    # 선택자 매칭이 조상 속성을 보므로 속성 제거는 순회가 끝난 뒤 적용
+    to_drop, to_unwrap, to_clear = [], [], []
+    stack = [(article, False)]
+    while stack:
+        el, in_table = stack.pop()
+        for child in el:
+            if not isinstance(child.tag, str):
+                continue
+            if _matches_any(child, MEDIAWIKI_REMOVE_SELECTORS):
+                to_drop.append(child)
+                continue
+            child_in_table = in_table or child.tag == "table"
+            if in_table:
+                to_clear.append(child)
+                if child.tag in MEDIAWIKI_TABLE_UNWRAP_TAGS:
+                    to_unwrap.append(child)
+            if child.tag == "a":
+                to_unwrap.append(child)
+            stack.append((child, child_in_table))
+
+    for el in to_drop:
+        el.drop_tree()
+    for el in to_clear:
+        el.attrib.clear()
+    for el in to_unwrap:
+        el.drop_tag()
+
+    return lxml.html.tostring(article, encoding="unicode"), page_title
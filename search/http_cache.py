@@ -0,0 +1,432 @@
+"""
+HTTP Cache
+크롤링 페이지용 디스크 캐시 (조건부 GET 재검증 + 추출된 마크다운 캐시)
+
+- 응답 본문은 URL의 sha256 키로 zlib 압축 저장
+- ETag / Last-Modified로 재검증하여 변경이 없으면(304) 본문을 다시 받지 않음
+- 응답의 Cache-Control을 따름: no-store / Vary: * 는 저장하지 않고, max-age(no-cache는 0)가 있으면 고정 유효 시간 대신 사용
+- 추출된 마크다운은 (본문 해시, 추출기 이름, 추출기 버전) 키로 저장하여 같은 본문은 다시 파싱하지 않음
+- 기본 위치는 사용자별 캐시 디렉토리(권한 0700)이며, 오래된 파일과 용량 초과분은 주기적으로 정리
+"""
+import asyncio, hashlib, json, os, threading, time, zlib
+
+import requests
+
+from html_extract import HTML_BACKEND, use_fast_backend
+
+# 캐시 설정 (환경 변수로 변경 가능)
+# 다른 로컬 사용자가 읽거나 오염시킬 수 없도록 공용 임시 디렉토리가 아닌 사용자별 캐시 디렉토리 사용
+_USER_CACHE_HOME = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+HTTP_CACHE_DIR = os.environ.get("SEARCH_HTTP_CACHE_DIR", os.path.join(_USER_CACHE_HOME, "search_http_cache"))
+HTTP_CACHE_ENABLED = os.environ.get("SEARCH_HTTP_CACHE", "1") != "0"
+# 이 시간(초) 안에 받은 응답은 재검증 없이 사용
+HTTP_CACHE_FRESH_SECONDS = float(os.environ.get("SEARCH_HTTP_CACHE_FRESH_SECONDS", "300"))
+# 정리 기준: 이보다 오래 쓰이지 않은 파일 삭제, 전체 크기가 상한을 넘으면 오래된 파일부터 삭제
+HTTP_CACHE_MAX_AGE_SECONDS = float(os.environ.get("SEARCH_HTTP_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("SEARCH_HTTP_CACHE_MAX_BYTES", str(1024 ** 3)))
+# 정리 작업 최소 간격 (초)
+HTTP_CACHE_PRUNE_INTERVAL = float(os.environ.get("SEARCH_HTTP_CACHE_PRUNE_INTERVAL", "600"))
+
+# 추출 로직이 바뀌면 올려서 기존 마크다운 캐시 무효화
+EXTRACTOR_VERSION = "1"
+
+
+def _sha256(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _cache_control(headers) -> dict:
+    """Cache-Control 헤더 파싱 ({지시어(소문자): 값 또는 None})"""
+    directives = {}
+    for part in (headers.get("Cache-Control") or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip().strip('"') or None
+    return directives
+
+
+def _atomic_write(path: str, data: bytes):
+    """임시 파일에 기록 후 교체 (동시 크롤링 중 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class CachedResponse:
+    """
+    캐시에서 꺼낸 응답 (requests.Response와 같은 방식으로 사용)
+    """
+
+    def __init__(self, url: str, content: bytes, headers: dict = None, status_code: int = 200,
+                 from_cache: bool = False):
+        self.url = url
+        self.content = content
+        self.headers = headers or {}
+        self.status_code = status_code
+        self.from_cache = from_cache
+        self.body_hash = _sha256(content)
+
+    @property
+    def encoding(self) -> str:
+        content_type = self.headers.get("Content-Type", "") or self.headers.get("content-type", "")
+        for part in content_type.split(";"):
+            part = part.strip()
+            if part.lower().startswith("charset="):
+                return part.split("=", 1)[1].strip('"\' ')
+        return "utf-8"
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HTTPCache:
+    """
+    URL 단위 응답 캐시 + 추출 마크다운 캐시
+    """
+
+    # 캐시에 저장할 응답 헤더
+    KEPT_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR, fresh_seconds: float = HTTP_CACHE_FRESH_SECONDS,
+                 max_age_seconds: float = HTTP_CACHE_MAX_AGE_SECONDS, max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 prune_interval: float = HTTP_CACHE_PRUNE_INTERVAL):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리 (없으면 권한 0700으로 생성)
+            fresh_seconds: 재검증 없이 사용할 수 있는 시간 (초)
+            max_age_seconds: 이 시간(초) 동안 갱신되지 않은 파일은 정리 시 삭제
+            max_bytes: 캐시 전체 크기 상한 (바이트)
+            prune_interval: 정리 작업 최소 간격 (초)
+        """
+        self.cache_dir = cache_dir
+        self.fresh_seconds = fresh_seconds
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.prune_interval = prune_interval
+        self._dir_ready = False
+        self._prune_lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def _path(self, kind: str, key: str, ext: str) -> str:
+        return os.path.join(self.cache_dir, kind, key[:2], f"{key}{ext}")
+
+    def _write(self, path: str, data: bytes):
+        """캐시 파일 기록 (첫 기록 시 디렉토리 생성, 주기적으로 정리 시작)"""
+        if not self._dir_ready:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            self._dir_ready = True
+        _atomic_write(path, data)
+        self._maybe_prune()
+
+    # ------------------------------------------------------------------
+    # 정리
+    # ------------------------------------------------------------------
+
+    def _maybe_prune(self):
+        """마지막 정리 후 prune_interval이 지났으면 백그라운드 스레드에서 정리"""
+        now = time.time()
+        if now - self._last_prune < self.prune_interval or not self._prune_lock.acquire(blocking=False):
+            return
+        self._last_prune = now
+
+        def run():
+            try:
+                self.prune()
+            except Exception as e:
+                print(f"[WARN] HTTP 캐시 정리 실패: {e}")
+            finally:
+                self._prune_lock.release()
+
+        threading.Thread(target=run, name="http-cache-prune", daemon=True).start()
+
+    def prune(self) -> int:
+        """
+        오래된 파일과 용량 상한 초과분 삭제
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.max_age_seconds:
+                    try:
+                        os.remove(path)
+                        removed += 1
+                    except OSError:
+                        pass
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            # 오래된 파일부터 삭제하여 상한의 90%까지 줄임
+            target = self.max_bytes * 0.9
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    removed += 1
+                    total -= size
+                except OSError:
+                    pass
+
+        if removed:
+            print(f"[INFO] HTTP 캐시 정리: {removed}개 파일 삭제")
+        return removed
+
+    # ------------------------------------------------------------------
+    # 응답 캐시
+    # ------------------------------------------------------------------
+
+    def lookup(self, url: str):
+        """
+        캐시된 응답 조회
+
+        Returns:
+            tuple: (CachedResponse, 메타데이터) 또는 (None, None)
+        """
+        key = _sha256(url)
+        meta_path = self._path("meta", key, ".json")
+        body_path = self._path("body", key, ".zz")
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                content = zlib.decompress(f.read())
+        except (OSError, ValueError, zlib.error):
+            return None, None
+        return CachedResponse(url, content, meta.get("headers"), from_cache=True), meta
+
+    def is_fresh(self, meta: dict) -> bool:
+        if meta is None:
+            return False
+        return time.time() - meta.get("validated_at", 0) < meta.get("fresh_seconds", self.fresh_seconds)
+
+    def _fresh_seconds(self, directives: dict) -> float:
+        """응답의 유효 시간 (no-cache는 항상 재검증, max-age가 있으면 우선, 없으면 기본값)"""
+        if "no-cache" in directives:
+            return 0.0
+        max_age = directives.get("max-age")
+        if max_age is not None:
+            try:
+                return float(max(0, int(max_age)))
+            except ValueError:
+                pass
+        return self.fresh_seconds
+
+    @staticmethod
+    def is_storable(headers) -> bool:
+        """
+        디스크에 저장해도 되는 응답인지 여부
+
+        사용자별(0700) 캐시이므로 private 응답은 저장하지만, no-store와 Vary: *는 저장하지 않음
+        (그 밖의 Vary는 크롤러가 요청 헤더를 바꾸지 않으므로 URL 키만으로 충분)
+        """
+        if "no-store" in _cache_control(headers):
+            return False
+        return (headers.get("Vary") or "").strip() != "*"
+
+    def _remove(self, url: str):
+        """URL의 캐시 항목 삭제 (이제 저장하면 안 되는 응답의 이전 사본 제거)"""
+        key = _sha256(url)
+        for path in (self._path("meta", key, ".json"), self._path("body", key, ".zz")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def conditional_headers(self, meta: dict) -> dict:
+        """재검증 요청 헤더 (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if not meta:
+            return headers
+        cached_headers = meta.get("headers", {})
+        if cached_headers.get("ETag"):
+            headers["If-None-Match"] = cached_headers["ETag"]
+        if cached_headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+        return headers
+
+    def store(self, url: str, content: bytes, headers) -> CachedResponse:
+        """200 응답 저장 (저장할 수 없는 응답이면 이전 사본만 지우고 그대로 반환)"""
+        kept = {name: headers.get(name) for name in self.KEPT_HEADERS if headers.get(name)}
+        if not self.is_storable(headers):
+            self._remove(url)
+            return CachedResponse(url, content, kept)
+        key = _sha256(url)
+        self._write(self._path("body", key, ".zz"), zlib.compress(content, 6))
+        meta = {"url": url, "headers": kept, "validated_at": time.time(),
+                "fresh_seconds": self._fresh_seconds(_cache_control(headers))}
+        self._write(self._path("meta", key, ".json"), json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        return CachedResponse(url, content, kept)
+
+    def touch(self, url: str, meta: dict, headers=None):
+        """304 응답 시 재검증 시각 갱신 (304에 Cache-Control이 있으면 유효 시간도 갱신)"""
+        if headers is not None and not self.is_storable(headers):
+            self._remove(url)
+            return
+        meta = dict(meta, validated_at=time.time())
+        if headers is not None and headers.get("Cache-Control"):
+            meta["fresh_seconds"] = self._fresh_seconds(_cache_control(headers))
+        key = _sha256(url)
+        self._write(self._path("meta", key, ".json"), json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        # 본문도 최근 사용으로 표시하여 정리 대상에서 제외
+        try:
+            os.utime(self._path("body", key, ".zz"))
+        except OSError:
+            pass
+
+    def fetch(self, url: str, headers: dict = None, timeout=None):
+        """
+        조건부 GET (동기)
+
+        Args:
+            url: 요청 URL
+            headers: 요청 헤더
+            timeout: requests 타임아웃
+
+        Returns:
+            CachedResponse 또는 실패한 requests.Response (raise_for_status로 확인)
+        """
+        cached, meta = self.lookup(url)
+        if cached is not None and self.is_fresh(meta):
+            print(f"[INFO] HTTP 캐시 사용: {url}")
+            return cached
+
+        request_headers = dict(headers or {})
+        request_headers.update(self.conditional_headers(meta))
+        response = requests.get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and cached is not None:
+            print(f"[INFO] HTTP 캐시 재검증 (304): {url}")
+            self.touch(url, meta, response.headers)
+            return cached
+        if response.status_code != 200:
+            return response
+        return self.store(url, response.content, response.headers)
+
+    async def afetch(self, client, url: str, entry: tuple = None):
+        """
+        조건부 GET (비동기, httpx.AsyncClient 사용)
+
+        Args:
+            client: httpx.AsyncClient
+            url: 요청 URL
+            entry: 이미 조회한 lookup() 결과 (없으면 조회)
+
+        Returns:
+            CachedResponse (실패 시 예외)
+        """
+        cached, meta = entry if entry is not None else await asyncio.to_thread(self.lookup, url)
+        if cached is not None and self.is_fresh(meta):
+            return cached
+
+        response = await client.get(url, headers=self.conditional_headers(meta))
+        if response.status_code == 304 and cached is not None:
+            await asyncio.to_thread(self.touch, url, meta, response.headers)
+            return cached
+        response.raise_for_status()
+        return await asyncio.to_thread(self.store, url, response.content, response.headers)
+
+    # ------------------------------------------------------------------
+    # 마크다운 캐시
+    # ------------------------------------------------------------------
+
+    def _markdown_key(self, extractor: str, body_hash: str, extra: str = "") -> str:
+        backend = HTML_BACKEND if use_fast_backend() else "bs4"
+        return _sha256(f"{extractor}\0{EXTRACTOR_VERSION}\0{backend}\0{body_hash}\0{extra}")
+
+    def get_markdown(self, extractor: str, body_hash: str, extra: str = ""):
+        """
+        추출된 마크다운 조회
+
+        Args:
+            extractor: 추출기 이름 (예: 'namuwiki')
+            body_hash: 응답 본문 sha256
+            extra: 본문 외에 추출 결과에 영향을 주는 값 (예: 제목)
+
+        Returns:
+            str: 캐시된 마크다운 (없으면 None)
+        """
+        path = self._path("markdown", self._markdown_key(extractor, body_hash, extra), ".md.zz")
+        try:
+            with open(path, "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except (OSError, zlib.error, UnicodeDecodeError):
+            return None
+
+    def put_markdown(self, extractor: str, body_hash: str, markdown: str, extra: str = ""):
+        """추출된 마크다운 저장"""
+        path = self._path("markdown", self._markdown_key(extractor, body_hash, extra), ".md.zz")
+        self._write(path, zlib.compress(markdown.encode("utf-8"), 6))
+
+    def cached_extract(self, extractor: str, response, extract_fn, extra: str = ""):
+        """
+        마크다운 캐시를 거쳐 추출 실행
+
+        Args:
+            extractor: 추출기 이름
+            response: CachedResponse (body_hash가 없으면 캐시하지 않음)
+            extract_fn: 캐시에 없을 때 호출할 추출 함수 (인자 없음)
+            extra: 추가 캐시 키
+
+        Returns:
+            str: 마크다운 (추출 실패 시 None)
+        """
+        body_hash = getattr(response, "body_hash", None)
+        if body_hash is None:
+            return extract_fn()
+
+        markdown = self.get_markdown(extractor, body_hash, extra)
+        if markdown is not None:
+            print(f"[INFO] 마크다운 캐시 사용: {extractor}")
+            return markdown
+
+        markdown = extract_fn()
+        if markdown is not None:
+            self.put_markdown(extractor, body_hash, markdown, extra)
+        return markdown
+
+
+class _NullCache(HTTPCache):
+    """캐시 비활성화 시 사용 (항상 네트워크 요청, 추출 결과 저장 안 함)"""
+
+    def lookup(self, url: str):
+        return None, None
+
+    def store(self, url: str, content: bytes, headers) -> CachedResponse:
+        return CachedResponse(url, content, dict(headers))
+
+    def touch(self, url: str, meta: dict):
+        pass
+
+    def get_markdown(self, extractor: str, body_hash: str, extra: str = ""):
+        return None
+
+    def put_markdown(self, extractor: str, body_hash: str, markdown: str, extra: str = ""):
+        pass
+
+
+# 프로세스 공용 캐시
+http_cache = HTTPCache() if HTTP_CACHE_ENABLED else _NullCache()
@@ -0,0 +1,208 @@
+"""
+Crawl Output Store
+크롤링 결과 마크다운 저장소 (한 번만 쓰고 나머지 경로는 링크/매니페스트로 연결)
+
+- 대표 경로(output_dir)에만 실제로 기록하고, 보조 경로(Results/3.OCR_results 등)는
+  하드 링크 / 심볼릭 링크 / 매니페스트 항목으로 연결
+- 내용 해시(sha256)로 이미 기록된 파일을 찾아 같은 내용은 다시 쓰지 않음
+- memory 모드에서는 디스크에 쓰지 않고 내용을 메모리에 보관 (요약기로 바로 전달)
+"""
+import hashlib, json, os, shutil, threading
+
+# 보조 경로 연결 방식: hardlink / symlink / manifest / copy / memory
+CRAWL_OUTPUT_MODE = os.environ.get("SEARCH_CRAWL_OUTPUT_MODE", "hardlink").lower()
+
+# manifest 모드에서 보조 디렉토리에 남기는 파일명
+MANIFEST_FILENAME = "crawl_manifest.jsonl"
+
+OUTPUT_MODES = ("hardlink", "symlink", "manifest", "copy", "memory")
+
+
+def _tmp_path(path: str) -> str:
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+class CrawlOutputStore:
+    """
+    크롤링 결과 저장소
+
+    하드 링크로 연결된 파일은 같은 inode를 공유하므로, 한쪽을 직접 수정하면 다른 쪽도 바뀝니다.
+    (새 결과는 항상 임시 파일 + 교체로 기록하므로 저장소를 통한 갱신에는 영향 없음)
+    """
+
+    def __init__(self, mode: str = CRAWL_OUTPUT_MODE):
+        """
+        Args:
+            mode: 보조 경로 연결 방식 (hardlink, symlink, manifest, copy, memory)
+        """
+        if mode not in OUTPUT_MODES:
+            raise ValueError(f"지원하지 않는 저장 방식입니다: {mode} (가능: {', '.join(OUTPUT_MODES)})")
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._blobs = {}    # 내용 해시 -> 해당 내용이 기록된 경로
+        self._written = {}  # 경로 -> (내용 해시, inode, mtime_ns)
+        self._memory = {}   # memory 모드: 경로 -> 내용
+        self._manifested = {}  # manifest 모드: 보조 경로 -> 기록한 내용 해시
+
+    @property
+    def in_memory(self) -> bool:
+        return self.mode == "memory"
+
+    def write(self, content: str, paths: list) -> str:
+        """
+        크롤링 결과 저장
+
+        Args:
+            content: 저장할 마크다운
+            paths: 저장 경로 리스트 (첫 번째가 대표 경로, 나머지는 보조 경로)
+
+        Returns:
+            str: 대표 저장 경로
+        """
+        paths = [str(path) for path in paths]
+        primary = paths[0]
+
+        if self.in_memory:
+            with self._lock:
+                for path in paths:
+                    self._memory[os.path.abspath(path)] = content
+            return primary
+
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        self._write_primary(primary, data, digest)
+
+        for path in paths[1:]:
+            if self.mode == "manifest":
+                self._add_manifest_entry(path, primary, digest)
+            else:
+                self._place_secondary(primary, path)
+        return primary
+
+    def read(self, path: str) -> str:
+        """
+        저장된 결과 읽기 (memory 모드이면 메모리에서, 아니면 디스크에서)
+
+        Args:
+            path: write()가 반환한 경로 또는 보조 경로
+
+        Returns:
+            str: 마크다운
+        """
+        with self._lock:
+            content = self._memory.get(os.path.abspath(path))
+        if content is not None:
+            return content
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def discard(self, path: str):
+        """memory 모드에서 보관 중인 내용 제거 (요약 후 메모리 해제용)"""
+        with self._lock:
+            self._memory.pop(os.path.abspath(path), None)
+
+    # ------------------------------------------------------------------
+    # 대표 경로
+    # ------------------------------------------------------------------
+
+    def _stamp(self, path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _is_current_locked(self, path: str, digest: str) -> bool:
+        """이 저장소가 같은 내용으로 기록한 뒤 바뀌지 않은 파일인지 확인 (self._lock 보유 상태에서 호출)"""
+        record = self._written.get(path)
+        return record is not None and record[0] == digest and record[1:] == self._stamp(path)
+
+    def _is_current(self, path: str, digest: str) -> bool:
+        with self._lock:
+            return self._is_current_locked(path, digest)
+
+    def _existing_blob(self, digest: str, exclude: str):
+        """같은 내용이 이미 기록된 다른 경로 (없거나 바뀌었으면 None)"""
+        with self._lock:
+            source = self._blobs.get(digest)
+            if source is None or source == exclude or not self._is_current_locked(source, digest):
+                return None
+            return source
+
+    def _write_primary(self, path: str, data: bytes, digest: str):
+        if self._is_current(path, digest):
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        # 같은 내용이 이미 있으면 링크로 연결, 아니면 한 번만 기록
+        source = self._existing_blob(digest, path)
+        if source is None or not self._link(source, path, symbolic=False):
+            tmp_path = _tmp_path(path)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        stamp = self._stamp(path)
+        with self._lock:
+            if stamp is not None:
+                self._written[path] = (digest, *stamp)
+            source = self._blobs.get(digest)
+            if source is None or not self._is_current_locked(source, digest):
+                self._blobs[digest] = path
+
+    # ------------------------------------------------------------------
+    # 보조 경로
+    # ------------------------------------------------------------------
+
+    def _link(self, source: str, path: str, symbolic: bool) -> bool:
+        """source를 가리키는 링크를 path에 생성 (기존 파일은 교체), 실패 시 False"""
+        tmp_path = _tmp_path(path)
+        try:
+            if symbolic:
+                os.symlink(os.path.relpath(source, os.path.dirname(path) or "."), tmp_path)
+            else:
+                os.link(source, tmp_path)
+            os.replace(tmp_path, path)
+            return True
+        except OSError:
+            # 다른 파일 시스템(하드 링크 불가) 또는 링크 미지원
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def _place_secondary(self, primary: str, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if self.mode == "hardlink":
+            try:
+                if os.path.samefile(primary, path):
+                    return
+            except OSError:
+                pass
+            if self._link(primary, path, symbolic=False):
+                return
+        elif self.mode == "symlink":
+            if os.path.islink(path) and os.path.realpath(path) == os.path.realpath(primary):
+                return
+            if self._link(primary, path, symbolic=True):
+                return
+
+        # copy 모드 또는 링크 실패 시 복사
+        tmp_path = _tmp_path(path)
+        shutil.copyfile(primary, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _add_manifest_entry(self, path: str, primary: str, digest: str):
+        """보조 디렉토리 매니페스트에 대표 경로 참조 추가"""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        entry = {"path": os.path.basename(path), "target": os.path.abspath(primary), "sha256": digest}
+        with self._lock:
+            if self._manifested.get(path) == digest:
+                return
+            self._manifested[path] = digest
+            with open(os.path.join(directory, MANIFEST_FILENAME), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+# 프로세스 공용 저장소 (write_crawl_output에서 사용)
+crawl_output_store = CrawlOutputStore(CRAWL_OUTPUT_MODE if CRAWL_OUTPUT_MODE in OUTPUT_MODES else "hardlink")
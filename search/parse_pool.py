@@ -0,0 +1,185 @@
+"""
+Parse Pool
+크롤링 페이지 파싱(HTML -> 마크다운)을 별도 프로세스에서 실행하는 공용 프로세스 풀
+
+markdownify, 정리용 정규식, 테이블 변환은 CPU 작업이라 스레드로는 GIL 때문에 병렬화되지 않으므로,
+원본 HTML 바이트를 워커 프로세스로 넘기고 정리된 마크다운만 돌려받습니다.
+"""
+import asyncio, multiprocessing, os, threading, time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+def available_cpus() -> int:
+    """현재 프로세스가 사용할 수 있는 CPU 수 (CPU affinity/cgroup 제한 반영)"""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+# 파싱 워커 수 (기본값: 사용 가능한 CPU 수)
+PARSE_POOL_WORKERS = int(os.environ.get("SEARCH_PARSE_WORKERS", "0")) or available_cpus()
+# 0이면 프로세스 풀 대신 스레드에서 파싱
+PARSE_POOL_ENABLED = os.environ.get("SEARCH_PARSE_POOL", "1") != "0"
+# 워커 시작 방식: 이미 여러 스레드(httpx 루프, 엔진 관리, CUDA)가 돌고 있는 프로세스를
+# fork하면 교착이나 CUDA 오류가 날 수 있으므로 기본값은 spawn ("forkserver"도 가능)
+PARSE_POOL_START_METHOD = os.environ.get("SEARCH_PARSE_START_METHOD", "spawn")
+
+
+def _init_worker():
+    """워커 시작 시 추출기 모듈을 미리 임포트 (첫 페이지 파싱 지연 제거)"""
+    import crawl_scheduler  # noqa: F401
+
+
+def parse_worker(site: str, html: bytes, result: dict):
+    """
+    워커 프로세스에서 실행되는 파싱 함수 (피클 가능하도록 모듈 최상위에 정의)
+
+    Args:
+        site: 사이트 추출기 이름
+        html: 페이지 HTML 바이트
+        result: 검색 결과 ({'title', 'link', 'snippet'})
+
+    Returns:
+        str: 마크다운 (본문을 찾지 못하면 None)
+    """
+    from crawl_scheduler import parse_page
+    return parse_page(site, html, result)
+
+
+class ParsePool:
+    """
+    파싱 전용 프로세스 풀
+
+    - 최초 사용 시 프로세스 풀 생성 (지연 초기화)
+    - 워커가 비정상 종료되어 풀이 깨지면(BrokenProcessPool) 새 풀로 교체 후 1회 재시도
+    - 재시도도 실패하면 현재 프로세스(스레드)에서 파싱
+    """
+
+    def __init__(self, max_workers: int = PARSE_POOL_WORKERS):
+        """
+        Args:
+            max_workers: 워커 프로세스 수
+        """
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "restarts": 0, "fallbacks": 0}
+        self._pending = 0
+        self._busy_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(PARSE_POOL_START_METHOD),
+                    initializer=_init_worker
+                )
+                print(f"[INFO] 파싱 프로세스 풀 시작 - 워커 {self.max_workers}개")
+            return self._executor
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        """깨진 풀 교체 (다른 작업이 이미 교체했으면 그대로 사용)"""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = None
+            self._stats["restarts"] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        print("[WARNING] 파싱 프로세스 풀이 비정상 종료되어 다시 시작합니다.")
+
+    def _count(self, key: str, delta: int = 1):
+        with self._lock:
+            self._stats[key] += delta
+
+    async def parse(self, site: str, html: bytes, result: dict):
+        """
+        페이지 파싱 (워커 프로세스에서 실행)
+
+        Args:
+            site: 사이트 추출기 이름
+            html: 페이지 HTML 바이트
+            result: 검색 결과
+
+        Returns:
+            str: 마크다운 (본문을 찾지 못하면 None)
+        """
+        loop = asyncio.get_running_loop()
+        self._count("submitted")
+        with self._lock:
+            self._pending += 1
+        started = time.monotonic()
+        try:
+            for _ in range(2):
+                executor = self._get_executor()
+                try:
+                    content = await loop.run_in_executor(executor, parse_worker, site, bytes(html), result)
+                    self._count("completed")
+                    return content
+                except BrokenProcessPool:
+                    self._restart(executor)
+
+            # 풀을 다시 만들어도 실패하면 현재 프로세스에서 파싱
+            self._count("fallbacks")
+            content = await asyncio.to_thread(parse_worker, site, html, result)
+            self._count("completed")
+            return content
+        except Exception:
+            self._count("failed")
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._busy_seconds += time.monotonic() - started
+
+    def health(self) -> dict:
+        """
+        풀 상태
+
+        Returns:
+            dict: {'workers', 'alive', 'pending', 'submitted', 'completed', 'failed',
+                   'restarts', 'fallbacks', 'avg_seconds'}
+        """
+        with self._lock:
+            executor = self._executor
+            stats = dict(self._stats)
+            pending = self._pending
+            busy_seconds = self._busy_seconds
+
+        processes = getattr(executor, "_processes", None) or {}
+        finished = stats["completed"] + stats["failed"]
+        return {
+            "workers": self.max_workers,
+            "alive": sum(1 for process in list(processes.values()) if process.is_alive()),
+            "pending": pending,
+            **stats,
+            "avg_seconds": round(busy_seconds / finished, 3) if finished else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """워커 프로세스 종료"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# 프로세스 공용 파싱 풀
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ParsePool:
+    """
+    공용 파싱 풀 반환 (최초 호출 시 생성)
+
+    Returns:
+        ParsePool: 파싱 풀
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ParsePool()
+        return _parse_pool
@@ -2,10 +2,12 @@
 Search Pipeline
 크롤링, 검색, 요약 기능 통합 파이프라인
 """
-import sys, traceback
+import sys, traceback, math, asyncio, time
 from pathlib import Path
-from google_search import GoogleSearchClient
-from util import filter_search_results
+from google_search import GoogleSearchClient, run_sync
+from util import filter_search_results, normalize_url, TTLCache
+from crawl_scheduler import CrawlScheduler
+from output_store import CrawlOutputStore
 from summarizer import Summarizer
 from config import RAGConfig
 from summarizer import simple_summarize
@@ -24,24 +26,57 @@ if str(notebooklm_dir) not in sys.path:
 # 설정 로드
 config = RAGConfig()
 
-def search_google(query: str, num: int = 10, total_result_link: list = None) -> list:
+# 검색 클라이언트 (연결 풀/속도 제한 공유를 위해 프로세스당 1개)
+_search_engine = None
+
+# 페이지 단위 검색 결과 캐시 (같은 쿼리 반복 시 API 쿼터/지연 없음)
+_search_cache = TTLCache(
+    maxsize=getattr(config, 'SEARCH_CACHE_SIZE', 256),
+    ttl=getattr(config, 'SEARCH_CACHE_TTL', 300)
+)
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 쿼리 정규화 (대소문자, 연속 공백 무시)"""
+    return ' '.join(query.lower().split())
+
+
+def get_search_client() -> GoogleSearchClient:
     """
-    구글 검색 엔진을 불러와 구글에서 검색하는 역할을 하는 함수
+    공유 구글 검색 클라이언트 반환 (최초 호출 시 생성)
+
+    Returns:
+        GoogleSearchClient: 검색 클라이언트
+    """
+    global _search_engine
+    if _search_engine is None:
+        _search_engine = GoogleSearchClient(
+            api_key=config.GOOGLE_API_KEY,
+            cx_id=config.GOOGLE_CX_ID,
+            max_retries=getattr(config, 'SEARCH_MAX_RETRIES', 3),
+            qps=getattr(config, 'SEARCH_QPS', None),
+            daily_quota=getattr(config, 'SEARCH_DAILY_QUOTA', None)
+        )
+    return _search_engine
+
+async def search_google_stream(query: str, num: int = 10, total_result_link: list = None):
+    """
+    구글 검색 (페이지 동시 요청 + 결과 스트리밍 버전)
+
+    필요한 페이지 수만큼 한 번에 요청하고, 순위 순서대로 병합하면서 결과를 바로 내보내다가
+    num개가 모이면 남은 요청을 취소합니다.
 
     Args:
         query: 사용자가 검색한 내용
         num: 검색 결과 보여줄 개수
         total_result_link: 이미 가져온 링크들 (중복 제외용)
         
-    Returns:
-        list: 검색 결과 리스트
+    Yields:
+        dict: 검색 결과 ({'title', 'link', 'snippet'}, 순위 순서)
     """
     try:
         # 1. 구글 엔진 가져오기
-        search_engine = GoogleSearchClient(
-            api_key=config.GOOGLE_API_KEY,
-            cx_id=config.GOOGLE_CX_ID
-        )
+        search_engine = get_search_client()
         print(f"[INFO] 구글 검색 진행중... 쿼리: {query}")
         print(f"[INFO] 제외할 링크 수: {len(total_result_link) if total_result_link else 0}개")
         
@@ -51,14 +86,20 @@ def search_google(query: str, num: int = 10, total_result_link: list = None) ->
             'read_timeout': config.SEARCH_READ_TIMEOUT
         }
         
-        def search_google_batch(query, search_num, start_index=0):
+        async def search_google_batch(query, search_num, start_index=0):
             """검색 함수 내부 함수"""
             search_params = {
                 'num': min(search_num, 10),  # 한 번에 최대 10개
                 'start': start_index  # 검색 시작 인덱스
             }
             
-            results = search_engine.search(query, extra_params=search_params, timeout_config=timeout_config)
+            cache_key = (normalize_query(query), start_index, search_params['num'])
+            cached = _search_cache.get(cache_key)
+            if cached is not None:
+                print(f"[INFO] 검색 캐시 사용 (start: {start_index}, {len(cached)}개 결과)")
+                return list(cached)
+            
+            results = await search_engine.asearch(query, extra_params=search_params, timeout_config=timeout_config)
         
             print(f"[DEBUG] API 응답 상태: {type(results)} (start: {start_index}, num: {search_params['num']})")
             
@@ -76,52 +117,118 @@ def search_google(query: str, num: int = 10, total_result_link: list = None) ->
             filtered_results = filter_search_results(results, max_results=search_params['num']) 
             print(f"[INFO] 1차 필터링 완료 - {len(filtered_results) if filtered_results else 0}개 결과")
             
-            return filtered_results if filtered_results else []
+            filtered_results = filtered_results if filtered_results else []
+            _search_cache.set(cache_key, list(filtered_results))
+            return filtered_results
 
-        # 초기 검색 수행
-        all_results = []
-        start_index = 0
+        yielded = 0
+        # 정규화된 링크 집합으로 중복 체크 (제외 링크 + 이미 추가된 결과)
+        seen_links = {normalize_url(link) for link in (total_result_link or [])}
         batch_size = 10
-        max_attempts = 5  # 최대 5번 시도 (최대 50개 검색)
+        max_attempts = 5  # 최대 5페이지 (최대 50개 검색)
         
-        for attempt in range(max_attempts):
-            print(f"[INFO] 검색 시도 {attempt + 1}/{max_attempts} (start: {start_index})")
-            
-            batch_results = search_google_batch(query, batch_size, start_index)
-            
-            if not batch_results:
-                print("[INFO] 더 이상 검색 결과가 없습니다.")
-                break
+        in_flight = {}     # 페이지 번호 -> 요청 Task
+        fetched = {}       # 페이지 번호 -> 결과 (순서대로 병합 대기)
+        next_page = 0      # 다음에 요청할 페이지
+        merged_pages = 0   # 순위 순서대로 병합이 끝난 페이지 수
+        exhausted = False  # 빈 페이지 도달 여부
+        
+        def launch(count):
+            nonlocal next_page
+            for _ in range(max(0, min(count, max_attempts - next_page))):
+                start_index = next_page * batch_size
+                print(f"[INFO] 검색 요청 {next_page + 1}/{max_attempts} (start: {start_index})")
+                in_flight[next_page] = asyncio.create_task(search_google_batch(query, batch_size, start_index))
+                next_page += 1
+        
+        # 첫 요청: 필요한 예상 페이지 수만큼 동시에 요청
+        launch(math.ceil(num / batch_size))
+        
+        try:
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight.values(), return_when=asyncio.FIRST_COMPLETED)
+                for page, task in list(in_flight.items()):
+                    if task in done:
+                        fetched[page] = task.result()
+                        del in_flight[page]
                 
-            # 이미 가져온 링크들 제외하면서 결과 추가
-            unique_results = []
-            for result in batch_results:
-                link = result.get('link')
-                # total_result_link와 이미 추가된 결과에서 중복 체크
-                existing_links = (total_result_link or []) + [r.get('link') for r in all_results]
-                if link not in existing_links:
-                    unique_results.append(result)
+                # 앞 페이지부터 순위 순서대로 병합
+                while merged_pages in fetched and not exhausted and yielded < num:
+                    batch_results = fetched.pop(merged_pages)
+                    merged_pages += 1
                     
-            all_results.extend(unique_results)
-            print(f"[INFO] 이번 배치에서 {len(unique_results)}개 새 결과 추가, 총 {len(all_results)}개")
-            
-            # 원하는 개수에 도달하면 중단
-            if len(all_results) >= num:
-                all_results = all_results[:num]  # 정확히 num개만 자르기
-                break
+                    if not batch_results:
+                        print("[INFO] 더 이상 검색 결과가 없습니다.")
+                        exhausted = True
+                        break
+                    
+                    # 이미 가져온 링크들 제외하면서 결과 추가
+                    unique_results = []
+                    for result in batch_results:
+                        link_key = normalize_url(result.get('link'))
+                        if link_key not in seen_links:
+                            seen_links.add(link_key)
+                            unique_results.append(result)
+                    
+                    unique_results = unique_results[:num - yielded]  # 정확히 num개만 자르기
+                    print(f"[INFO] 이번 배치에서 {len(unique_results)}개 새 결과 추가, 총 {yielded + len(unique_results)}개")
+                    
+                    # 다음 페이지 요청은 계속 진행되는 동안 결과를 바로 전달
+                    for result in unique_results:
+                        yielded += 1
+                        yield result
                 
-            # 다음 배치를 위해 시작 인덱스 업데이트
-            start_index += batch_size
-        
-        final_results = all_results
+                # 원하는 개수에 도달했거나 결과가 끝나면 남은 요청 취소
+                if exhausted or yielded >= num:
+                    break
+                
+                # 요청이 모두 끝났는데 부족하면 지금까지의 페이지당 수율로 다음 요청 수 결정
+                if not in_flight:
+                    per_page = yielded / merged_pages if merged_pages else 0
+                    remaining = num - yielded
+                    launch(math.ceil(remaining / per_page) if per_page > 0 else 1)
+        finally:
+            for task in in_flight.values():
+                task.cancel()
+            if in_flight:
+                print(f"[INFO] 불필요한 검색 요청 {len(in_flight)}건 취소")
+                await asyncio.gather(*in_flight.values(), return_exceptions=True)
         
-        print(f"[INFO] 중복 제거 완료 - {len(final_results)}개 최종 결과 반환")
-        return final_results
+        print(f"[INFO] 중복 제거 완료 - {yielded}개 최종 결과 반환")
         
     except Exception as e:
         print(f"[ERROR] 검색 중 오류 발생: {str(e)}")
         print(f"[ERROR] 상세 오류: {traceback.format_exc()}")
-        return []
+
+
+async def search_google_async(query: str, num: int = 10, total_result_link: list = None) -> list:
+    """
+    구글 검색 (페이지 동시 요청 버전, search_google_stream 결과를 리스트로 반환)
+
+    Args:
+        query: 사용자가 검색한 내용
+        num: 검색 결과 보여줄 개수
+        total_result_link: 이미 가져온 링크들 (중복 제외용)
+        
+    Returns:
+        list: 검색 결과 리스트
+    """
+    return [result async for result in search_google_stream(query, num=num, total_result_link=total_result_link)]
+
+
+def search_google(query: str, num: int = 10, total_result_link: list = None) -> list:
+    """
+    구글 검색 엔진을 불러와 구글에서 검색하는 역할을 하는 함수 (search_google_async의 동기 래퍼)
+
+    Args:
+        query: 사용자가 검색한 내용
+        num: 검색 결과 보여줄 개수
+        total_result_link: 이미 가져온 링크들 (중복 제외용)
+        
+    Returns:
+        list: 검색 결과 리스트
+    """
+    return run_sync(search_google_async(query, num=num, total_result_link=total_result_link))
 
 
 def summarize_search_results(results: list, use_llm: bool = True) -> str:
@@ -150,22 +257,213 @@ def summarize_search_results(results: list, use_llm: bool = True) -> str:
     full_content = "\n".join(content_parts)
     
     if use_llm:
-        # LLM 사용 요약
+        # LLM 사용 요약 (엔진은 EngineManager가 공유/유지하므로 호출마다 다시 로드하지 않음)
         summarizer = Summarizer(model_name=config.SUMMARIZER_MODEL)
         try:
-            summary = summarizer.summarize(full_content)
-            summarizer.cleanup()
-            return summary
+            return summarizer.summarize(full_content)
         except Exception as e:
             print(f"[ERROR] LLM 요약 실패: {e}")
             # 실패 시 간단한 요약으로 폴백
             return simple_summarize(full_content, ratio=0.3)
+        finally:
+            # 엔진 참조만 반환 (유휴 시간이 지나면 해제)
+            summarizer.cleanup()
     else:
         # 간단한 요약
         return simple_summarize(full_content, ratio=0.3)
 
 
-def search_and_summarize(query: str, num_results: int = 10, use_llm: bool = True) -> dict:
+def summarize_page(summarizer, content: str, use_llm: bool = True) -> str:
+    """
+    크롤링한 페이지 1개 요약 (map 단계)
+    
+    Args:
+        summarizer: Summarizer (use_llm=False이면 None)
+        content: 페이지 마크다운
+        use_llm: LLM 사용 여부
+        
+    Returns:
+        str: 페이지 요약
+    """
+    if use_llm:
+        try:
+            return summarizer.summarize(content)
+        except Exception as e:
+            print(f"[ERROR] 페이지 LLM 요약 실패: {e}")
+    return simple_summarize(content, ratio=0.3)
+
+
+def merge_page_summaries(pages: list) -> str:
+    """페이지 요약들을 검색 순위 순서로 합친 reduce 단계 입력"""
+    parts = []
+    for i, page in enumerate(sorted(pages, key=lambda p: p['index']), 1):
+        parts.append(f"{i}. {page['title']}\n{page['summary']}\n출처: {page['link']}\n")
+    return "\n".join(parts)
+
+
+async def search_crawl_summarize_stream(query: str, num_results: int = 10, use_llm: bool = True,
+                                        output_dir: str = None, queue_size: int = None,
+                                        map_concurrency: int = None):
+    """
+    검색 → 크롤링 → 요약 파이프라인 (단계별로 겹쳐서 실행하고 진행 상황을 스트리밍)
+    
+    - 검색 결과 N이 나오는 즉시 크롤링을 시작하고, 그동안 다음 검색 페이지를 계속 가져옴
+    - 페이지 마크다운이 준비되는 즉시 해당 페이지 요약(map) 시작
+    - 단계 사이 큐는 크기가 제한되어 있어 뒤 단계가 밀리면 앞 단계가 대기 (backpressure)
+    - 모든 페이지 요약이 끝나면 순위 순서로 합쳐 최종 요약(reduce)
+    
+    Args:
+        query: 검색 쿼리
+        num_results: 검색 결과 개수
+        use_llm: LLM 사용 여부
+        output_dir: 크롤링 결과 저장 디렉토리 (None이면 디스크에 쓰지 않고 메모리로 전달)
+        queue_size: 단계 사이 큐 크기 (기본값: config.PIPELINE_QUEUE_SIZE 또는 4)
+        map_concurrency: 동시에 요약할 페이지 수 (기본값: config.PIPELINE_MAP_CONCURRENCY 또는 2)
+        
+    Yields:
+        dict: 이벤트
+            - {'type': 'result', 'index', 'title', 'link', 'snippet'}: 검색 결과
+            - {'type': 'page', 'index', 'title', 'link', 'path', 'summary', 'elapsed'}: 페이지 요약
+            - {'type': 'page_error', 'index', 'title', 'link', 'error'}: 크롤링 실패
+            - {'type': 'summary', 'summary', 'count', 'pages', 'time_to_first_summary', 'elapsed'}: 최종 요약
+            - {'type': 'error', 'error'}: 파이프라인 오류
+    """
+    started = time.monotonic()
+    queue_size = queue_size or getattr(config, 'PIPELINE_QUEUE_SIZE', 4)
+    map_concurrency = map_concurrency or getattr(config, 'PIPELINE_MAP_CONCURRENCY', 2)
+    
+    print(f"[INFO] 파이프라인 검색/크롤링/요약 시작: {query} (큐 {queue_size}, 요약 동시 {map_concurrency})")
+    
+    store = CrawlOutputStore("memory") if output_dir is None else None
+    scheduler = CrawlScheduler(output_dir or "", output_store=store)
+    summarizer = Summarizer(model_name=config.SUMMARIZER_MODEL) if use_llm else None
+    
+    events = asyncio.Queue(maxsize=queue_size)  # 호출자에게 전달할 이벤트
+    pages = asyncio.Queue(maxsize=queue_size)   # 크롤링 완료 -> 요약 대기
+    results = []       # 검색 결과 (순위 순서)
+    rank = {}          # 링크 -> 순위
+    summaries = []     # 완료된 페이지 요약
+    first_summary_at = None
+    model_ready = None  # 모델 로드 Task (검색/크롤링과 동시에 로드)
+    done = object()
+    
+    async def searched():
+        search_stream = search_google_stream(query, num=num_results)
+        try:
+            async for result in search_stream:
+                results.append(result)
+                rank[result.get('link')] = len(results)
+                await events.put({'type': 'result', 'index': len(results), **result})
+                yield result
+        finally:
+            await search_stream.aclose()
+    
+    async def crawl_stage():
+        try:
+            async for item in scheduler.crawl_stream(searched(), max_pending=queue_size):
+                await pages.put(item)
+        finally:
+            for _ in range(map_concurrency):
+                await pages.put(None)
+    
+    async def map_worker():
+        nonlocal first_summary_at
+        while True:
+            item = await pages.get()
+            if item is None:
+                return
+            index = rank.get(item['link'], len(rank) + 1)
+            if item['content'] is None:
+                await events.put({'type': 'page_error', 'index': index, 'title': item['title'],
+                                  'link': item['link'], 'error': item['error']})
+                continue
+            
+            if model_ready is not None:
+                await model_ready
+            # 프로세스 내 엔진 호출은 AnswerGenerator가 엔진별 잠금으로 직렬화 (읽기/정리는 워커끼리 겹침)
+            summary = await asyncio.to_thread(summarize_page, summarizer, item['content'], use_llm)
+            if store is not None:
+                store.discard(item['path'])
+            
+            elapsed = time.monotonic() - started
+            if first_summary_at is None:
+                first_summary_at = elapsed
+                print(f"[INFO] 첫 페이지 요약 완료 - {first_summary_at:.2f}초")
+            page = {'index': index, 'title': item['title'], 'link': item['link'],
+                    'path': item['path'] if store is None else None, 'summary': summary}
+            summaries.append(page)
+            await events.put({'type': 'page', **page, 'elapsed': round(elapsed, 2)})
+    
+    async def run_stages():
+        nonlocal model_ready
+        if summarizer is not None:
+            # 여러 요약 작업이 동시에 로드하지 않도록 먼저 한 번 로드
+            model_ready = asyncio.create_task(asyncio.to_thread(summarizer.load))
+        try:
+            await asyncio.gather(crawl_stage(), *(map_worker() for _ in range(map_concurrency)))
+        except Exception as e:
+            print(f"[ERROR] 파이프라인 처리 중 오류 발생: {e}")
+            print(f"[ERROR] 상세 오류: {traceback.format_exc()}")
+            await events.put({'type': 'error', 'error': str(e)})
+        finally:
+            await events.put(done)
+    
+    runner = asyncio.create_task(run_stages())
+    try:
+        while True:
+            event = await events.get()
+            if event is done:
+                break
+            yield event
+        
+        # reduce: 페이지 요약을 순위 순서로 합쳐 최종 요약 (크롤링 결과가 없으면 스니펫 요약)
+        if summaries:
+            merged = merge_page_summaries(summaries)
+            summary = await asyncio.to_thread(summarize_page, summarizer, merged, use_llm)
+        else:
+            summary = await asyncio.to_thread(summarize_search_results, results, use_llm)
+        
+        elapsed = time.monotonic() - started
+        print(f"[INFO] 파이프라인 완료 - 페이지 {len(summaries)}/{len(results)}개, {elapsed:.2f}초")
+        yield {
+            'type': 'summary',
+            'summary': summary,
+            'count': len(results),
+            'pages': sorted(summaries, key=lambda p: p['index']),
+            'time_to_first_summary': round(first_summary_at, 2) if first_summary_at is not None else None,
+            'elapsed': round(elapsed, 2)
+        }
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        scheduler.shutdown()
+        if summarizer is not None:
+            summarizer.cleanup()
+
+
+async def _collect_pipeline(query: str, num_results: int, use_llm: bool, output_dir: str = None) -> dict:
+    """search_crawl_summarize_stream 이벤트를 모아 search_and_summarize 결과 형식으로 변환"""
+    results = []
+    final = {}
+    async for event in search_crawl_summarize_stream(query, num_results=num_results, use_llm=use_llm,
+                                                     output_dir=output_dir):
+        if event['type'] == 'result':
+            results.append({key: value for key, value in event.items() if key not in ('type', 'index')})
+        elif event['type'] == 'summary':
+            final = event
+    
+    return {
+        "query": query,
+        "results": results,
+        "summary": final.get('summary', "검색 결과가 없습니다."),
+        "count": len(results),
+        "pages": final.get('pages', []),
+        "time_to_first_summary": final.get('time_to_first_summary')
+    }
+
+
+def search_and_summarize(query: str, num_results: int = 10, use_llm: bool = True,
+                         pipelined: bool = False, output_dir: str = None) -> dict:
     """
     검색 및 요약 통합 함수
     
@@ -173,12 +471,17 @@ def search_and_summarize(query: str, num_results: int = 10, use_llm: bool = True
         query: 검색 쿼리
         num_results: 검색 결과 개수
         use_llm: LLM 사용 여부
+        pipelined: True이면 검색 결과 페이지를 크롤링해 본문을 요약 (search_crawl_summarize_stream)
+        output_dir: pipelined 모드 크롤링 결과 저장 디렉토리 (None이면 메모리로만 전달)
         
     Returns:
         dict: 검색 결과 및 요약
     """
     print(f"[INFO] 검색 및 요약 시작: {query}")
     
+    if pipelined:
+        return run_sync(_collect_pipeline(query, num_results, use_llm, output_dir))
+    
     # 1. 구글 검색
     results = search_google(query, num=num_results)
     
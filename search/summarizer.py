@@ -8,9 +8,17 @@ md_summarizer 없이도 완전히 독립적으로 작동 가능
 """
 
 import sglang as sgl
-import logging, re, json, os, tiktoken, asyncio
+import logging, re, json, os, tiktoken, asyncio, hashlib, threading
+import concurrent.futures
+import contextlib
+from collections import OrderedDict, namedtuple
 from notebooklm.config import RAGConfig
 import torch
+try:
+    from llm_engine import EngineManager, SGLangHTTPEngine
+except ImportError:
+    from skill.llm_engine import EngineManager, SGLangHTTPEngine
+from extractive import extractive_summarize
 
 # 토큰 카운팅을 위한 tiktoken 임포트
 try:
@@ -25,11 +33,60 @@ except ImportError:
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+# 생성 실패 시 반환하는 메시지 접두어
+GENERATION_FAILED_PREFIX = "답변 생성에 실패했습니다:"
+
+# 토큰 수 / 토큰 목록 캐시 (같은 텍스트를 여러 번 토큰화하지 않도록 내용 해시로 저장)
+TOKEN_COUNT_CACHE_SIZE = 4096
+TOKEN_CACHE_SIZE = 4  # 토큰 목록은 크므로 최근 몇 개만 유지
+_token_count_cache = OrderedDict()
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+# 청크 (텍스트, 토큰 수, 원문 내 시작/끝 문자 위치)
+TokenChunk = namedtuple("TokenChunk", ["text", "token_count", "start", "end"])
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _cache_put(cache: OrderedDict, key, value, maxsize: int):
+    with _token_cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
+
+
+def _cache_get(cache: OrderedDict, key):
+    with _token_cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def encode_tokens(text: str) -> list:
+    """텍스트를 토큰화 (최근 결과 재사용, 토큰 수 캐시도 함께 갱신)"""
+    key = _text_key(text)
+    tokens = _cache_get(_token_cache, key)
+    if tokens is None:
+        tokens = TOKENIZER.encode(text)
+        _cache_put(_token_cache, key, tokens, TOKEN_CACHE_SIZE)
+        _cache_put(_token_count_cache, key, len(tokens), TOKEN_COUNT_CACHE_SIZE)
+    return tokens
+
+
 # 토큰 카운팅 및 청킹 유틸리티 함수
 def count_tokens(text: str) -> int:
-    """텍스트의 토큰 수를 계산합니다."""
+    """텍스트의 토큰 수를 계산합니다. (내용 해시로 캐시)"""
     if TOKENIZER:
-        return len(TOKENIZER.encode(text))
+        key = _text_key(text)
+        count = _cache_get(_token_count_cache, key)
+        if count is None:
+            count = len(encode_tokens(text))
+        return count
     else:
         # tiktoken이 없으면 문자 수 기반 추정 (1 토큰 ≈ 4 문자)
         return len(text) // 
@@ -47,20 +104,7 @@ def chunk_text_by_tokens(text: str, max_tokens: int = , overlap_tokens: int = )
         list: 청크 리스트
     """
     if TOKENIZER:
-        tokens = TOKENIZER.encode(text)
-        chunks = []
-        start = 0
-        
-        while start < len(tokens):
-            end = min(start + max_tokens, len(tokens))
-            chunk_tokens = tokens[start:end]
-            chunk_text = TOKENIZER.decode(chunk_tokens)
-            chunks.append(chunk_text)
-            
-            # 오버랩을 고려하여 다음 시작 위치 설정
-            start = end - overlap_tokens if end < len(tokens) else end
-            
-        return chunks
+        return [chunk.text for chunk in iter_token_chunks(text, max_tokens, overlap_tokens)]
     else:
         # tiktoken이 없으면 문자 수 기반 청킹
         max_chars = max_tokens * 
@@ -75,80 +119,157 @@ def chunk_text_by_tokens(text: str, max_tokens: int = , overlap_tokens: int = )
             
         return chunks
 
+def iter_token_chunks(text: str, max_tokens: int, overlap_tokens: int = 0):
+    """
+    텍스트를 한 번만 토큰화하여 청크를 순서대로 생성
+    
+    청크마다 토큰 조각을 다시 디코딩하지 않고, 토큰별 문자 위치로 원문을 잘라 사용합니다.
+    
+    Args:
+        text: 청킹할 텍스트
+        max_tokens: 청크당 최대 토큰 수
+        overlap_tokens: 청크 간 오버랩 토큰 수
+        
+    Yields:
+        TokenChunk: (text, token_count, start, end) - start/end는 원문 문자 위치
+            token_count는 전체 토큰화에서 잘라낸 토큰 수로, 조각만 다시 인코딩한 count_tokens(text)와
+            다를 수 있어(BPE 병합 경계, 잘린 멀티바이트) 공유 토큰 수 캐시에는 넣지 않음
+    """
+    if not TOKENIZER:
+        # tiktoken이 없으면 문자 수 기반 청킹 결과에 위치 정보만 추가
+        position = 0
+        for chunk in chunk_text_by_tokens(text, max_tokens, overlap_tokens):
+            start = text.find(chunk, position)
+            position = start + 1
+            yield TokenChunk(chunk, count_tokens(chunk), start, start + len(chunk))
+        return
+    
+    tokens = encode_tokens(text)
+    decoded, offsets = TOKENIZER.decode_with_offsets(tokens)
+    # 원문과 다르게 디코딩되면(잘못된 서로게이트 등) 위치 대신 토큰 조각 디코딩 사용
+    exact = decoded == text
+    
+    start = 0
+    while start < len(tokens):
+        end = min(start + max_tokens, len(tokens))
+        start_char = offsets[start]
+        end_char = offsets[end] if end < len(tokens) else len(decoded)
+        chunk_text = decoded[start_char:end_char] if exact else TOKENIZER.decode(tokens[start:end])
+        yield TokenChunk(chunk_text, end - start, start_char, end_char)
+        
+        # 오버랩을 고려하여 다음 시작 위치 설정
+        start = end - overlap_tokens if end < len(tokens) else end
+
 
 class AnswerGenerator:
     """MD 문서 요약을 위한 생성기 (SGLang Engine 직접 로드 방식)"""
     
-    def __init__(self, model_name: str = "Model NAME"):
+    def __init__(self, model_name: str = "Model NAME", backend: str = None, endpoints: list = None):
         """
         초기화
         
         Args:
             model_name: 사용할 모델 이름
+            backend: "engine"(프로세스 내 SGLang Engine) 또는 "http"(SGLang 서버), 기본값은 설정값
+            endpoints: http 백엔드에서 사용할 SGLang 서버 엔드포인트 리스트
         """
+        config = RAGConfig()
         self.model_name = model_name
+        self.backend = backend or getattr(config, 'SUMMARIZER_BACKEND', 'engine')
+        self.endpoints = endpoints or getattr(config, 'SGLANG_ENDPOINTS', None)
         self.engine = None
         self.model_loaded = False
     
+    @property
+    def engine_key(self) -> str:
+        """엔진 관리자에서 사용하는 공유 키"""
+        if self.backend == "http":
+            return "http:" + ",".join(self.endpoints or [])
+        return f"engine:{self.model_name}"
+    
     def load_model(self):
-        """SGLang Engine 초기화"""
+        """SGLang Engine 획득 (프로세스 전역 관리자에서 공유, 최초 1회만 로드)"""
         try:
-            logger.info(f"SGLang Engine 초기화 중: {self.model_name}")
-            
-            # PyTorch를 사용하여 GPU 메모리 정리
-            if torch.cuda.is_available():
-                # 미사용 캐시 메모리 해제
-                torch.cuda.empty_cache()
-                logger.info("GPU 캐시 메모리 정리 완료")
-            
-            logger.info("SGLang Engine API 직접 사용 - 모델 직접 로드")
-            
-            # Config에서 디바이스 설정 가져오기 (TEST_MODE 지원)
-            config = RAGConfig()
-            device = config.TEXT_GENERATOR_DEVICE
-            logger.info(f"SGLang Engine 디바이스 설정: {device}")
-            
-            # device가 "cuda:N" 형식이면 환경 변수로 설정
-            original_cuda_visible = os.environ.get('CUDA_VISIBLE_DEVICES')
-            if device != "auto" and device.startswith("cuda:"):
-                gpu_id = device.split(":")[1]
-                os.environ['CUDA_VISIBLE_DEVICES'] = gpu_id
-                logger.info(f"CUDA_VISIBLE_DEVICES 설정: {gpu_id}")
-            
-            # Engine 클래스를 사용하여 모델 초기화
-            # mem_fraction_static: SGLang이 사용할 GPU 메모리 비율
-            try:
-                self.engine = sgl.Engine(
-                    model_path=self.model_name,
-                    mem_fraction_static= ,    # 메모리 할당량 제한
-                    disable_cuda_graph=True,  # CUDA 그래프 비활성화로 안정성 향상
-                    trust_remote_code=True,   # 원격 코드 신뢰
-                    dtype="auto"              # 자동으로 적절한 dtype 선택
+            if self.backend == "http":
+                if not self.endpoints:
+                    raise ValueError("http 백엔드에는 SGLang 엔드포인트가 필요합니다")
+                self.engine = EngineManager.instance().acquire(
+                    self.engine_key, lambda: SGLangHTTPEngine(self.endpoints)
+                )
+            else:
+                self.engine = EngineManager.instance().acquire(
+                    self.engine_key, self._create_engine, shutdown=self._shutdown_engine
                 )
-            finally:
-                # 환경 변수 복원
-                if original_cuda_visible is not None:
-                    os.environ['CUDA_VISIBLE_DEVICES'] = original_cuda_visible
-                elif 'CUDA_VISIBLE_DEVICES' in os.environ:
-                    del os.environ['CUDA_VISIBLE_DEVICES']
             
             self.model_loaded = True
-            logger.info("SGLang Engine 초기화 완료")
             return True
         except Exception as e:
             logger.error(f"SGLang Engine 초기화 실패: {e}")
+            self.engine = None
             self.model_loaded = False
             return False
     
+    def _create_engine(self):
+        """SGLang Engine 생성 (EngineManager가 최초 1회 호출)"""
+        logger.info(f"SGLang Engine 초기화 중: {self.model_name}")
+        
+        # PyTorch를 사용하여 GPU 메모리 정리
+        if torch.cuda.is_available():
+            # 미사용 캐시 메모리 해제
+            torch.cuda.empty_cache()
+            logger.info("GPU 캐시 메모리 정리 완료")
+        
+        logger.info("SGLang Engine API 직접 사용 - 모델 직접 로드")
+        
+        # Config에서 디바이스 설정 가져오기 (TEST_MODE 지원)
+        config = RAGConfig()
+        device = config.TEXT_GENERATOR_DEVICE
+        logger.info(f"SGLang Engine 디바이스 설정: {device}")
+        
+        # device가 "cuda:N" 형식이면 환경 변수로 설정
+        original_cuda_visible = os.environ.get('CUDA_VISIBLE_DEVICES')
+        if device != "auto" and device.startswith("cuda:"):
+            gpu_id = device.split(":")[1]
+            os.environ['CUDA_VISIBLE_DEVICES'] = gpu_id
+            logger.info(f"CUDA_VISIBLE_DEVICES 설정: {gpu_id}")
+        
+        # Engine 클래스를 사용하여 모델 초기화
+        # mem_fraction_static: SGLang이 사용할 GPU 메모리 비율
+        try:
+            engine = sgl.Engine(
+                model_path=self.model_name,
+                mem_fraction_static= ,    # 메모리 할당량 제한
+                disable_cuda_graph=True,  # CUDA 그래프 비활성화로 안정성 향상
+                trust_remote_code=True,   # 원격 코드 신뢰
+                dtype="auto"              # 자동으로 적절한 dtype 선택
+            )
+        finally:
+            # 환경 변수 복원
+            if original_cuda_visible is not None:
+                os.environ['CUDA_VISIBLE_DEVICES'] = original_cuda_visible
+            elif 'CUDA_VISIBLE_DEVICES' in os.environ:
+                del os.environ['CUDA_VISIBLE_DEVICES']
+        
+        logger.info("SGLang Engine 초기화 완료")
+        return engine
+    
+    @staticmethod
+    def _shutdown_engine(engine):
+        """SGLang Engine 해제 (유휴 시간 초과 시 EngineManager가 호출)"""
+        if hasattr(engine, "shutdown"):
+            engine.shutdown()
+        del engine
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    
     def cleanup_model(self):
-        """모델 메모리 정리"""
+        """엔진 참조 반환 (실제 해제는 EngineManager가 유휴 시간 후 수행)"""
         try:
-            if self.engine is not None:
-                del self.engine
-                self.engine = None
-            
+            if self.model_loaded:
+                EngineManager.instance().release(self.engine_key)
+            self.engine = None
             self.model_loaded = False
-            logger.info("모델 메모리 정리 완료")
+            logger.info("엔진 참조 반환 완료")
         except Exception as e:
             logger.error(f"모델 메모리 정리 중 오류: {e}")
     
@@ -194,21 +315,19 @@ class AnswerGenerator:
             str: 생성된 요약 텍스트
         """
         try:
-            # 텍스트를 청크로 분할
-            chunks = chunk_text_by_tokens(content, max_tokens=, overlap_tokens=)
+            # 텍스트를 청크로 분할 (한 번만 토큰화, 청크별 토큰 수 포함)
+            chunks = list(iter_token_chunks(content, max_tokens=, overlap_tokens=))
             logger.info(f"총 {len(chunks)}개의 청크로 분할되었습니다.")
-            
-            # 각 청크를 개별적으로 요약
-            chunk_summaries = []
             for i, chunk in enumerate(chunks):
-                logger.info(f"청크 {i+1}/{len(chunks)} 요약 시작... (토큰 수: {count_tokens(chunk)})")
-                try:
-                    chunk_summary = self._generate_single_answer(chunk, max_tokens=)
-                    chunk_summaries.append(chunk_summary)
-                    logger.info(f"청크 {i+1}/{len(chunks)} 요약 완료 (요약 길이: {len(chunk_summary)} 문자)")
-                except Exception as e:
-                    logger.error(f"청크 {i+1}/{len(chunks)} 요약 실패: {str(e)}")
-                    raise Exception(f"청크 {i+1} 요약 중 오류 발생: {str(e)}")
+                logger.info(f"청크 {i+1}/{len(chunks)} (토큰 수: {chunk.token_count}, 위치: {chunk.start}-{chunk.end})")
+            
+            # 모든 청크를 한 번의 배치 요청으로 동시에 요약 (엔진이 내부에서 함께 스케줄링)
+            chunk_summaries = self._generate_batch_answers([chunk.text for chunk in chunks], max_tokens=)
+            for i, chunk_summary in enumerate(chunk_summaries):
+                if chunk_summary.startswith(GENERATION_FAILED_PREFIX):
+                    logger.error(f"청크 {i+1}/{len(chunks)} 요약 실패: {chunk_summary}")
+                    raise Exception(f"청크 {i+1} 요약 중 오류 발생: {chunk_summary}")
+                logger.info(f"청크 {i+1}/{len(chunks)} 요약 완료 (요약 길이: {len(chunk_summary)} 문자)")
             
             # 청크 요약들을 다시 합쳐서 최종 요약 생성
             combined_summaries = "\n\n---\n\n".join(chunk_summaries)
@@ -239,15 +358,35 @@ class AnswerGenerator:
         Returns:
             str: 생성된 요약 텍스트
         """
-        try:
-            # 요약 생성을 위한 시스템 프롬프트
-            system_prompt = """ """
-            
-            # 사용자 프롬프트
-            user_prompt = f""" """
+        return self._generate_batch_answers([content], max_tokens=max_tokens)[0]
+    
+    def _build_prompt(self, content: str) -> str:
+        """요약용 채팅 형식 프롬프트 구성"""
+        # 요약 생성을 위한 시스템 프롬프트
+        system_prompt = """ """
+        
+        # 사용자 프롬프트
+        user_prompt = f""" """
+        
+        # 채팅 형식 프롬프트 구성
+        prompt = f""" """
+        return prompt
+    
+    def _generate_batch_answers(self, contents: list, max_tokens: int = 8192) -> list:
+        """
+        여러 문서 요약을 한 번의 generate 호출로 생성 (내부 메서드)
+        
+        Args:
+            contents: 요약할 문서 내용 리스트
+            max_tokens: 최대 생성 토큰 수
             
-            # 채팅 형식 프롬프트 구성
-            prompt = f""" """
+        Returns:
+            list: 입력 순서대로 생성된 요약 텍스트 (실패 시 각 항목이 실패 메시지)
+        """
+        try:
+            prompts = [self._build_prompt(content) for content in contents]
+            # 한 개이면 기존과 같이 단일 프롬프트로, 여러 개이면 리스트로 배치 요청
+            prompt = prompts[0] if len(prompts) == 1 else prompts
             
             # 샘플링 파라미터 설정
             sampling_params = {
@@ -273,36 +412,45 @@ class AnswerGenerator:
                     new_loop.close()
                     asyncio.set_event_loop(None)
             
-            # 현재 이벤트 루프 확인
-            try:
-                current_loop = asyncio.get_running_loop()
-                # 이미 실행 중인 루프가 있으면 ThreadPoolExecutor 사용
-                # 타임아웃 설정: 큰 파일의 경우 최대 10분
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_generate_in_thread)
-                    try:
-                        result = future.result(timeout=600)  # 10분 타임아웃
-                    except concurrent.futures.TimeoutError:
-                        logger.error("텍스트 생성이 타임아웃되었습니다 (10분 초과)")
-                        raise Exception("텍스트 생성이 너무 오래 걸립니다. 파일 크기를 줄이거나 나누어서 요약해주세요.")
-            except RuntimeError:
-                # 실행 중인 루프가 없으면 직접 호출
-                result = self.engine.generate(prompt=prompt, sampling_params=sampling_params)
-            
-            response = result["text"]
+            # 프로세스 내 엔진은 한 번에 한 스레드만 사용 (파이프라인 요약 워커 등 동시 호출 직렬화)
+            # HTTP 백엔드는 서버가 동시 요청을 처리하므로 잠그지 않음
+            generate_lock = (contextlib.nullcontext() if self.backend == "http"
+                             else EngineManager.instance().generate_lock(self.engine_key))
+            with generate_lock:
+                # 현재 이벤트 루프 확인
+                try:
+                    current_loop = asyncio.get_running_loop()
+                    # 이미 실행 중인 루프가 있으면 ThreadPoolExecutor 사용
+                    # 타임아웃 설정: 큰 파일의 경우 최대 10분
+                    with concurrent.futures.ThreadPoolExecutor() as executor:
+                        future = executor.submit(run_generate_in_thread)
+                        try:
+                            result = future.result(timeout=600)  # 10분 타임아웃
+                        except concurrent.futures.TimeoutError:
+                            logger.error("텍스트 생성이 타임아웃되었습니다 (10분 초과)")
+                            raise Exception("텍스트 생성이 너무 오래 걸립니다. 파일 크기를 줄이거나 나누어서 요약해주세요.")
+                except RuntimeError:
+                    # 실행 중인 루프가 없으면 직접 호출
+                    result = self.engine.generate(prompt=prompt, sampling_params=sampling_params)
             
-            # <think> 태그 제거
-            response = re.sub(r'<[tT]hink>.*?</[tT]hink>', '', response, flags=re.DOTALL)
+            results = result if isinstance(result, list) else [result]
             
-            # 불필요한 공백/줄바꿈 정리
-            response = response.strip()
+            responses = []
+            for item in results:
+                response = item["text"]
+                
+                # <think> 태그 제거
+                response = re.sub(r'<[tT]hink>.*?</[tT]hink>', '', response, flags=re.DOTALL)
+                
+                # 불필요한 공백/줄바꿈 정리
+                responses.append(response.strip())
             
-            logger.info("SGLang 텍스트 생성 완료")
-            return response
+            logger.info(f"SGLang 텍스트 생성 완료 ({len(responses)}개)")
+            return responses
             
         except Exception as e:
             logger.error(f"답변 생성 중 오류 발생: {e}")
-            return f"답변 생성에 실패했습니다: {str(e)}"
+            return [f"{GENERATION_FAILED_PREFIX} {str(e)}"] * len(contents)
     
     @staticmethod
     def make_llm_input_data(save_dir, json_data):
@@ -399,7 +547,7 @@ class Summarizer:
 # 간단한 텍스트 요약 함수 (LLM 없이)
 def simple_summarize(text: str, ratio: float = 0.3) -> str:
     """
-    간단한 텍스트 요약 (앞부분 추출)
+    간단한 텍스트 요약 (TextRank 추출 요약, 실패 시 앞부분 추출)
     
     Args:
         text: 요약할 텍스트
@@ -415,4 +563,11 @@ def simple_summarize(text: str, ratio: float = 0.3) -> str:
     if summary_length <= 0:
         return "요약할 텍스트가 없습니다."
     
+    try:
+        summary = extractive_summarize(text, max_chars=summary_length)
+        if summary:
+            return summary
+    except Exception as e:
+        logger.warning(f"추출 요약 실패, 앞부분 추출로 대체합니다: {e}")
+    
     return text[:summary_length]
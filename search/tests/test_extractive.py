@@ -0,0 +1,112 @@
+"""
+extractive 테스트
+문장 분리, 추출 요약 규칙, 희소 TextRank가 밀집 행렬 계산과 같은지 확인합니다.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# search 디렉토리 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import extractive
+from extractive import extractive_summarize, split_sentences, textrank_scores
+
+SENTENCES = [
+    "원가관리회계는 제품의 원가를 계산하는 학문이다.",
+    "원가관리회계에서 제품 원가는 직접재료비와 직접노무비로 구성된다.",
+    "오늘 날씨는 맑고 바람이 조금 분다.",
+    "제품 원가 계산은 원가관리회계의 핵심 주제이다.",
+    "Activity based costing allocates overhead to products.",
+]
+
+
+def test_split_sentences_markdown():
+    text = (
+        "# 제목입니다\n"
+        "- 첫 번째 항목입니다. 두 번째 문장입니다!\n"
+        "> 인용문입니다\n"
+        "| 표 | 행 |\n"
+        "https://example.com/page\n"
+        "\"따옴표 문장이다.\" 다음 문장이다."
+    )
+    assert split_sentences(text) == [
+        "제목입니다",
+        "첫 번째 항목입니다.",
+        "두 번째 문장입니다!",
+        "인용문입니다",
+        "\"따옴표 문장이다.\"",
+        "다음 문장이다.",
+    ]
+
+
+def test_empty_and_short_text():
+    assert extractive_summarize("") == ""
+    assert extractive_summarize("짧음. 너무 짧다.", max_chars=100) == ""
+
+
+def test_single_sentence_is_truncated():
+    sentence = "문장이 하나뿐인 텍스트는 그대로 잘라서 반환한다."
+    assert extractive_summarize(sentence, max_chars=10) == sentence[:10]
+    assert extractive_summarize(sentence + "\n" + sentence, max_chars=100) == sentence
+
+
+def test_summary_keeps_original_order_and_limit():
+    text = " ".join(SENTENCES)
+    summary = extractive_summarize(text, max_chars=120)
+    assert 0 < len(summary) <= 120
+
+    picked = summary.split("\n")
+    assert all(sentence in SENTENCES for sentence in picked)
+    assert picked == sorted(picked, key=SENTENCES.index)
+
+
+def test_central_sentence_is_picked_first():
+    """다른 문장과 겹치지 않는 문장보다 중심 문장이 먼저 선택됨"""
+    summary = extractive_summarize(" ".join(SENTENCES), max_chars=10000, max_sentences=1)
+    assert summary == SENTENCES[int(np.argmax(textrank_scores(SENTENCES)))]
+    assert summary != SENTENCES[2]
+
+
+def test_max_sentences():
+    summary = extractive_summarize(" ".join(SENTENCES), max_chars=10000, max_sentences=2)
+    assert len(summary.split("\n")) == 2
+
+
+def test_duplicate_sentences_are_dropped():
+    text = "\n".join(SENTENCES[:2] * 3)
+    summary = extractive_summarize(text, max_chars=10000)
+    assert summary.split("\n") == SENTENCES[:2]
+
+
+def dense_textrank(sentences):
+    """유사도 행렬을 직접 만드는 기준 구현"""
+    rows, cols, values, n_features = extractive._tfidf(sentences)
+    n = len(sentences)
+    matrix = np.zeros((n, n_features))
+    np.add.at(matrix, (rows, cols), values)
+    similarity = matrix @ matrix.T - np.eye(n)
+
+    degree = similarity.sum(axis=1)
+    isolated = degree <= 1e-12
+    degree[isolated] = 1.0
+    scores = np.full(n, 1.0 / n)
+    for _ in range(extractive.MAX_ITERATIONS):
+        weighted = np.where(isolated, 0.0, scores / degree)
+        updated = ((1 - extractive.DAMPING) / n
+                   + extractive.DAMPING * (similarity @ weighted + scores[isolated].sum() / n))
+        done = np.abs(updated - scores).sum() < extractive.TOLERANCE
+        scores = updated
+        if done:
+            break
+    return scores
+
+
+def test_textrank_matches_dense_computation():
+    scores = textrank_scores(SENTENCES)
+    assert scores == pytest.approx(dense_textrank(SENTENCES))
+    assert scores.sum() == pytest.approx(1.0)
+    assert scores[2] == scores.min()
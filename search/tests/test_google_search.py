@@ -0,0 +1,92 @@
+"""
+google_search 테스트
+요청 속도 제한(토큰 버킷)과 일일 한도를 확인합니다.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+# search 디렉토리 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import google_search
+from google_search import DailyQuota, RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.monotonic 대체 (now를 직접 증가)"""
+    class Clock:
+        now = 1000.0
+
+        def __call__(self):
+            return self.now
+
+    fake = Clock()
+    monkeypatch.setattr(google_search.time, "monotonic", fake)
+    return fake
+
+
+def test_rate_limiter_burst_then_waits(clock):
+    limiter = RateLimiter(rate=2, burst=3)
+    assert [limiter.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # 토큰이 없으면 초당 2개 속도로 대기 시간이 늘어남
+    assert limiter.reserve() == pytest.approx(0.5)
+    assert limiter.reserve() == pytest.approx(1.0)
+
+
+def test_rate_limiter_refills_up_to_capacity(clock):
+    limiter = RateLimiter(rate=2, burst=2)
+    limiter.reserve()
+    limiter.reserve()
+    assert limiter.reserve() == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert limiter.reserve() == pytest.approx(0.5)
+
+    # 오래 쉬어도 burst 이상 쌓이지 않음
+    clock.now += 60
+    assert [limiter.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert limiter.reserve() > 0
+
+
+def test_rate_limiter_default_burst(clock):
+    assert RateLimiter(rate=5).capacity == 5
+    assert RateLimiter(rate=0.5).capacity == 1
+
+
+@pytest.fixture
+def today(monkeypatch):
+    """date.today() 대체 (value를 바꿔 날짜 변경)"""
+    class FakeDate(date):
+        value = date(2026, 1, 1)
+
+        @classmethod
+        def today(cls):
+            return cls.value
+
+    monkeypatch.setattr(google_search, "date", FakeDate)
+    return FakeDate
+
+
+def test_daily_quota_limit(today):
+    quota = DailyQuota(2)
+    assert quota.remaining == 2
+    assert quota.consume() is True
+    assert quota.consume() is True
+    assert quota.consume() is False
+    assert quota.remaining == 0
+
+
+def test_daily_quota_resets_next_day(today):
+    quota = DailyQuota(1)
+    assert quota.consume() is True
+    assert quota.consume() is False
+
+    today.value = date(2026, 1, 2)
+    assert quota.remaining == 1
+    assert quota.consume() is True
+    assert quota.consume() is False
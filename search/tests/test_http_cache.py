@@ -0,0 +1,126 @@
+"""
+http_cache 테스트
+조건부 GET 재검증과 응답 Cache-Control(no-store, max-age, no-cache, Vary: *) 처리를 확인합니다.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# search 디렉토리 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import http_cache
+from http_cache import HTTPCache
+
+URL = "https://example.com/page"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """requests.get 대체 (responses에 넣은 순서대로 응답, 요청 헤더 기록)"""
+    class Server:
+        responses = []
+        requests = []
+
+        def get(self, url, headers=None, timeout=None):
+            self.requests.append(dict(headers or {}))
+            return self.responses.pop(0)
+
+    fake = Server()
+    monkeypatch.setattr(http_cache.requests, "get", fake.get)
+    return fake
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(cache_dir=str(tmp_path / "cache"), fresh_seconds=300)
+
+
+def test_fresh_response_is_served_from_cache(cache, server):
+    server.responses = [FakeResponse(content=b"body", headers={"ETag": '"v1"'})]
+    assert cache.fetch(URL).content == b"body"
+
+    cached = cache.fetch(URL)
+    assert cached.from_cache and cached.content == b"body"
+    assert len(server.requests) == 1
+
+
+def test_stale_response_is_revalidated(cache, server):
+    server.responses = [
+        FakeResponse(content=b"body", headers={"ETag": '"v1"', "Cache-Control": "max-age=0"}),
+        FakeResponse(status_code=304, headers={"Cache-Control": "max-age=60"}),
+    ]
+    cache.fetch(URL)
+    _, meta = cache.lookup(URL)
+    assert meta["fresh_seconds"] == 0
+    assert not cache.is_fresh(meta)
+
+    # 304는 저장된 본문을 사용하고, 304의 max-age로 유효 시간 갱신
+    response = cache.fetch(URL)
+    assert response.from_cache and response.content == b"body"
+    assert server.requests[1] == {"If-None-Match": '"v1"'}
+    _, meta = cache.lookup(URL)
+    assert meta["fresh_seconds"] == 60
+    assert cache.is_fresh(meta)
+
+
+@pytest.mark.parametrize("cache_control, expected", [
+    ("max-age=60", 60),
+    ("public, MAX-AGE=\"120\"", 120),
+    ("no-cache, max-age=60", 0),
+    ("max-age=-5", 0),
+    ("max-age=abc", 300),
+    ("private", 300),
+])
+def test_fresh_seconds_from_cache_control(cache, server, cache_control, expected):
+    server.responses = [FakeResponse(content=b"body", headers={"Cache-Control": cache_control})]
+    cache.fetch(URL)
+    _, meta = cache.lookup(URL)
+    assert meta["fresh_seconds"] == expected
+
+
+@pytest.mark.parametrize("headers", [
+    {"Cache-Control": "no-store"},
+    {"Cache-Control": "private, No-Store"},
+    {"Vary": "*"},
+])
+def test_unstorable_response_is_not_cached(cache, server, headers):
+    server.responses = [FakeResponse(content=b"body", headers=headers)]
+    assert cache.fetch(URL).content == b"body"
+    assert cache.lookup(URL) == (None, None)
+
+
+def test_unstorable_response_removes_previous_copy(cache, server):
+    server.responses = [
+        FakeResponse(content=b"old", headers={"Cache-Control": "max-age=0"}),
+        FakeResponse(content=b"new", headers={"Cache-Control": "no-store"}),
+    ]
+    cache.fetch(URL)
+    assert cache.fetch(URL).content == b"new"
+    assert cache.lookup(URL) == (None, None)
+
+
+def test_304_with_vary_star_removes_entry(cache, server):
+    server.responses = [
+        FakeResponse(content=b"body", headers={"ETag": '"v1"', "Cache-Control": "no-cache"}),
+        FakeResponse(status_code=304, headers={"Vary": "*"}),
+    ]
+    cache.fetch(URL)
+    assert cache.fetch(URL).content == b"body"
+    assert cache.lookup(URL) == (None, None)
+
+
+def test_error_response_is_returned_uncached(cache, server):
+    error = FakeResponse(status_code=500)
+    server.responses = [error]
+    assert cache.fetch(URL) is error
+    assert cache.lookup(URL) == (None, None)
@@ -0,0 +1,108 @@
+"""
+util 테스트
+중복 판별용 URL 정규화와 TTL 캐시 만료/교체를 확인합니다.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# search 디렉토리 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import util
+from util import TTLCache, normalize_url
+
+
+@pytest.mark.parametrize("a, b", [
+    ("http://www.Example.com:80/a/b/#frag", "https://example.com/a/b"),
+    ("https://m.example.com/a", "https://example.com/a"),
+    ("https://ko.m.wikipedia.org/wiki/X", "https://ko.wikipedia.org/wiki/X"),
+    ("https://namu.wiki/w/%ED%85%8C%EC%8A%A4%ED%8A%B8", "https://namu.wiki/w/테스트"),
+    ("https://example.com/a%7Eb", "https://example.com/a~b"),
+    ("https://example.com/?q=a%20b", "https://example.com?q=a+b"),
+])
+def test_normalize_url_equivalent(a, b):
+    assert normalize_url(a) == normalize_url(b)
+
+
+@pytest.mark.parametrize("a, b", [
+    # 값 안의 인코딩된 &/=는 파라미터 구분자와 다름
+    ("https://example.com/?q=a%26b%3Dc", "https://example.com/?q=a&b=c"),
+    # 인코딩된 /?#는 경로 구분자/쿼리/프래그먼트와 다름
+    ("https://example.com/a%2Fb", "https://example.com/a/b"),
+    ("https://example.com/a%3Fb", "https://example.com/a?b"),
+    ("https://example.com/a%23b", "https://example.com/a#b"),
+    ("https://example.com:8080/a", "https://example.com/a"),
+    ("https://mobile.com/a", "https://com/a"),
+])
+def test_normalize_url_distinct(a, b):
+    assert normalize_url(a) != normalize_url(b)
+
+
+def test_normalize_url_keeps_encoded_delimiters():
+    assert normalize_url("https://example.com/a%2fb%3Fc%23d") == "https://example.com/a%2Fb%3Fc%23d"
+
+
+def test_normalize_url_malformed():
+    """잘못된 포트 등은 예외 없이 원본을 키로 사용"""
+    assert normalize_url(" http://a:xyz/ ") == "http://a:xyz/"
+    assert normalize_url("http://[::1/") == "http://[::1/"
+    assert normalize_url("") == ""
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.monotonic 대체 (now를 직접 증가)"""
+    class Clock:
+        now = 1000.0
+
+        def __call__(self):
+            return self.now
+
+    fake = Clock()
+    monkeypatch.setattr(util.time, "monotonic", fake)
+    return fake
+
+
+def test_ttl_cache_expiry(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+    clock.now += 9
+    assert cache.get("a") == 1
+
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.get("a", "default") == "default"
+    assert len(cache) == 0
+
+
+def test_ttl_cache_set_refreshes_expiry(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+    clock.now += 8
+    cache.set("a", 2)
+    clock.now += 8
+    assert cache.get("a") == 2
+
+
+def test_ttl_cache_evicts_least_recently_used(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+@pytest.mark.parametrize("maxsize, ttl", [(0, 10), (4, 0)])
+def test_ttl_cache_disabled(clock, maxsize, ttl):
+    cache = TTLCache(maxsize=maxsize, ttl=ttl)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
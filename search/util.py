@@ -1,9 +1,12 @@
 ### 공통으로 사용되는 모듈들 모아둔 파일
 
-import requests, os, re, shutil
-from urllib.parse import urlparse, unquote, quote
+import requests, os, re, threading, time, hashlib
+from collections import OrderedDict
+from urllib.parse import urlparse, urlsplit, urlunsplit, unquote, quote, parse_qsl, urlencode
 from bs4 import BeautifulSoup
 from pathlib import Path
+from http_cache import http_cache
+from output_store import crawl_output_store
 
 
 
@@ -92,18 +95,155 @@ def filter_search_results(results, max_results=10):
     
     return filtered_results
 
+# 모바일 전용 서브도메인 (예: m.news.nate.com, ko.m.wikipedia.org)
+MOBILE_HOST_LABELS = ('m', 'mobile')
+
+def normalize_url(url: str) -> str:
+    """
+    중복 판별용 URL 정규화
+
+    스킴(http/https), 대소문자, www/모바일 서브도메인, 기본 포트, 프래그먼트,
+    끝의 슬래시, 퍼센트 인코딩 차이를 무시한 동일한 키를 반환
+    
+    Args:
+        url: 원본 URL
+        
+    Returns:
+        str: 정규화된 URL
+    """
+    if not url:
+        return ''
+    
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        # 잘못된 포트/IPv6 표기 등은 정규화하지 않고 원본을 키로 사용
+        return url.strip()
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    
+    host = (parts.hostname or '').lower()
+    labels = [label for label in host.split('.') if label]
+    if labels and labels[0] == 'www':
+        labels = labels[1:]
+    # 마지막 두 라벨(도메인)은 유지하고 그 앞의 모바일 라벨만 제거
+    labels = [label for i, label in enumerate(labels)
+              if not (label in MOBILE_HOST_LABELS and i < len(labels) - 2)]
+    host = '.'.join(labels)
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    
+    # 퍼센트 인코딩 통일 (세그먼트별로 디코딩 후 동일 규칙으로 다시 인코딩)
+    # "/"는 세그먼트 안에서 안전 문자로 두지 않아 %2F가 경로 구분자로 바뀌지 않음 (%3F/%23도 유지)
+    path = '/'.join(quote(unquote(segment), safe=":@!$&'()*+,;=-._~")
+                    for segment in parts.path.split('/'))
+    path = path.rstrip('/') or '/'
+    # 쿼리는 파라미터 단위로 디코딩 후 재인코딩 (값 안의 %26/%3D가 구분자로 바뀌지 않도록)
+    query = urlencode(parse_qsl(parts.query, keep_blank_values=True))
+    
+    return urlunsplit((scheme, host, path, query, ''))
+
+class TTLCache:
+    """
+    만료 시간과 최대 크기가 있는 LRU 캐시 (스레드 안전)
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300):
+        """
+        Args:
+            maxsize: 최대 항목 수
+            ttl: 항목 유지 시간 (초)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+def title_from_url(url: str) -> str:
+    """
+    URL 경로에서 문서 제목 추출 (나무위키 /w/제목, 그 외 마지막 경로)
+    """
+    path = urlparse(url).path
+    return unquote(path[3:]) if path.startswith('/w/') else os.path.basename(path)
+
+def shorten_title(title: str) -> str:
+    """
+    크롤링 결과 파일명용 제목 (특수문자 치환, 긴 제목은 앞부분 + 해시)
+    """
+    safe_title = re.sub(r'[\/*?:"<>|]', "_", title)
+    
+    # 한글 파일명 길이 제한 및 해시 추가로 고유성 확보
+    if len(safe_title) > 10:  # 한글은 글자당 3바이트이므로 길이 제한 확대
+        # 한글 인코딩 고려하여 앞부분 추출
+        short_title = safe_title[:8]  # 한글 2-3글자 정도
+        # 원본 제목의 해시값 추가하여 구분성 확보
+        hash_suffix = hashlib.md5(safe_title.encode()).hexdigest()[:4]
+        safe_title = f"{short_title}_{hash_suffix}"
+    return safe_title
+
+def site_output_paths(output_dir: str, filename: str) -> list:
+    """
+    사이트 크롤러 결과 저장 경로 (output_dir + 상위 Results/3.OCR_results)
+    """
+    ocr_results_dir = os.path.join(os.path.dirname(output_dir), 'Results', '3.OCR_results')
+    return [os.path.join(output_dir, filename), os.path.join(ocr_results_dir, filename)]
+
+def write_crawl_output(content: str, paths: list, store=None) -> str:
+    """
+    크롤링 결과를 지정된 경로들에 저장 (대표 경로에 한 번만 쓰고 나머지는 링크로 연결)
+    
+    Args:
+        content: 저장할 마크다운
+        paths: 저장 경로 리스트 (첫 번째가 대표 경로)
+        store: CrawlOutputStore (기본값: 프로세스 공용 저장소, SEARCH_CRAWL_OUTPUT_MODE)
+        
+    Returns:
+        str: 대표 저장 경로
+    """
+    return (store or crawl_output_store).write(content, paths)
+
 def request_url(url):
     
     try:
-        path = urlparse(url).path
-        title = unquote(path[3:]) if path.startswith('/w/') else os.path.basename(path)
+        title = title_from_url(url)
         print(f"추출된 문서 제목: {title}")
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         }
 
         print("페이지 콘텐츠 요청 중...")
-        response = requests.get(url, headers=headers)
+        # 디스크 캐시 + 조건부 GET (변경 없으면 본문을 다시 받지 않음)
+        response = http_cache.fetch(url, headers=headers)
         response.raise_for_status()
         return response, title
 
@@ -150,64 +290,28 @@ def convert_all_markdown_tables_to_html(markdown_text: str) -> str:
 
     return md_table_pattern.sub(replace_with_html, markdown_text)
 
+# 테이블 내부 태그에서 제거할 속성
+TABLE_DESCENDANT_ATTRS = frozenset({
+    'style', 'class', 'bgcolor', 'width', 'height', 'align', 'valign', 'border', 'cellspacing', 'cellpadding'
+})
+# 테이블 태그 자체에서 제거할 속성
+TABLE_ATTRS = frozenset({
+    'style', 'data-dark-style', 'data-v-d7de5c75', 'class', 'bgcolor', 'width', 'height', 'align',
+    'border', 'cellspacing', 'cellpadding', 'img', 'src', 'srcset', 'span'
+})
+
 def find_table_and_remove_style(article,soup):
     tables = []
     for i, table in enumerate(article.find_all('table')):
         placeholder = f"---TABLE-PLACEHOLDER-{i}---"
-        # 테이블에서 모든 style 속성 제거
+        # 테이블에서 모든 style 속성 제거 (태그마다 속성 집합 교집합만 확인)
         for tag in table.find_all(True):
-            if tag.has_attr('style'):
-                del tag['style']
-            if tag.has_attr('class'):
-                del tag['class']
-            if tag.has_attr('bgcolor'):
-                del tag['bgcolor']
-            if tag.has_attr('width'):
-                del tag['width']
-            if tag.has_attr('height'):
-                del tag['height']
-            if tag.has_attr('align'):
-                del tag['align']
-            if tag.has_attr('valign'):
-                del tag['valign']
-            if tag.has_attr('border'):
-                del tag['border']
-            if tag.has_attr('cellspacing'):
-                del tag['cellspacing']
-            if tag.has_attr('cellpadding'):
-                del tag['cellpadding']
+            for attr in TABLE_DESCENDANT_ATTRS.intersection(tag.attrs):
+                del tag[attr]
         
         # 테이블 자체의 스타일 속성도 제거
-        if table.has_attr('style'):
-            del table['style']
-        if table.has_attr('data-dark-style'):
-            del table['data-dark-style']
-        if table.has_attr('data-v-d7de5c75'):
-            del table['data-v-d7de5c75']
-        if table.has_attr('class'):
-            del table['class']
-        if table.has_attr('bgcolor'):
-            del table['bgcolor']
-        if table.has_attr('width'):
-            del table['width']
-        if table.has_attr('height'):
-            del table['height']
-        if table.has_attr('align'):
-            del table['align']
-        if table.has_attr('border'):
-            del table['border']
-        if table.has_attr('cellspacing'):
-            del table['cellspacing']
-        if table.has_attr('cellpadding'):
-            del table['cellpadding']
-        if table.has_attr('img'):
-            del table['img']
-        if table.has_attr('src'):
-            del table['src']
-        if table.has_attr('srcset'):
-            del table['srcset']
-        if table.has_attr('span'):
-            del table['span']
+        for attr in TABLE_ATTRS.intersection(table.attrs):
+            del table[attr]
 
         tables.append(str(table))
         table.replace_with(soup.new_string(placeholder))
@@ -215,6 +319,70 @@ def find_table_and_remove_style(article,soup):
     return tables, article
 
 
+def extract_web_markdown(html, result: dict) -> str:
+    """
+    일반 웹 페이지 HTML에서 본문을 추출하여 마크다운 생성
+    
+    Args:
+        html: 페이지 HTML (bytes 또는 str)
+        result: {'title': str, 'link': str, 'snippet': str (optional)} 형태의 딕셔너리
+        
+    Returns:
+        str: 마크다운 문자열
+    """
+    title = result.get('title', 'untitled')
+    link = result.get('link', '')
+    snippet = result.get('snippet', '')
+    
+    # HTML 파싱
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 본문 추출 (여러 태그 시도)
+    content = ""
+    for tag in ['article', 'main', 'div[class*="content"]', 'div[id*="content"]']:
+        elements = soup.select(tag)
+        if elements:
+            content = "\n\n".join([elem.get_text(strip=True) for elem in elements])
+            break
+    
+    # 본문을 찾지 못한 경우 body 전체 사용
+    if not content:
+        body = soup.find('body')
+        if body:
+            content = body.get_text(strip=True)
+    
+    # 마크다운 형식으로 변환
+    markdown_content = f"# {title}\n\n"
+    markdown_content += f"**출처:** {link}\n\n"
+    if snippet:
+        markdown_content += f"**요약:** {snippet}\n\n"
+    markdown_content += f"## 본문\n\n{content}\n"
+    return markdown_content
+
+def web_cache_extra(result: dict) -> str:
+    """일반 웹 마크다운 캐시 키에 포함할 값 (제목/링크/스니펫이 결과에 들어가므로)"""
+    return "\0".join([result.get('title', 'untitled'), result.get('link', ''), result.get('snippet', '')])
+
+def web_error_markdown(result: dict, error: Exception) -> str:
+    """
+    크롤링 실패 시 스니펫만 담은 마크다운 생성
+    """
+    markdown_content = f"# {result.get('title', 'untitled')}\n\n"
+    markdown_content += f"**출처:** {result.get('link', '')}\n\n"
+    markdown_content += f"**요약:** {result.get('snippet', '')}\n\n"
+    markdown_content += f"**오류:** 페이지 크롤링 실패 - {str(error)}\n"
+    return markdown_content
+
+def web_output_paths(output_dir: str, title: str) -> list:
+    """
+    일반 웹 크롤링 결과 저장 경로 (output_dir + 상위 디렉토리)
+    """
+    safe_filename = sanitize_filename(title)
+    return [
+        str(Path(output_dir) / f"{safe_filename}.md"),
+        str(Path(output_dir).parent / f"{safe_filename}.md")
+    ]
+
 def crawling_web(result: dict, output_dir: str) -> str:
     """
     웹 페이지를 크롤링하여 파일로 저장
@@ -229,80 +397,40 @@ def crawling_web(result: dict, output_dir: str) -> str:
     
     title = result.get('title', 'untitled')
     link = result.get('link', '')
-    snippet = result.get('snippet', '')
     
     if not link:
         raise ValueError("링크가 제공되지 않았습니다")
     
-    # 파일명 생성
-    safe_filename = sanitize_filename(title)
-    output_path = Path(output_dir) / f"{safe_filename}.md"
-    
-    # 디렉토리 생성
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
-    # 3.OCR_results 디렉토리 경로 설정
-    ocr_results_dir = Path(output_dir).parent
-    ocr_results_dir.mkdir(parents=True, exist_ok=True)
-    ocr_results_path = ocr_results_dir / f"{safe_filename}.md"
+    # 저장 경로 (doc 디렉토리 + 3.OCR_results 디렉토리)
+    output_path, ocr_results_path = web_output_paths(output_dir, title)
     
     try:
         # 웹 페이지 가져오기
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(link, headers=headers, timeout=10)
+        response = http_cache.fetch(link, headers=headers, timeout=10)
         response.raise_for_status()
         
-        # HTML 파싱
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 본문 추출 (여러 태그 시도)
-        content = ""
-        for tag in ['article', 'main', 'div[class*="content"]', 'div[id*="content"]']:
-            elements = soup.select(tag)
-            if elements:
-                content = "\n\n".join([elem.get_text(strip=True) for elem in elements])
-                break
-        
-        # 본문을 찾지 못한 경우 body 전체 사용
-        if not content:
-            body = soup.find('body')
-            if body:
-                content = body.get_text(strip=True)
-        
-        # 마크다운 형식으로 저장
-        markdown_content = f"# {title}\n\n"
-        markdown_content += f"**출처:** {link}\n\n"
-        if snippet:
-            markdown_content += f"**요약:** {snippet}\n\n"
-        markdown_content += f"## 본문\n\n{content}\n"
+        markdown_content = http_cache.cached_extract(
+            'web', response,
+            lambda: extract_web_markdown(response.content, result),
+            extra=web_cache_extra(result)
+        )
         
-        # doc 디렉토리에 파일 저장
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
-        
-        # 3.OCR_results 디렉토리에도 복사
-        shutil.copy2(output_path, ocr_results_path)
+        # doc 디렉토리와 3.OCR_results 디렉토리에 저장
+        write_crawl_output(markdown_content, [output_path, ocr_results_path])
         print(f"검색 결과 저장: {output_path}")
-        print(f"검색 결과 복사: {ocr_results_path}")
+        print(f"검색 결과 연결: {ocr_results_path}")
         
         return str(output_path)
         
     except Exception as e:
         # 오류 발생 시 스니펫만이라도 저장
-        markdown_content = f"# {title}\n\n"
-        markdown_content += f"**출처:** {link}\n\n"
-        markdown_content += f"**요약:** {snippet}\n\n"
-        markdown_content += f"**오류:** 페이지 크롤링 실패 - {str(e)}\n"
+        markdown_content = web_error_markdown(result, e)
         
-        # doc 디렉토리에 파일 저장
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
-        
-        # 3.OCR_results 디렉토리에도 복사
-        shutil.copy2(output_path, ocr_results_path)
+        write_crawl_output(markdown_content, [output_path, ocr_results_path])
         print(f"검색 결과 저장 (오류 포함): {output_path}")
-        print(f"검색 결과 복사 (오류 포함): {ocr_results_path}")
+        print(f"검색 결과 연결 (오류 포함): {ocr_results_path}")
         
-        return str(output_path)
\ No newline at end of file
+        return str(output_path)